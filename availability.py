@@ -0,0 +1,93 @@
+"""
+Indeks ketersediaan dosen sebagai bitset.
+
+Ketersediaan tiap dosen atas H*M slot global disimpan sebagai satu int
+Python (bit t = tersedia di slot t), dan sebaliknya tiap slot menyimpan
+bitset dosen yang tersedia. Dari situ pertanyaan yang sering dipakai saat
+menyusun panel D dosen cukup dijawab dengan operasi bit:
+
+- slot mana yang punya >= D dosen tersedia termasuk pembimbing a
+- dosen mana yang masih bisa ditambahkan ke slot t (belum dipakai di ruangan lain)
+
+Bitset dibangun sekali lewat string biner (tanpa numpy, supaya jalur cepat
+core.py tidak perlu import numpy), tetap murah untuk horizon berminggu-minggu
+dengan ratusan dosen.
+"""
+
+
+def _to_int(values):
+    """Baris 0/1 -> int bitset (bit k = kolom k)."""
+    return int("0" + "".join("1" if v == 1 else "0" for v in reversed(values)), 2)
+
+
+def bits(mask):
+    """Index bit yang menyala, urut naik."""
+    out = []
+    while mask:
+        low = mask & -mask
+        out.append(low.bit_length() - 1)
+        mask ^= low
+    return out
+
+
+class AvailabilityIndex:
+    def __init__(self, pref, H, M):
+        n_slots = H * M
+        # potong / pad ke H*M kolom; slot di luar preferensi = tidak tersedia
+        rows = [list(row[:n_slots]) + [0] * (n_slots - len(row[:n_slots])) for row in pref]
+        self.n_slots = n_slots
+        self.n_lecturers = len(rows)
+        self.lecturer_slots = [_to_int(row) for row in rows]           # dosen -> bitset slot
+        self.slot_lecturers = [_to_int(col) for col in zip(*rows)] if rows else [0] * n_slots
+        self.count = [mask.bit_count() for mask in self.slot_lecturers]  # dosen tersedia per slot
+        self._panel_masks = {}
+
+    def available(self, a, t):
+        return 0 <= a < self.n_lecturers and (self.lecturer_slots[a] >> t) & 1 == 1
+
+    def panel_mask(self, D):
+        """Bitset slot dengan minimal D dosen tersedia."""
+        if D not in self._panel_masks:
+            mask = 0
+            for t, c in enumerate(self.count):
+                if c >= D:
+                    mask |= 1 << t
+            self._panel_masks[D] = mask
+        return self._panel_masks[D]
+
+    def panel_slots(self, a, D):
+        """Slot tempat dosen a tersedia dan panel D dosen (termasuk a) bisa lengkap."""
+        if not 0 <= a < self.n_lecturers:
+            return []
+        return bits(self.lecturer_slots[a] & self.panel_mask(D))
+
+    def slot_order(self, a, D=None):
+        """
+        Slot tersedia dosen a, slot yang bisa mendapat panel lengkap lebih dulu;
+        slot yang tidak pernah bisa mendapat D dosen hanya dipakai sebagai cadangan.
+        """
+        if not 0 <= a < self.n_lecturers:
+            return []
+        mask = self.lecturer_slots[a]
+        if D is None:
+            return bits(mask)
+        ok = mask & self.panel_mask(D)
+        return bits(ok) + bits(mask & ~ok)
+
+    def timeslot_order(self, a, D=None, R=3):
+        """slot_order dalam index timeslot (slot global dulu, lalu ruangan)."""
+        return [t * R + r for t in self.slot_order(a, D) for r in range(R)]
+
+    def co_available(self, t, busy=0, allowed=None, key=None):
+        """
+        Dosen yang tersedia di slot t dan belum ada di bitset `busy`
+        (mis. sudah hadir di ruangan lain pada slot yang sama), diurutkan
+        dengan `key` (default: PB).
+        """
+        mask = self.slot_lecturers[t] & ~busy
+        if allowed is not None:
+            mask &= allowed
+        return sorted(bits(mask), key=key)
+
+    def free_count(self, t, busy=0):
+        return (self.slot_lecturers[t] & ~busy).bit_count()
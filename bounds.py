@@ -0,0 +1,129 @@
+"""
+Batas atas objective greedy (obj2 + obj3) tanpa menjalankan MIP.
+
+- obj2 (pasangan Type sama): tiap Type dengan n mahasiswa paling banyak
+  menghasilkan pasangan bila dikelompokkan per C orang.
+- obj3 (timeslot - slot global terpakai): slot terpakai minimal dihitung dari
+  relaksasi LP (scipy/HiGHS) atas penempatan jumlah mahasiswa per dosen per
+  slot dengan kapasitas C per ruangan, R ruangan, dan ketersediaan dosen.
+  Tanpa scipy dipakai batas kombinatorial ceil(k / (R*C)).
+
+Batas berlaku untuk semua jadwal yang menempatkan minimal `assigned`
+mahasiswa, jadi selalu >= objective greedy.
+"""
+import math
+import time
+
+import numpy as np
+
+from precheck import availability
+
+
+def max_same_type_pairs(types, C):
+    """Pasangan Type sama maksimum: tiap Type dipecah ke kelompok berisi C."""
+    total = 0
+    for n in np.unique(np.asarray(types), return_counts=True)[1]:
+        q, r = divmod(int(n), C)
+        total += q * C * (C - 1) // 2 + r * (r - 1) // 2
+    return total
+
+
+def min_used_slots_lp(pb, pref, k, C, H, M, R):
+    """
+    Relaksasi LP: min sum u_t dengan
+        x[a,t] <= C * u_t            (dosen a hanya di satu ruangan per slot)
+        sum_a x[a,t] <= R * C * u_t  (R ruangan per slot)
+        sum_t x[a,t] <= n_a,  sum x >= k
+    Return nilai LP, atau None bila scipy tidak tersedia / LP gagal.
+    """
+    try:
+        from scipy.optimize import linprog
+        from scipy.sparse import coo_matrix
+    except ImportError:
+        return None
+
+    pb = np.asarray(pb, dtype=np.int64)
+    avail = availability(pref, H, M)
+    nstu = np.bincount(pb, minlength=avail.shape[0])[:avail.shape[0]]
+    avail &= (nstu > 0)[:, None]
+    pair_a, pair_t = np.nonzero(avail)
+    slots = np.flatnonzero(avail.any(axis=0))
+    if len(pair_a) == 0:
+        return 0.0 if k == 0 else None
+
+    n_x = len(pair_a)
+    n_u = len(slots)
+    u_of_slot = np.full(H * M, -1, dtype=np.int64)
+    u_of_slot[slots] = np.arange(n_u)
+    u_col = n_x + u_of_slot[pair_t]
+    x_col = np.arange(n_x)
+
+    rows, cols, vals = [], [], []
+    # 1. x[a,t] - C u_t <= 0
+    r1 = np.arange(n_x)
+    rows += [r1, r1]
+    cols += [x_col, u_col]
+    vals += [np.ones(n_x), np.full(n_x, -float(C))]
+    # 2. sum_a x[a,t] - R C u_t <= 0
+    r2 = n_x + u_of_slot[pair_t]
+    rows += [r2, n_x + np.arange(n_u)]
+    cols += [x_col, n_x + np.arange(n_u)]
+    vals += [np.ones(n_x), np.full(n_u, -float(R * C))]
+    # 3. sum_t x[a,t] <= n_a
+    lecturers, r3_local = np.unique(pair_a, return_inverse=True)
+    r3 = n_x + n_u + r3_local
+    rows.append(r3)
+    cols.append(x_col)
+    vals.append(np.ones(n_x))
+    # 4. -sum x <= -k
+    r4 = n_x + n_u + len(lecturers)
+    rows.append(np.full(n_x, r4))
+    cols.append(x_col)
+    vals.append(-np.ones(n_x))
+
+    n_rows = r4 + 1
+    A = coo_matrix((np.concatenate(vals), (np.concatenate(rows), np.concatenate(cols))),
+                   shape=(n_rows, n_x + n_u)).tocsr()
+    b = np.concatenate([np.zeros(n_x + n_u), nstu[lecturers].astype(float), [-float(k)]])
+    c = np.concatenate([np.zeros(n_x), np.ones(n_u)])
+    bounds = [(0, None)] * n_x + [(0, 1)] * n_u
+
+    res = linprog(c, A_ub=A, b_ub=b, bounds=bounds, method="highs")
+    if res.status != 0:
+        return None
+    return float(res.fun)
+
+
+def objective_bound(pb, types, pref, C, H, M, R, assigned):
+    """
+    Batas atas obj2 + obj3 untuk jadwal yang menempatkan >= `assigned` mahasiswa.
+    Return dict: bound, obj2_bound, obj3_bound, min_used_slots, method, time.
+    """
+    start = time.time()
+    k = int(assigned)
+    min_used = math.ceil(k / (R * C)) if C and R else 0
+    method = "combinatorial"
+
+    lp = min_used_slots_lp(pb, pref, k, C, H, M, R) if k else None
+    if lp is not None:
+        # toleransi numerik sebelum dibulatkan ke atas
+        min_used = max(min_used, math.ceil(lp - 1e-6))
+        method = "lp"
+
+    obj2_bound = max_same_type_pairs(types, C)
+    obj3_bound = H * M * R - min_used
+    return {
+        "bound": obj2_bound + obj3_bound,
+        "obj2_bound": obj2_bound,
+        "obj3_bound": obj3_bound,
+        "min_used_slots": min_used,
+        "method": method,
+        "time": time.time() - start,
+    }
+
+
+def relative_gap(objective, bound):
+    """Gap seperti MIPGap Gurobi: |bound - objective| / |objective|."""
+    if objective == 0:
+        return 0.0 if bound == 0 else None
+    return abs(bound - objective) / abs(objective)
@@ -0,0 +1,115 @@
+"""
+Cache hasil di disk, dikunci dengan fingerprint instance.
+
+Fingerprint = hash dari baris mahasiswa yang sudah dinormalisasi, matriks
+preferensi, config, dan limit. Hasil yang sama (mis. /api/compare yang
+dijalankan ulang dengan data yang sama) langsung diambil dari cache.
+Entri paling lama tidak dipakai dibuang (LRU) bila melebihi batas.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+CACHE_DIR = os.path.join(".cache", "results")
+MAX_ENTRIES = 64
+
+STUDENT_COLUMNS = ["NIM", "NAMA", "MBKM", "PEMBIMBING", "PB", "Type"]
+
+
+def _digest(payload):
+    return hashlib.sha256(payload).hexdigest()
+
+
+def students_hash(students):
+    """students: list of dict (records); hanya kolom yang mempengaruhi hasil."""
+    rows = [[s.get(c) for c in STUDENT_COLUMNS] for s in students]
+    return _digest(json.dumps(rows, default=str).encode("utf-8"))
+
+
+def pref_hash(time_pref):
+    arr = np.ascontiguousarray(np.asarray(time_pref, dtype=np.int8))
+    return _digest(str(arr.shape).encode("utf-8") + arr.tobytes())
+
+
+def config_hash(config):
+    return _digest(json.dumps(config, sort_keys=True, default=str).encode("utf-8"))
+
+
+def fingerprint(engine, students, time_pref, config, limit=None):
+    """
+    Return (key, family). `family` sama untuk instance dengan preferensi dan
+    config yang sama (tanpa melihat mahasiswa), dipakai untuk warm start.
+    """
+    family = _digest("|".join([engine, pref_hash(time_pref), config_hash(config)]).encode("utf-8"))
+    key = _digest("|".join([family, students_hash(students), str(limit)]).encode("utf-8"))
+    return key, family
+
+
+class ResultCache:
+    def __init__(self, directory=CACHE_DIR, max_entries=MAX_ENTRIES):
+        self.directory = directory
+        self.max_entries = max_entries
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "r") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        # sentuh mtime supaya entri ini dianggap baru dipakai (LRU)
+        try:
+            os.utime(path, None)
+        except OSError:
+            pass
+        return entry
+
+    def put(self, key, result, family=None, assignment=None):
+        os.makedirs(self.directory, exist_ok=True)
+        entry = {
+            "key": key,
+            "family": family,
+            "created": time.time(),
+            "result": result,
+            "assignment": assignment,
+        }
+        # tulis atomik supaya proses paralel tidak membaca file setengah jadi
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(entry, f)
+        os.replace(tmp, self._path(key))
+        self.evict()
+
+    def entries(self):
+        try:
+            names = [n for n in os.listdir(self.directory) if n.endswith(".json")]
+        except OSError:
+            return []
+        paths = [os.path.join(self.directory, n) for n in names]
+        return sorted(paths, key=lambda p: os.path.getmtime(p), reverse=True)
+
+    def evict(self):
+        for path in self.entries()[self.max_entries:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def family_assignment(self, family):
+        """Assignment {NIM: timeslot} dari entri terbaru dengan family yang sama."""
+        for path in self.entries():
+            try:
+                with open(path, "r") as f:
+                    entry = json.load(f)
+            except (OSError, ValueError):
+                continue
+            if entry.get("family") == family and entry.get("assignment"):
+                return entry["assignment"]
+        return None
@@ -0,0 +1,381 @@
+"""
+Engine heuristik (price-and-branch) berbasis pola sesi (set partitioning)
+dengan column generation.
+
+Satu kolom = pola sesi: slot global t, kelompok <= C mahasiswa yang semua
+pembimbingnya L tersedia di t, dengan panel max(D, |L|) dosen. Master memilih
+pola per slot global, tanpa simetri ruangan / mahasiswa seperti guroby.py:
+
+    max  sum_p pairs_p lam_p - sum_t use_t - P sum_j u_j     (+ H*M*R)
+    s.t. sum_{p berisi j} lam_p + u_j = 1                  tiap mahasiswa j
+         sum_{p di t} lam_p <= R use_t                       ruangan per slot
+         sum_{p di t, a di L_p} lam_p <= 1                   dosen tidak paralel
+         sum_{p di t} max(D, |L_p|) lam_p <= avail_t         dosen cukup untuk panel D
+
+Objective sama dengan greedy (obj2 + timeslot - slot global terpakai); u_j =
+mahasiswa tidak terjadwal dengan penalti P lebih besar dari seluruh objective,
+jadi jumlah mahasiswa terjadwal diutamakan. Panel D berlaku per sesi.
+
+Master LP diselesaikan berulang (scipy / HiGHS, untuk dual), pola baru dicari
+per slot dengan pricing branch-and-bound atas kelas (dosen, Type), lalu master
+integer diselesaikan atas semua pola yang terkumpul. Kolom awal = hasil greedy.
+Kolom hanya dibangkitkan di root (tanpa branch-and-price), jadi ini bukan engine
+eksak; optimalitas hanya bisa dibuktikan lewat bound berikut.
+
+Pada iterasi yang pricing-nya lengkap di semua slot, batas Lagrange
+    lp_bound = LP master + R * sum_t max(0, reduced cost terbesar di t)
+adalah batas atas objective - P * (mahasiswa tidak terjadwal) untuk semua
+jadwal (= nilai LP master penuh bila tidak ada kolom baru). Untuk hasil dengan
+U mahasiswa tidak terjadwal, `bound` = floor(lp_bound) + P * U adalah batas atas
+objective semua jadwal layak yang menjadwalkan paling sedikit sebanyak itu, dan
+`optimal` berarti hasil tepat mencapai bound tersebut (terbukti optimal).
+
+    python greedy.py --colgen 60
+"""
+import heapq
+import math
+import time
+
+from availability import AvailabilityIndex
+from greedy import (
+    compute_greedy_objectives,
+    empty_schedule,
+    records,
+    run_greedy,
+    unassigned_record,
+)
+
+EPS = 1e-6
+# toleransi numerik LP sebelum bound dibulatkan ke bawah (objective bulat)
+BOUND_TOL = 1e-4
+METHOD = "heuristic (price-and-branch)"
+
+
+def _pairs(types):
+    counts = {}
+    total = 0
+    for t in types:
+        total += counts.get(t, 0)
+        counts[t] = counts.get(t, 0) + 1
+    return total
+
+
+class Pattern:
+    __slots__ = ("slot", "students", "lecturers", "pairs")
+
+    def __init__(self, slot, students, stu):
+        self.slot = slot
+        self.students = tuple(sorted(students))
+        self.lecturers = frozenset(stu[j]["PB"] for j in self.students)
+        self.pairs = _pairs(stu[j]["Type"] for j in self.students)
+
+
+class Master:
+    """Kolom + baris master. Baris dosen (t, a) hanya ada bila dipakai suatu kolom."""
+
+    def __init__(self, stu, index, C, D, R):
+        self.stu = stu
+        self.index = index
+        self.C, self.D, self.R = C, D, R
+        self.n = len(stu)
+        self.n_slots = index.n_slots
+        self.penalty = self.n * C + self.n_slots
+        self.patterns = []
+        self.seen = set()
+
+    def add(self, pattern):
+        key = (pattern.slot, pattern.students)
+        if key in self.seen:
+            return False
+        self.seen.add(key)
+        self.patterns.append(pattern)
+        return True
+
+    def panel(self, p):
+        return max(self.D, len(p.lecturers))
+
+    def matrices(self):
+        """(c, A_eq, b_eq, A_ub, b_ub, bounds, lecturer_rows) untuk bentuk minimisasi scipy."""
+        import numpy as np
+        from scipy.sparse import coo_matrix
+
+        n, T, P = self.n, self.n_slots, len(self.patterns)
+        n_var = P + T + n            # lam_p, use_t, u_j
+        use0, u0 = P, P + T
+
+        lecturer_rows = {}
+        for p in self.patterns:
+            for a in p.lecturers:
+                lecturer_rows.setdefault((p.slot, a), len(lecturer_rows))
+        # baris ub: [0, T) ruangan, [T, 2T) panel, lalu baris dosen
+        eq_r, eq_c, ub_r, ub_c, ub_v = [], [], [], [], []
+        for k, p in enumerate(self.patterns):
+            for j in p.students:
+                eq_r.append(j)
+                eq_c.append(k)
+            ub_r += [p.slot, T + p.slot]
+            ub_c += [k, k]
+            ub_v += [1.0, float(self.panel(p))]
+            for a in p.lecturers:
+                ub_r.append(2 * T + lecturer_rows[(p.slot, a)])
+                ub_c.append(k)
+                ub_v.append(1.0)
+        eq_r += list(range(n))
+        eq_c += [u0 + j for j in range(n)]
+        ub_r += list(range(T))
+        ub_c += [use0 + t for t in range(T)]
+        ub_v += [-float(self.R)] * T
+
+        n_ub = 2 * T + len(lecturer_rows)
+        A_eq = coo_matrix(([1.0] * len(eq_r), (eq_r, eq_c)), shape=(n, n_var)).tocsr()
+        A_ub = coo_matrix((ub_v, (ub_r, ub_c)), shape=(n_ub, n_var)).tocsr()
+        b_ub = np.zeros(n_ub)
+        b_ub[T:2 * T] = self.index.count
+        b_ub[2 * T:] = 1.0
+        c = np.concatenate([
+            -np.array([p.pairs for p in self.patterns], dtype=float),
+            np.ones(T),
+            np.full(n, float(self.penalty)),
+        ])
+        bounds = [(0, None)] * P + [(0, 1)] * T + [(0, None)] * n
+        return c, A_eq, np.ones(n), A_ub, b_ub, bounds, lecturer_rows
+
+    def solve_lp(self):
+        from scipy.optimize import linprog
+
+        c, A_eq, b_eq, A_ub, b_ub, bounds, lecturer_rows = self.matrices()
+        res = linprog(c, A_ub=A_ub, b_ub=b_ub, A_eq=A_eq, b_eq=b_eq, bounds=bounds, method="highs")
+        if res.status != 0:
+            return None
+        T = self.n_slots
+        # dual versi maksimisasi = -marginal versi minimisasi
+        ub = -res.ineqlin.marginals
+        return {
+            "value": -res.fun,
+            "student": -res.eqlin.marginals,
+            "room": ub[:T],
+            "panel": ub[T:2 * T],
+            "lecturer": {key: ub[2 * T + r] for key, r in lecturer_rows.items()},
+        }
+
+    def solve_mip(self, time_limit):
+        import numpy as np
+        from scipy.optimize import Bounds, LinearConstraint, milp
+
+        c, A_eq, b_eq, A_ub, b_ub, bounds, _ = self.matrices()
+        lb = np.array([b[0] for b in bounds], dtype=float)
+        ub = np.array([np.inf if b[1] is None else b[1] for b in bounds], dtype=float)
+        res = milp(c, integrality=np.ones(len(c)), bounds=Bounds(lb, ub),
+                   constraints=[LinearConstraint(A_eq, b_eq, b_eq), LinearConstraint(A_ub, -np.inf, b_ub)],
+                   options={"time_limit": max(time_limit, 1.0), "disp": False})
+        if res.x is None:
+            return None, res.status
+        chosen = [p for k, p in enumerate(self.patterns) if res.x[k] > 0.5]
+        return chosen, res.status
+
+
+def price_slot(t, stu, index, duals, C, D, keep=2, node_limit=20000):
+    """
+    Pola dengan reduced cost terbesar (> 0) di slot t, maksimal `keep`.
+    Return (list pola (rc, students), lengkap?). Mahasiswa satu kelas (dosen, Type)
+    identik kecuali dualnya, jadi cukup ambil k terbaik dari tiap kelas.
+    """
+    room, panel = duals["room"][t], duals["panel"][t]
+    lecturer_dual = duals["lecturer"]
+    classes = {}
+    for j, s in enumerate(stu):
+        if index.available(s["PB"], t):
+            classes.setdefault((s["PB"], s["Type"]), []).append(j)
+    items = []
+    for (a, typ), js in classes.items():
+        js.sort(key=lambda j: duals["student"][j])
+        items.append((a, typ, js, [-duals["student"][j] for j in js[:C]]))
+    items.sort(key=lambda it: -it[3][0])
+
+    # top-C bobot mahasiswa di kelas ke-c dan sesudahnya (untuk bound)
+    suffix = [[] for _ in range(len(items) + 1)]
+    for c in range(len(items) - 1, -1, -1):
+        suffix[c] = sorted(items[c][3] + suffix[c + 1], reverse=True)[:C]
+
+    best = []          # min-heap (rc, students)
+    nodes = 0
+    complete = True
+    chosen = []
+    type_count = {}
+    lect_count = {}
+
+    def threshold():
+        return best[0][0] if len(best) >= keep else EPS
+
+    def dfs(c, size, value):
+        nonlocal nodes, complete
+        nodes += 1
+        if nodes > node_limit:
+            complete = False
+            return
+        fixed = room + max(D, len(lect_count)) * panel
+        if size and value - fixed > threshold():
+            entry = (value - fixed, tuple(chosen))
+            if len(best) >= keep:
+                heapq.heapreplace(best, entry)
+            else:
+                heapq.heappush(best, entry)
+        r = C - size
+        if r == 0 or c == len(items):
+            return
+        m0 = max(type_count.values(), default=0)
+        optimistic = sum(max(0.0, w + m0 + q) for q, w in enumerate(suffix[c][:r]))
+        if value - fixed + optimistic <= threshold():
+            return
+
+        a, typ, js, ws = items[c]
+        have = type_count.get(typ, 0)
+        new_lecturer = a not in lect_count
+        for k in range(min(r, len(js)), 0, -1):
+            gain = sum(ws[:k]) + k * have + k * (k - 1) // 2
+            if new_lecturer:
+                gain -= lecturer_dual.get((t, a), 0.0)
+            chosen.extend(js[:k])
+            type_count[typ] = have + k
+            lect_count[a] = lect_count.get(a, 0) + 1
+            dfs(c + 1, size + k, value + gain)
+            del chosen[-k:]
+            type_count[typ] = have
+            if have == 0:
+                del type_count[typ]
+            lect_count[a] -= 1
+            if not lect_count[a]:
+                del lect_count[a]
+        dfs(c + 1, size, value)
+
+    dfs(0, 0, 0.0)
+    return sorted(best, reverse=True), complete
+
+
+def assemble(chosen, stu, index, timeslots, D, R):
+    """Pola terpilih -> Schedule greedy (ruangan berurutan, panel dilengkapi sampai D)."""
+    Schedule = empty_schedule(timeslots)
+    load = {}
+    by_slot = {}
+    for p in chosen:
+        by_slot.setdefault(p.slot, []).append(p)
+    for t, patterns in by_slot.items():
+        busy = 0
+        for p in patterns:
+            for a in p.lecturers:
+                busy |= 1 << a
+        for r, p in enumerate(patterns[:R]):
+            i = t * R + r
+            Schedule[i]['students'] = [stu[j] for j in p.students]
+            Schedule[i]['supervisors'] = set(p.lecturers)
+            for a in p.lecturers:
+                load[a] = load.get(a, 0) + 1
+        for r, p in enumerate(patterns[:R]):
+            i = t * R + r
+            need = D - len(Schedule[i]['supervisors'])
+            if need <= 0:
+                continue
+            for a in index.co_available(t, busy, key=lambda d: (load.get(d, 0), d))[:need]:
+                Schedule[i]['supervisors'].add(a)
+                busy |= 1 << a
+                load[a] = load.get(a, 0) + 1
+    return Schedule
+
+
+def _score(Schedule, timeslots, n_unassigned, H, M):
+    objectives = compute_greedy_objectives(Schedule, timeslots, H, M)
+    return (-n_unassigned, objectives["obj2_same_type_pairs"] + objectives["obj3_min_used_timeslots"])
+
+
+def run_colgen(stu_df, pref, C=5, D=3, H=9, M=7, R=3, placement="firstfit", time_limit=60.0,
+               keep=2, node_limit=20000, stream=None, report=None):
+    """
+    Greedy sebagai kolom awal, column generation sampai tidak ada pola dengan
+    reduced cost positif (atau batas waktu), lalu master integer.
+    Return state seperti run_greedy (+ "colgen"); hasil greedy dipakai bila lebih baik.
+    report(Schedule, timeslots) dipanggil untuk hasil greedy dan hasil master bila lebih baik.
+    """
+    start_time = time.time()
+    state = run_greedy(stu_df, pref, C, D, H, M, R, placement)
+    timeslots = state["timeslots"]
+    if report is not None:
+        report(state["Schedule"], timeslots)
+    stats = {"method": METHOD, "iterations": 0, "columns": 0, "pricing_complete": False,
+             "lp_bound": None, "bound": None, "optimal": False, "penalty": None, "mip_status": None, "engine": "greedy", "time_limit": time_limit}
+    try:
+        import scipy.optimize  # noqa: F401
+    except ImportError:
+        stats["error"] = "scipy tidak tersedia"
+        state["colgen"] = stats
+        return state
+
+    stu = records(stu_df)
+    position = {s["stuID"]: j for j, s in enumerate(stu)}
+    index = AvailabilityIndex(pref, H, M)
+    master = Master(stu, index, C, D, R)
+    stats["penalty"] = master.penalty
+    for i, info in state["Schedule"].items():
+        if info['students']:
+            master.add(Pattern(timeslots[i]['slot'], [position[s["stuID"]] for s in info['students']], stu))
+
+    deadline = start_time + time_limit
+    # sebagian waktu disisakan untuk master integer
+    pricing_deadline = start_time + 0.7 * time_limit
+    while time.time() < pricing_deadline:
+        duals = master.solve_lp()
+        if duals is None:
+            break
+        stats["iterations"] += 1
+        value = duals["value"] + len(timeslots)
+        added = 0
+        complete = True
+        gain = 0.0
+        for t in range(index.n_slots):
+            found, exact = price_slot(t, stu, index, duals, C, D, keep, node_limit)
+            complete = complete and exact
+            # tanpa pola baru: reduced cost terbesar di t <= EPS
+            gain += found[0][0] if found else EPS
+            for _, students in found:
+                added += master.add(Pattern(t, students, stu))
+            if time.time() >= pricing_deadline:
+                complete = False
+                break
+        if complete:
+            # tiap slot memuat <= R pola, masing-masing dengan reduced cost <= gain slot itu
+            bound = value + R * gain
+            if stats["lp_bound"] is None or bound < stats["lp_bound"]:
+                stats["lp_bound"] = bound
+        if stream is not None:
+            print(f"[COLGEN] iterasi {stats['iterations']}: LP {value:.2f}, "
+                  f"+{added} kolom (total {len(master.patterns)})", file=stream)
+        if not added:
+            stats["pricing_complete"] = complete
+            break
+
+    stats["columns"] = len(master.patterns)
+    chosen, status = master.solve_mip(deadline - time.time())
+    stats["mip_status"] = status
+    if chosen is not None:
+        Schedule = assemble(chosen, stu, index, timeslots, D, R)
+        placed = {j for p in chosen for j in p.students}
+        unassigned = [unassigned_record(stu[j], pref) for j in range(len(stu)) if j not in placed]
+        if _score(Schedule, timeslots, len(unassigned), H, M) > \
+                _score(state["Schedule"], timeslots, len(state["unassigned"]), H, M):
+            from diagnostics import explain_unassigned
+            diagnostics = explain_unassigned(unassigned, timeslots, pref, C, Schedule, M)
+            state = dict(state, Schedule=Schedule, unassigned=unassigned, diagnostics=diagnostics)
+            stats["engine"] = "colgen"
+            if report is not None:
+                report(Schedule, timeslots)
+
+    if stats["lp_bound"] is not None:
+        n_unassigned = len(state["unassigned"])
+        _, objective = _score(state["Schedule"], timeslots, n_unassigned, H, M)
+        ceiling = math.floor(stats["lp_bound"] + BOUND_TOL)
+        stats["bound"] = ceiling + master.penalty * n_unassigned
+        # di atas bound berarti hasil (greedy) tidak layak untuk master, mis. panel D kurang
+        stats["optimal"] = objective == stats["bound"]
+
+    state["execution_time"] = time.time() - start_time
+    state["colgen"] = stats
+    return state
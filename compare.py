@@ -0,0 +1,143 @@
+"""
+Perbandingan greedy vs Gurobi untuk beberapa ukuran sampel.
+
+Data mahasiswa & preferensi dibaca dan di-encode sekali; sampel greedy
+dijalankan paralel di process pool. Sampel Gurobi berjalan berurutan di satu
+proses dengan satu template model (model_template.py) yang dibangun untuk
+sampel terbesar, karena sampel lain adalah prefix-nya. `time` per sampel
+hanya mencakup penjadwalan, setup bersama tidak dihitung. Hasil ditulis ke
+hasil_sampel_greedy.json dan hasil_sampel_gurobi.json (format yang dibaca
+/api/comparison-results); ringkasan validasi (valid, violations) tiap sampel
+hanya ikut di output JSON stdout.
+
+    python compare.py --samples 3 5 10
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from greedy import load_config
+from jobs import add_job_arguments, resolve_job
+from preprocess import prepare
+
+SAMPLE_SIZES = [3, 5, 10]
+FIELDS = ["time", "assigned", "unassigned", "objective"]
+RESULT_FILES = {"greedy": "hasil_sampel_greedy.json", "gurobi": "hasil_sampel_gurobi.json"}
+
+
+def sample_instance(stu_df, pref_arr, size):
+    """
+    `size` mahasiswa pertama. Encoding PB/Type sama dengan load_students(path, size)
+    karena ffill & factorize berurutan; baris preferensi ikut dipotong.
+    """
+    sample = stu_df.head(size)
+    n_pb = int(sample["PB"].max()) + 1 if len(sample) else 0
+    return sample, pref_arr[:n_pb].tolist()
+
+
+def validation_summary(report):
+    return {"valid": report["valid"], "violations": report["counts"]}
+
+
+def run_greedy_sample(stu_df, pref, config):
+    from greedy import build_output, records, run_greedy
+    from validate import validate_state
+
+    C, D, H, M, R = config["C"], config["D"], config["H"], config["M"], config["R"]
+    with contextlib.redirect_stdout(sys.stderr):
+        state = run_greedy(stu_df, pref, C, D, H, M, R, config["placement"])
+        output = build_output(state, stu_df, H, M, R, config["start_date"])
+    report = validate_state(state, records(stu_df), pref, C, D, H, M, R)
+    return dict({k: output[k] for k in FIELDS}, **validation_summary(report))
+
+
+def run_gurobi_samples(stu_df, pref_arr, sample_sizes, config):
+    """Semua sampel Gurobi dengan satu template; return list hasil sesuai urutan sample_sizes."""
+    import gurobipy as gp
+    from guroby import LIMIT_STU, failed_result
+    from model_template import ModelTemplate
+    from validate import validate
+
+    largest, largest_pref = sample_instance(stu_df, pref_arr, max(sample_sizes))
+    all_students = largest.to_dict(orient="records")[:LIMIT_STU]
+    results = []
+    # log Gurobi & build_model ke stderr supaya stdout tetap JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        template = None
+        for size in sample_sizes:
+            sample, pref = sample_instance(stu_df, pref_arr, size)
+            n = min(len(sample), LIMIT_STU)
+            try:
+                if template is None:
+                    template = ModelTemplate.build(all_students, largest_pref, config["C"], config["D"],
+                                                   config["H"], config["M"], config["R"])
+                result = template.solve(n=n, d=len(pref))
+            except gp.GurobiError as e:
+                print(f"Gurobi Error {e.errno}: {e}")
+                result = failed_result(n, "unknown")
+            summary = {k: result[k] for k in FIELDS}
+            if "schedule" in result:
+                report = validate(result, all_students[:n], pref, config["C"], config["D"], config["H"],
+                                  config["M"], config["R"], "schedule", "day")
+                summary.update(validation_summary(report))
+            results.append(summary)
+    return results
+
+
+def compare(stu_df, pref_arr, config, sample_sizes=SAMPLE_SIZES, workers=None):
+    """Return list per sampel: {sample, sampleSize, greedy: {...}, gurobi: {...}}."""
+    results = [{"sample": k + 1, "sampleSize": size} for k, size in enumerate(sample_sizes)]
+    empty = {"time": 0, "assigned": 0, "unassigned": 0, "objective": 0}
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        gurobi = pool.submit(run_gurobi_samples, stu_df, pref_arr, sample_sizes, config)
+        futures = {}
+        for k, size in enumerate(sample_sizes):
+            sample, pref = sample_instance(stu_df, pref_arr, size)
+            futures[k] = pool.submit(run_greedy_sample, sample, pref, config)
+        for k, future in futures.items():
+            try:
+                results[k]["greedy"] = future.result()
+            except Exception as e:
+                print(f"[COMPARE] greedy sampel {sample_sizes[k]} gagal: {e}", file=sys.stderr)
+                results[k]["greedy"] = dict(empty)
+        try:
+            for k, result in enumerate(gurobi.result()):
+                results[k]["gurobi"] = result
+        except Exception as e:
+            print(f"[COMPARE] gurobi gagal: {e}", file=sys.stderr)
+            for r in results:
+                r["gurobi"] = dict(empty)
+    return results
+
+
+def write_results(results, output_dir="."):
+    """Tulis file hasil dengan skema yang dibaca /api/comparison-results (tanpa kolom validasi)."""
+    for engine, name in RESULT_FILES.items():
+        rows = [dict(sample=r["sample"], sampleSize=r["sampleSize"], **{k: r[engine][k] for k in FIELDS})
+                for r in results]
+        with open(os.path.join(output_dir, name), "w") as f:
+            json.dump(rows, f, indent=2)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--samples', nargs='+', type=int, default=SAMPLE_SIZES, help='Ukuran sampel')
+    parser.add_argument('--workers', type=int, default=None, help='Jumlah proses (default: jumlah CPU)')
+    parser.add_argument('--output-dir', default='.',
+                        help='Direktori hasil_sampel_greedy.json / hasil_sampel_gurobi.json')
+    add_job_arguments(parser)
+    args = parser.parse_args()
+    job = resolve_job(args)
+
+    config = load_config(job["config_path"], job["config"])
+    data = prepare(job["students"], job["pref"])
+    results = compare(data["stu_df"], data["pref_arr"], config, args.samples, args.workers)
+    write_results(results, args.output_dir)
+    print(json.dumps({"ok": True, "results": results}))
+
+
+if __name__ == "__main__":
+    main()
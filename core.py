@@ -0,0 +1,222 @@
+"""
+Jalur cepat greedy tanpa pandas / numpy.
+
+Mahasiswa dibaca dari CSV atau JSON (list of records), atau dari xlsx secara
+streaming (openpyxl read-only, hanya kolom NIM/NAMA/PEMBIMBING/MBKM);
+preferensi dosen dari CSV. Encoding PB/Type, urutan, penempatan, dan format
+output sama dengan greedy.py (lihat preprocess.py untuk versi pandas).
+Library berat hanya di-load bila perlu: numpy untuk diagnostik mahasiswa
+tidak terjadwal, pandas untuk ekspor.
+
+    python core.py --students mhs.csv --pref pref.csv
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+
+from greedy import (
+    NaNSafeEncoder,
+    additional_supervisors,
+    build_output,
+    compute_npref,
+    empty_schedule,
+    generate_timeslots,
+    is_missing,
+    load_config,
+    placement_function,
+)
+from jobs import add_job_arguments, output_path, resolve_job
+
+# MBKM -> Type (mapping 0-5)
+mbkm_map = {"Magang": 0, "Stupen": 1, "Penelitian": 2, "Mengajar": 3, "KKN": 4, "Wirausaha": 5}
+
+STUDENT_COLUMNS = ["NIM", "NAMA", "MBKM", "PEMBIMBING"]
+
+
+def _cell(val):
+    # sel kosong di CSV / xlsx = missing (seperti NaN di pandas)
+    if isinstance(val, str) and val == "":
+        return None
+    return val
+
+
+def read_students(path):
+    """Baris mahasiswa (dict, hanya STUDENT_COLUMNS) dari .csv, .json, atau .xlsx."""
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if isinstance(data, dict):
+            data = data.get("students", [])
+        return [{c: _cell(row.get(c)) for c in STUDENT_COLUMNS} for row in data]
+    if ext == ".csv":
+        with open(path, "r", encoding="utf-8-sig", newline="") as f:
+            return [{c: _cell(row.get(c)) for c in STUDENT_COLUMNS} for row in csv.DictReader(f)]
+
+    # xlsx: streaming read-only, baris demi baris
+    from openpyxl import load_workbook
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = [str(h).strip() if h is not None else "" for h in next(rows, ())]
+        cols = {c: header.index(c) for c in STUDENT_COLUMNS if c in header}
+        students = []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            students.append({c: _cell(row[k]) if k < len(row) else None
+                             for c, k in cols.items()})
+        return students
+    finally:
+        wb.close()
+
+
+def encode_students(rows, limit=None):
+    """Sama dengan preprocess.encode_students: dedup NIM, limit, stuID, PB, Type."""
+    seen = set()
+    students = []
+    for row in rows:
+        key = None if is_missing(row.get("NIM")) else row.get("NIM")
+        if key in seen:
+            continue
+        seen.add(key)
+        students.append(dict(row))
+    removed_duplicates = len(rows) - len(students)
+    if removed_duplicates > 0:
+        print(f"[INFO] Removed {removed_duplicates} duplicate student(s) based on NIM", file=sys.stderr)
+        print(f"[INFO] Unique students: {len(students)}", file=sys.stderr)
+
+    if limit is not None:
+        students = students[:limit]
+
+    # sel PEMBIMBING kosong = dosen baris di atasnya; PB sesuai urutan kemunculan
+    codes = {}
+    previous = None
+    for k, s in enumerate(students):
+        s["stuID"] = k
+        if is_missing(s.get("PEMBIMBING")):
+            s["PEMBIMBING"] = previous
+        previous = s["PEMBIMBING"]
+        if is_missing(previous):
+            s["PB"] = 0
+        else:
+            s["PB"] = codes.setdefault(previous, len(codes))
+        s["Type"] = mbkm_map.get(s.get("MBKM"), -1)
+    return students
+
+
+def _to_number(val):
+    try:
+        return float(val)
+    except (TypeError, ValueError):
+        return None
+
+
+def read_pref(path, students):
+    """Sama dengan preprocess.load_pref: baris ke-a = dosen dengan PB a (list of lists)."""
+    # utf-8-sig: BOM di awal file (ekspor Excel) dibuang sebelum parsing kutip
+    with open(path, "r", encoding="utf-8-sig", newline="") as f:
+        rows = [row for row in csv.reader(f) if row]
+    n_pb = max((s["PB"] for s in students), default=-1) + 1
+    width = max((len(row) for row in rows), default=1)
+
+    if rows and all(_to_number(row[0]) is not None for row in rows):
+        # tanpa kolom nama: diasumsikan sudah urut PB
+        return [[int(_to_number(v) or 0) for v in row] + [0] * (width - len(row)) for row in rows[:n_pb]]
+
+    by_name = {}
+    for row in rows:
+        name = row[0].strip()
+        if name in by_name:
+            continue
+        values = [_to_number(v) for v in row[1:]]
+        by_name[name] = [int(v) if v is not None and v == v else 0 for v in values] + [0] * (width - len(row))
+
+    names = {}
+    for s in students:
+        names.setdefault(s["PB"], s["PEMBIMBING"])
+    return [list(by_name.get(str(names.get(a)).strip(), [0] * (width - 1))) for a in range(n_pb)]
+
+
+def student_order(students, npref):
+    """Urutan sama dengan preprocess.student_order: (npref, nstu, PB, Type, stuID)."""
+    nstu = {}
+    for s in students:
+        nstu[s["PB"]] = nstu.get(s["PB"], 0) + 1
+
+    def key(k):
+        s = students[k]
+        a = s["PB"]
+        return (npref[a] if a < len(npref) else 0, nstu[a], a, s["Type"], s["stuID"])
+
+    return sorted(range(len(students)), key=key)
+
+
+def run_core(students, pref, C=5, D=3, H=9, M=7, R=3, placement="firstfit", kernel="python"):
+    """run_greedy versi list of dict. Return state dengan format yang sama."""
+    timeslots = generate_timeslots(H, M, R)
+    Schedule = empty_schedule(timeslots)
+    sorted_students = [students[k] for k in student_order(students, compute_npref(pref))]
+
+    place = placement_function(placement, kernel)
+    start_time = time.time()
+    Schedule, unassigned = place(sorted_students, timeslots, pref, C, Schedule, M, R, D)
+    diagnostics = []
+    if unassigned:
+        from diagnostics import explain_unassigned
+        diagnostics = explain_unassigned(unassigned, timeslots, pref, C, Schedule, M)
+    additional_supervisors(Schedule, timeslots, students, pref, D, M, R)
+    execution_time = time.time() - start_time
+
+    return {
+        "Schedule": Schedule,
+        "timeslots": timeslots,
+        "unassigned": unassigned,
+        "sorted_students_df": sorted_students,
+        "execution_time": execution_time,
+        "diagnostics": diagnostics,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('limit', nargs='?', type=int, default=None, help='Limit number of students to process')
+    parser.add_argument('--placement', choices=['firstfit', 'bestfit', 'dynamic'], default=None,
+                        help='Strategi penempatan (default: config "placement" atau firstfit)')
+    parser.add_argument('--kernel', choices=['python', 'numba'], default=None,
+                        help='Implementasi first-fit (default: config "kernel" atau python; numba opsional)')
+    parser.add_argument('--export', choices=['xlsx', 'csv', 'parquet'], default=None,
+                        help='Tulis file hasil (memerlukan library ekspor)')
+    parser.add_argument('--output', default='greedy_finalForm(2D).xlsx', help='Path file ekspor')
+    parser.add_argument('--validate', action='store_true',
+                        help='Cek ulang semua constraint hasil (validate.py, memerlukan numpy)')
+    add_job_arguments(parser)
+    args = parser.parse_args()
+    job = resolve_job(args)
+
+    config = load_config(job["config_path"], job["config"])
+    C, D, H, M, R = config["C"], config["D"], config["H"], config["M"], config["R"]
+
+    students = encode_students(read_students(job["students"]), args.limit)
+    pref = read_pref(job["pref"], students)
+
+    state = run_core(students, pref, C, D, H, M, R, args.placement or config["placement"],
+                     args.kernel or config["kernel"])
+    output = build_output(state, students, H, M, R, config["start_date"])
+    if args.validate:
+        from validate import validate_state
+        output["validation"] = validate_state(state, students, pref, C, D, H, M, R)
+    print(json.dumps(output, cls=NaNSafeEncoder))
+    sys.stdout.flush()
+
+    if args.export:
+        from export import export_result
+        saved = dict(output, sorted_students=state["sorted_students_df"])
+        export_result(saved, output_path(job, args.output), args.export)
+
+
+if __name__ == "__main__":
+    main()
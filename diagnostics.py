@@ -0,0 +1,101 @@
+"""
+Diagnostik mahasiswa tidak terjadwal, dihitung setelah penempatan selesai.
+
+Loop greedy cukup berhenti di cek pertama yang gagal; alasan hanya dihitung
+untuk mahasiswa yang benar-benar tidak terjadwal, sekaligus untuk semua
+timeslot memakai mask numpy atas matriks ketersediaan, kapasitas, dan
+okupansi dosen.
+
+Diagnosis ini post-hoc: dihitung terhadap jadwal akhir, bukan keadaan saat
+mahasiswa ditolak. Sesi hanya bertambah isi, jadi timeslot yang terblokir saat
+itu tetap terblokir di akhir, tetapi alasan "penuh" / "konflik dosen" bisa
+merujuk ke sesi yang baru terisi setelah mahasiswa tersebut dilewati.
+"""
+import numpy as np
+
+REASON_ORDER = ["penuh", "pref!=", "konflik dosen"]
+
+
+def _availability_matrix(time_pref, n_slots):
+    # potong / pad ke H*M kolom; slot di luar preferensi dianggap tidak tersedia
+    d = len(time_pref)
+    avail = np.zeros((d, n_slots), dtype=bool)
+    for a, row in enumerate(time_pref):
+        vals = np.asarray(row[:n_slots], dtype=float)
+        avail[a, :len(vals)] = vals == 1
+    return avail
+
+
+def blocked_masks(pbs, timeslots, time_pref, C, Schedule):
+    """
+    Untuk tiap dosen di `pbs` (array), mask (len(pbs) x T) timeslot yang
+    gagal karena penuh / dosen tidak tersedia / dosen sedang di ruang lain.
+    """
+    slots = np.fromiter((ts['slot'] for ts in timeslots), dtype=np.int64, count=len(timeslots))
+    n_slots = int(slots.max()) + 1 if len(slots) else 0
+    counts = np.fromiter((len(Schedule[i]['students']) for i in range(len(timeslots))),
+                         dtype=np.int64, count=len(timeslots))
+
+    # okupansi dosen: presence[k, i] = dosen pbs[k] hadir di timeslot i
+    row_of = {int(a): k for k, a in enumerate(pbs)}
+    presence = np.zeros((len(pbs), len(timeslots)), dtype=np.int64)
+    for i in range(len(timeslots)):
+        for a in Schedule[i]['supervisors']:
+            k = row_of.get(int(a))
+            if k is not None:
+                presence[k, i] = 1
+    per_slot = np.zeros((len(pbs), n_slots), dtype=np.int64)
+    np.add.at(per_slot, (slice(None), slots), presence)
+
+    avail = _availability_matrix(time_pref, n_slots)
+    valid = (pbs >= 0) & (pbs < len(time_pref))
+    pref_ok = np.zeros((len(pbs), len(timeslots)), dtype=bool)
+    pref_ok[valid] = avail[pbs[valid]][:, slots]
+
+    return {
+        "penuh": np.broadcast_to(counts >= C, pref_ok.shape),
+        "pref!=": ~pref_ok,
+        "konflik dosen": (per_slot[:, slots] - presence) > 0,
+    }
+
+
+def explain_unassigned(unassigned, timeslots, time_pref, C, Schedule, M=7, max_alternatives=3):
+    """
+    Isi `alasan_unassigned` tiap mahasiswa tidak terjadwal dan kembalikan
+    diagnostik (terhadap jadwal akhir, lihat docstring modul): jumlah timeslot
+    yang terblokir per alasan, serta maksimal `max_alternatives` alternatif --
+    timeslot tempat dosen pembimbing tersedia dan yang hanya terblokir oleh
+    "penuh" atau "konflik dosen", urut timeslot (paling awal lebih dulu).
+    Timeslot dengan "pref!=" tidak pernah bisa dipakai mahasiswa tsb, jadi
+    tidak disarankan.
+    """
+    if not unassigned:
+        return []
+
+    pbs, inverse = np.unique(np.array([s['PB'] for s in unassigned], dtype=np.int64), return_inverse=True)
+    masks = blocked_masks(pbs, timeslots, time_pref, C, Schedule)
+    stacked = np.stack([masks[r] for r in REASON_ORDER])      # (3, u, T)
+    n_blocking = stacked.sum(axis=0)                          # (u, T)
+    blocked_counts = stacked.sum(axis=2)                      # (3, u)
+
+    # alternatif: dosen tersedia dan hanya satu penghalang (penuh / konflik dosen)
+    fixable = ~masks["pref!="] & (n_blocking == 1)            # (u, T)
+
+    diagnostics = []
+    for s, k in zip(unassigned, inverse):
+        reasons = [r for j, r in enumerate(REASON_ORDER) if blocked_counts[j, k] > 0]
+        s['alasan_unassigned'] = ", ".join(reasons) if reasons else "tidak diketahui"
+
+        alternatives = []
+        for i in np.flatnonzero(fixable[k])[:max_alternatives].tolist():
+            slot = timeslots[i]['slot']
+            alternatives.append({
+                "timeslot": f"Hari ke-{slot // M + 1}, Slot {slot % M + 1}, Room {timeslots[i]['ruang'] + 1}",
+                "blocked_by": next(r for j, r in enumerate(REASON_ORDER) if stacked[j, k, i]),
+            })
+        diagnostics.append({
+            "NIM": str(s.get("NIM", "-")),
+            "blocked": {r: int(blocked_counts[j, k]) for j, r in enumerate(REASON_ORDER)},
+            "alternatives": alternatives,
+        })
+    return diagnostics
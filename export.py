@@ -0,0 +1,130 @@
+"""
+Ekspor hasil penjadwalan yang sudah disimpan (JSON dari greedy.py --save-result)
+ke xlsx, csv, atau parquet. Dijalankan terpisah dari penjadwalan:
+
+    python export.py hasil.json --format xlsx --output jadwal.xlsx
+"""
+import argparse
+import csv
+import json
+import math
+import os
+
+# (nama sheet, key di JSON hasil, kolom default)
+SHEETS = [
+    ("Jadwal", "table",
+     ["Hari", "Slot", "Ruangan", "NIM", "Nama", "Type", "Pembimbing", "Dosen yang Hadir"]),
+    ("Tidak Terjadwal", "unassigned_table",
+     ["NIM", "Nama", "Type", "Pembimbing", "Alasan Unassigned", "Time Preference"]),
+    ("Mahasiswa Terurut", "sorted_students", None),
+]
+
+
+def _clean(val):
+    if isinstance(val, float) and (math.isnan(val) or math.isinf(val)):
+        return None
+    if isinstance(val, (list, dict, set)):
+        return json.dumps(list(val) if isinstance(val, set) else val)
+    return val
+
+
+def collect_sheets(result):
+    """Ambil (nama sheet, kolom, records) dari hasil; sheet yang tidak ada dilewati."""
+    sheets = []
+    for name, key, columns in SHEETS:
+        records = result.get(key)
+        if records is None:
+            continue
+        if columns is None:
+            columns = list(records[0].keys()) if records else []
+        sheets.append((name, columns, records))
+    return sheets
+
+
+def _write_xlsx(sheets, output_path):
+    # xlsxwriter constant_memory menulis baris demi baris (streaming);
+    # kalau tidak terpasang, pakai openpyxl mode write_only
+    try:
+        import xlsxwriter
+    except ImportError:
+        xlsxwriter = None
+
+    if xlsxwriter is not None:
+        workbook = xlsxwriter.Workbook(output_path, {"constant_memory": True, "nan_inf_to_errors": True})
+        for name, columns, records in sheets:
+            ws = workbook.add_worksheet(name)
+            ws.write_row(0, 0, columns)
+            for r, rec in enumerate(records, start=1):
+                ws.write_row(r, 0, [_clean(rec.get(c)) for c in columns])
+        workbook.close()
+        return [output_path]
+
+    from openpyxl import Workbook
+    wb = Workbook(write_only=True)
+    for name, columns, records in sheets:
+        ws = wb.create_sheet(name)
+        ws.append(columns)
+        for rec in records:
+            ws.append([_clean(rec.get(c)) for c in columns])
+    wb.save(output_path)
+    return [output_path]
+
+
+def _sheet_path(output_path, name, ext):
+    stem, _ = os.path.splitext(output_path)
+    return f"{stem}_{name.lower().replace(' ', '_')}.{ext}"
+
+
+def _write_csv(sheets, output_path):
+    paths = []
+    for name, columns, records in sheets:
+        path = _sheet_path(output_path, name, "csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(columns)
+            for rec in records:
+                row = [_clean(rec.get(c)) for c in columns]
+                writer.writerow(["" if v is None else v for v in row])
+        paths.append(path)
+    return paths
+
+
+def _write_parquet(sheets, output_path):
+    # butuh pyarrow (atau fastparquet) terpasang
+    import pandas as pd
+    paths = []
+    for name, columns, records in sheets:
+        path = _sheet_path(output_path, name, "parquet")
+        df = pd.DataFrame([{c: _clean(rec.get(c)) for c in columns} for rec in records], columns=columns)
+        df.to_parquet(path, index=False)
+        paths.append(path)
+    return paths
+
+
+WRITERS = {"xlsx": _write_xlsx, "csv": _write_csv, "parquet": _write_parquet}
+
+
+def export_result(result, output_path, fmt="xlsx"):
+    """Tulis hasil ke file. Mengembalikan daftar path yang ditulis."""
+    if fmt not in WRITERS:
+        raise ValueError(f"Format ekspor tidak dikenal: {fmt}")
+    return WRITERS[fmt](collect_sheets(result), output_path)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('result', help='File JSON hasil (greedy.py --save-result)')
+    parser.add_argument('--format', choices=sorted(WRITERS), default='xlsx')
+    parser.add_argument('--output', default=None, help='Path file ekspor')
+    args = parser.parse_args()
+
+    with open(args.result, 'r') as f:
+        result = json.load(f)
+
+    output_path = args.output or f"greedy_finalForm(2D).{args.format}"
+    for path in export_result(result, output_path, args.format):
+        print(path)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,30 @@
-import pandas as pd
 import argparse, json, re
+import heapq
 from datetime import datetime, timedelta
 import math
+import sys
 import time
 
-# Parse command line arguments
-parser = argparse.ArgumentParser()
-parser.add_argument('limit', nargs='?', type=int, default=None, help='Limit number of students to process')
-args = parser.parse_args()
-
-# Read config
-with open('config.json', 'r') as f:
-    config = json.load(f)
+# pandas / numpy di-import di dalam fungsi yang memakainya, supaya jalur
+# cepat (core.py) cukup dengan library standar
+from availability import AvailabilityIndex
+from jobs import add_job_arguments, output_path, resolve_job
+
+slot_map = {
+    0: "08:00-09:00",
+    1: "09:00-10:00",
+    2: "10:00-11:00",
+    3: "11:00-12:00",
+    4: "13:00-14:00",
+    5: "14:00-15:00",
+    6: "15:00-16:00",
+    # kalau memang hanya 7 slot per hari, jangan pakai index 7:
+    # 7: "16:00-17:00",
+}
 
-C = config.get('C', 5)
-D = config.get('D', 3)
-H = config.get('H', 9)
-M = config.get('M', 7)
-R = config.get('R', 3)
-start_date_str = config.get('start_date')
-
-# Debug: print start_date to stderr so it doesn't interfere with JSON output
-import sys
-print(f"DEBUG: start_date_str from config = {start_date_str}", file=sys.stderr)
+# kolom tabel hasil (output JSON & ekspor)
+TABLE_COLUMNS = ["Hari", "Slot", "Ruangan", "NIM", "Nama", "Type", "Pembimbing", "Dosen yang Hadir"]
+UNASSIGNED_COLUMNS = ["NIM", "Nama", "Type", "Pembimbing", "Alasan Unassigned", "Time Preference"]
 
 # ================================================FUNCTION=========================================
 def compute_npref(pref):
@@ -30,32 +32,36 @@ def compute_npref(pref):
     return [sum(dosen) for dosen in pref]
 
 
-    # students: list of dict {id, Type, PB}
-    # npref: list atau dict
-    # nstu: dict {pb: jumlah mhs}
-def sort_with_type( npref, nstu):
-    students = stu_df.to_dict(orient="records")
-    # Normalisasi npref jadi dict
-    if not isinstance(npref, dict):
-        npref = {i: v for i, v in enumerate(npref)}
-    # Normalisasi nstu (kalau ada dosen tanpa mahasiswa = 0)
-    for a in range(len(npref)):
-        nstu.setdefault(a, 0)
-    
-    # Step 1+2: sort dosen berdasarkan (npref, nstu)
-    supervisors_sorted = sorted(
-        npref.keys(),
-        key=lambda a: (npref[a], nstu[a], a)
-    )
-    
-    # Step 3: untuk tiap dosen, ambil mahasiswa dan urutkan by type
-    schedule = []
-    for sup in supervisors_sorted:
-        mhs = [s for s in students if s["PB"] == sup]
-        mhs_sorted = sorted(mhs, key=lambda s: (s["Type"], s["stuID"]))
-        schedule.extend(mhs_sorted)
-    
-    return schedule
+def records(students):
+    # DataFrame atau list of dict -> list of dict
+    if hasattr(students, "to_dict"):
+        return students.to_dict(orient="records")
+    return students
+
+
+def is_missing(val):
+    # None / NaN / NaT / pd.NA tanpa perlu import pandas
+    if val is None:
+        return True
+    try:
+        return bool(val != val)
+    except TypeError:
+        return True
+
+
+def pembimbing_by_pb(students):
+    # PB -> nama PEMBIMBING dari baris pertama dengan PB tsb
+    names = {}
+    for s in records(students):
+        names.setdefault(s['PB'], s.get('PEMBIMBING'))
+    return names
+
+
+def sort_with_type(stu_df, npref):
+    # urutan: dosen (npref, nstu, PB) -> Type -> stuID, lihat preprocess.student_order
+    from preprocess import student_order
+    order = student_order(stu_df, npref)
+    return stu_df.iloc[order].to_dict(orient="records")
 
 def supervisor_available(time_pref, supervisor_id, slot_index, M=7, R=3, H=9):
     """
@@ -70,14 +76,14 @@ def supervisor_available(time_pref, supervisor_id, slot_index, M=7, R=3, H=9):
         return False
 
 
-def check_supervisor_conflict(Schedule, timeslots, curr, supervisor_id):
+def check_supervisor_conflict(Schedule, timeslots, curr, supervisor_id, M=7):
     slot = timeslots[curr]['slot']  # now 0-62
     room = timeslots[curr]['ruang']
-    
+
     # Calculate day and slot_in_day from slot (0-62)
     curr_day = slot // M
     curr_slot_in_day = slot % M
-    
+
     for idx, ts in enumerate(timeslots):
         if idx == curr:
             continue
@@ -90,68 +96,335 @@ def check_supervisor_conflict(Schedule, timeslots, curr, supervisor_id):
                 return False
     return True
 
+def room_bitsets(Schedule):
+    """Bitset dosen yang hadir per timeslot (bit a = dosen a)."""
+    return [sum(1 << int(a) for a in Schedule[i]['supervisors']) for i in range(len(Schedule))]
+
+
+def supervisor_free(room_bits, curr, supervisor_id, R=3):
+    """
+    Sama dengan check_supervisor_conflict, tapi hanya melihat bitset R ruangan
+    pada slot global yang sama (timeslot i = slot*R + r), bukan scan semua timeslot.
+    """
+    first = curr - curr % R
+    for i in range(first, first + R):
+        if i != curr and (room_bits[i] >> int(supervisor_id)) & 1:
+            return False
+    return True
+
+
+def availability_index(time_pref, timeslots, M=7, R=3):
+    # H diturunkan dari jumlah timeslot (H*M*R)
+    return AvailabilityIndex(time_pref, len(timeslots) // (M * R), M)
+
+
 def reset_schedule(Schedule):
     for i in Schedule:
         Schedule[i]["students"].clear()
         Schedule[i]["supervisors"].clear()
-        
-def greedy_schedule(sorted_students_df, timeslots, time_pref, C, Schedule):
+
+def greedy_schedule(sorted_students_df, timeslots, time_pref, C, Schedule, M=7, R=3, D=None):
     unassigned_students = []
     assigned_nims = set()  # Track assigned students by NIM to prevent duplicates
-    
-    for s in sorted_students_df.to_dict(orient="records"):
+
+    # Dengan D: hanya timeslot tempat dosen tersedia yang discan, slot yang
+    # bisa mendapat panel D dosen lebih dulu (lihat AvailabilityIndex.slot_order)
+    index = availability_index(time_pref, timeslots, M, R) if D is not None else None
+    order_by_sup = {}
+    room_bits = room_bitsets(Schedule)
+
+    for s in records(sorted_students_df):
         supervisor_id = s['PB']
         student_nim = safe_get(s, ["NIM"])
-        
+
         # Skip if this student is already assigned
         if student_nim in assigned_nims:
             continue
-        
+
         assigned = False
 
-        #  alasan unik (tanpa spam detail slot/hari)
-        reason_set = set()
-
-        for i in range(len(timeslots)):
-            timeslot = timeslots[i]
-            slot = timeslot['slot']
-            room = timeslot['ruang']
-
-            curr_day = slot // M
-            curr_slot_in_day = slot % M
-
-            # Cek constraints
-            
-            is_capacity_available = (len(Schedule[i]['students']) < C)
-            
-            is_supervisor_avail = supervisor_available(time_pref, supervisor_id, slot, M, R)
-            is_conflict_free = check_supervisor_conflict(Schedule, timeslots, i, supervisor_id)
-
-            if is_capacity_available and is_supervisor_avail and is_conflict_free:
-                Schedule[i]['students'].append(s)
-                Schedule[i]['supervisors'].add(supervisor_id)
-                if student_nim:
-                    assigned_nims.add(student_nim)  # Mark this student as assigned
-                assigned = True
-                break
-            else:
-                if not is_capacity_available:
-                    reason_set.add("penuh")
-                if not is_supervisor_avail:
-                    reason_set.add("pref!=")  # tidak cocok waktu dosen
-                if not is_conflict_free:
-                    reason_set.add("konflik dosen")
+        if index is None:
+            candidates = range(len(timeslots))
+        else:
+            if supervisor_id not in order_by_sup:
+                order_by_sup[supervisor_id] = index.timeslot_order(supervisor_id, D, R)
+            candidates = order_by_sup[supervisor_id]
+
+        for i in candidates:
+            slot = timeslots[i]['slot']
+
+            # Cek constraints, berhenti di cek pertama yang gagal (murah -> mahal);
+            # alasan unassigned dihitung belakangan oleh diagnostics.explain_unassigned
+            if len(Schedule[i]['students']) >= C:
+                continue
+            if not supervisor_available(time_pref, supervisor_id, slot, M, R):
+                continue
+            if not supervisor_free(room_bits, i, supervisor_id, R):
+                continue
+
+            Schedule[i]['students'].append(s)
+            Schedule[i]['supervisors'].add(supervisor_id)
+            room_bits[i] |= 1 << int(supervisor_id)
+            if student_nim:
+                assigned_nims.add(student_nim)  # Mark this student as assigned
+            assigned = True
+            break
 
         if not assigned:
-            s_copy = s.copy()
-            order = ["penuh", "pref!=", "konflik dosen"]
-            reasons_sorted = [r for r in order if r in reason_set] + [r for r in reason_set if r not in order]
-            s_copy['alasan_unassigned'] = ", ".join(reasons_sorted) if reasons_sorted else "tidak diketahui"
-            s_copy['time_preference'] = time_pref[supervisor_id] if supervisor_id < len(time_pref) else []
-            unassigned_students.append(s_copy)
+            unassigned_students.append(unassigned_record(s, time_pref))
+
+    return Schedule, unassigned_students
+
+def unassigned_record(s, time_pref):
+    s_copy = s.copy()
+    s_copy['time_preference'] = time_pref[s['PB']] if s['PB'] < len(time_pref) else []
+    return s_copy
+
+
+def plain_record(s):
+    """Record mahasiswa tanpa kolom tambahan dari unassigned_record / explain_unassigned."""
+    return {k: v for k, v in s.items() if k not in ("time_preference", "alasan_unassigned")}
+
+
+def best_fit_schedule(sorted_students_df, timeslots, time_pref, C, Schedule, M=7, R=3, D=None):
+    """
+    Best-fit: untuk tiap mahasiswa hanya sesi kandidat yang dinilai
+    (sesi terbuka dengan dosen sama / Type sama, lalu sesi baru), dan dipilih
+    skor terbaik = pasangan Type sama yang bertambah - slot global baru yang terpakai.
+    Ringkasan per sesi dipelihara sehingga tidak perlu scan ulang dari index 0.
+    Dengan D, kandidat hanya sesi di slot yang masih bisa mendapat panel lengkap:
+    jumlah kebutuhan panel semua ruangan di slot itu (max(D, pembimbing) per
+    ruangan, dosen tidak boleh di dua ruangan) tidak melebihi dosen yang tersedia.
+    """
+    unassigned_students = []
+    assigned_nims = set()
+    index = availability_index(time_pref, timeslots, M, R)
+
+    # ringkasan per sesi (ikut isi Schedule yang sudah ada, mis. dari repair)
+    type_count = {i: {} for i in Schedule}
+    sessions_by_sup = {}
+    sessions_by_type = {}
+    busy = {}            # (slot global, dosen) -> timeslot
+    rooms_used = {}      # slot global -> jumlah ruangan terpakai
+    demand = {}          # slot global -> jumlah dosen yang dibutuhkan panel semua ruangan
+    for i, info in Schedule.items():
+        slot = timeslots[i]['slot']
+        for st in info['students']:
+            type_count[i][st['Type']] = type_count[i].get(st['Type'], 0) + 1
+            sessions_by_type.setdefault(st['Type'], set()).add(i)
+        for a in info['supervisors']:
+            sessions_by_sup.setdefault(a, set()).add(i)
+            busy[(slot, a)] = i
+        if info['students']:
+            rooms_used[slot] = rooms_used.get(slot, 0) + 1
+            if D is not None:
+                demand[slot] = demand.get(slot, 0) + max(D, len(info['supervisors']))
+
+    def extra_demand(i, a):
+        # tambahan kebutuhan panel di slot i bila pembimbing a masuk sesi i
+        sups = Schedule[i]['supervisors']
+        if not Schedule[i]['students']:
+            return max(D, 1)
+        if a in sups:
+            return 0
+        return max(D, len(sups) + 1) - max(D, len(sups))
+
+    def panel_ok(i, a):
+        if D is None:
+            return True
+        slot = timeslots[i]['slot']
+        return demand.get(slot, 0) + extra_demand(i, a) <= index.count[slot]
+
+    def feasible(i, a):
+        slot = timeslots[i]['slot']
+        return (len(Schedule[i]['students']) < C
+                and supervisor_available(time_pref, a, slot, M, R)
+                and busy.get((slot, a), i) == i
+                and panel_ok(i, a))
+
+    for s in records(sorted_students_df):
+        a = s['PB']
+        t = s['Type']
+        student_nim = safe_get(s, ["NIM"])
+        if student_nim in assigned_nims:
+            continue
+
+        # kandidat: sesi terbuka (dosen sama / Type sama)
+        candidates = set(sessions_by_sup.get(a, ())) | set(sessions_by_type.get(t, ()))
+        # sesi baru: ruangan kosong pertama di slot global yang sudah terpakai,
+        # lalu ruangan kosong pertama di slot global baru
+        new_used = new_fresh = None
+        for slot in (index.slot_order(a) if D is None else index.panel_slots(a, D)):
+            if new_used is not None and new_fresh is not None:
+                break
+            if busy.get((slot, a)) is not None:
+                continue
+            used = rooms_used.get(slot, 0) > 0
+            if (used and new_used is not None) or (not used and new_fresh is not None):
+                continue
+            for r in range(R):
+                i = slot * R + r
+                if not Schedule[i]['students']:
+                    if not panel_ok(i, a):
+                        break
+                    if used:
+                        new_used = i
+                    else:
+                        new_fresh = i
+                    break
+        for i in (new_used, new_fresh):
+            if i is not None:
+                candidates.add(i)
+
+        best = None
+        best_key = None
+        for i in candidates:
+            if not feasible(i, a):
+                continue
+            slot = timeslots[i]['slot']
+            gain = type_count[i].get(t, 0)
+            if not Schedule[i]['students'] and rooms_used.get(slot, 0) == 0:
+                gain -= 1
+            key = (-gain, 0 if a in Schedule[i]['supervisors'] else 1, i)
+            if best_key is None or key < best_key:
+                best, best_key = i, key
+
+        if best is None:
+            unassigned_students.append(unassigned_record(s, time_pref))
+            continue
+
+        slot = timeslots[best]['slot']
+        if D is not None:
+            demand[slot] = demand.get(slot, 0) + extra_demand(best, a)
+        if not Schedule[best]['students']:
+            rooms_used[slot] = rooms_used.get(slot, 0) + 1
+        Schedule[best]['students'].append(s)
+        Schedule[best]['supervisors'].add(a)
+        type_count[best][t] = type_count[best].get(t, 0) + 1
+        busy[(slot, a)] = best
+        if len(Schedule[best]['students']) < C:
+            sessions_by_sup.setdefault(a, set()).add(best)
+            sessions_by_type.setdefault(t, set()).add(best)
+        else:
+            # sesi penuh tidak perlu dinilai lagi
+            for group in sessions_by_sup.values():
+                group.discard(best)
+            for group in sessions_by_type.values():
+                group.discard(best)
+        if student_nim:
+            assigned_nims.add(student_nim)
 
     return Schedule, unassigned_students
 
+def dynamic_schedule(sorted_students_df, timeslots, time_pref, C, Schedule, M=7, R=3, D=None):
+    """
+    Urutan dinamis most-constrained-first (gaya DSatur). Heap berisi dosen yang
+    masih punya mahasiswa tersisa, dengan kunci jumlah sesi yang masih layak
+    untuk dosen itu (belum penuh, dosen tersedia, tidak sedang di ruangan lain
+    pada slot yang sama); mahasiswa berikutnya selalu dari dosen dengan sesi
+    layak paling sedikit. Kunci diperbarui setelah tiap penempatan hanya untuk
+    dosen yang terdampak (sesi menjadi penuh, atau dosen mulai memakai ruangan
+    di suatu slot). Penempatan tiap mahasiswa tetap first-fit seperti
+    greedy_schedule; urutan awal sorted_students_df menjadi tie-break.
+    """
+    unassigned_students = []
+    assigned_nims = set()
+    index = availability_index(time_pref, timeslots, M, R)
+
+    busy = {}            # (slot global, dosen) -> timeslot
+    for i, info in Schedule.items():
+        for a in info['supervisors']:
+            busy[(timeslots[i]['slot'], a)] = i
+
+    def feasible(i, a):
+        return len(Schedule[i]['students']) < C and busy.get((timeslots[i]['slot'], a), i) == i
+
+    # antrian mahasiswa per dosen (urutan Type / stuID dari sorted_students_df)
+    queues = {}
+    first = {}
+    for pos, s in enumerate(records(sorted_students_df)):
+        queues.setdefault(s['PB'], []).append(s)
+        first.setdefault(s['PB'], pos)
+    heads = dict.fromkeys(queues, 0)
+
+    def remaining(a):
+        return len(queues[a]) - heads[a]
+
+    candidates = {}
+    left = {}
+    for a in queues:
+        candidates[a] = range(len(timeslots)) if D is None else index.timeslot_order(a, D, R)
+        left[a] = sum(1 for t in index.slot_order(a) for r in range(R)
+                      if t * R + r < len(timeslots) and feasible(t * R + r, a))
+
+    def key(a):
+        return (left[a], -remaining(a), first[a])
+
+    def place(s, a):
+        """First-fit untuk s; return timeslot (None bila gagal) dan dosen yang kuncinya berubah."""
+        for i in candidates[a]:
+            slot = timeslots[i]['slot']
+            if not (index.available(a, slot) and feasible(i, a)):
+                continue
+            touched = {a}
+            if busy.get((slot, a)) is None:
+                # ruangan lain pada slot ini tidak lagi layak untuk a
+                busy[(slot, a)] = i
+                left[a] -= sum(1 for r in range(R)
+                               if slot * R + r != i and len(Schedule[slot * R + r]['students']) < C)
+            Schedule[i]['students'].append(s)
+            Schedule[i]['supervisors'].add(a)
+            if len(Schedule[i]['students']) >= C:
+                # sesi penuh: tidak layak lagi untuk semua dosen yang tadinya bisa masuk
+                for b in index.co_available(slot):
+                    if b in left and busy.get((slot, b), i) == i:
+                        left[b] -= 1
+                        touched.add(b)
+            return i, touched
+        return None, {a}
+
+    heap = [(key(a), a) for a in queues]
+    heapq.heapify(heap)
+
+    while heap:
+        k, a = heapq.heappop(heap)
+        if heads[a] >= len(queues[a]) or k != key(a):
+            continue  # entri lama
+        s = queues[a][heads[a]]
+        heads[a] += 1
+        touched = {a}
+        student_nim = safe_get(s, ["NIM"])
+        if student_nim not in assigned_nims:
+            i, touched = place(s, a) if left[a] > 0 else (None, touched)
+            if i is None:
+                unassigned_students.append(unassigned_record(s, time_pref))
+            elif student_nim:
+                assigned_nims.add(student_nim)
+        for b in touched:
+            if heads[b] < len(queues[b]):
+                heapq.heappush(heap, (key(b), b))
+
+    return Schedule, unassigned_students
+
+
+def placement_function(placement="firstfit", kernel="python"):
+    """
+    Fungsi penempatan untuk placement / kernel. kernel "numba" memakai
+    greedy_kernel (first-fit atas array, hasil identik); tanpa numba kembali
+    ke greedy_schedule.
+    """
+    if placement == "bestfit":
+        return best_fit_schedule
+    if placement == "dynamic":
+        return dynamic_schedule
+    if kernel == "numba":
+        from greedy_kernel import HAVE_NUMBA, kernel_greedy_schedule
+        if HAVE_NUMBA:
+            return kernel_greedy_schedule
+        print("[INFO] numba tidak terpasang, kernel Python dipakai", file=sys.stderr)
+    return greedy_schedule
+
+
 def compute_greedy_objectives(schedule, timeslots, H, M):
     obj2_same_type_pairs = 0
     used_slots = set()   # kumpulkan slot (tanpa lihat ruangan) yang terpakai
@@ -190,17 +463,15 @@ def to_serializable(o):
     # set → list
     if isinstance(o, set):
         return list(o)
-    # numpy / pandas scalar (jaga-jaga)
-    try:
-        import numpy as np
-        if isinstance(o, (np.integer,)):
+    # numpy scalar: cukup dicek bila numpy sudah ter-load (tanpa import ulang tiap panggilan)
+    np = sys.modules.get("numpy")
+    if np is not None:
+        if isinstance(o, np.integer):
             return int(o)
-        if isinstance(o, (np.floating,)):
+        if isinstance(o, np.floating):
             return float(o) if not np.isnan(o) else None  # replace NaN with None
-    except Exception:
-        pass
     # pandas NaN
-    if pd.isna(o):
+    if is_missing(o):
         return None
     # fallback
     return str(o)
@@ -209,43 +480,65 @@ def to_serializable(o):
 def safe_get(s, keys, default="-"):
     for key in keys:
         val = s.get(key)
-        if val is not None and not pd.isna(val):
+        if not is_missing(val):
             return str(val)
     return default
 
 
-def additional_supervisors():
-    count_dosen_passed = 0
-    for i in range(len(timeslots)):
-        timeslot = timeslots[i]
-        slot = timeslot['slot']
-
-        if len(Schedule[i]['students']) > 0:  # sesi aktif
-            while len(Schedule[i]["supervisors"]) < D:
-                for dosen in stu_df['PB'].unique():
-                    # print("curr dosen viewing: ", dosen )
-                    is_dosen_in_schedule = dosen not in Schedule[i]['supervisors'] #cek apakah dosen belum di sesi sekarang
-                    is_supervisor_avail = supervisor_available(pref, dosen, slot, M, R)
-                    is_conflict_free = check_supervisor_conflict(Schedule, timeslots, i, dosen)
-                    if is_dosen_in_schedule and is_supervisor_avail and is_conflict_free and len(Schedule[i]["supervisors"]) < D:
-                        Schedule[i]['supervisors'].add(dosen)
-                        # print("add in schedule",i, Schedule[i]['supervisors'])
-                break
+def additional_supervisors(Schedule, timeslots, stu_df, pref, D, M=7, R=3, sessions=None, load=None):
+    """
+    Lengkapi tiap sesi aktif sampai D dosen. Kandidat diambil dari indeks
+    bitset: dosen yang tersedia di slot tsb dan belum hadir di ruangan mana pun
+    pada slot yang sama; yang paling sedikit hadir di sesi lain dipilih dulu.
+    Sesi yang memang tidak bisa mendapat D dosen dibiarkan kurang.
+    sessions: hanya timeslot ini yang dilengkapi (mis. yang berubah pada repair).
+    load: {dosen: jumlah sesi yang dihadiri} bila sudah dihitung pemanggil
+    (diperbarui di tempat), supaya tidak perlu scan seluruh Schedule.
+    """
+    index = availability_index(pref, timeslots, M, R)
+    allowed = 0
+    for dosen in pembimbing_by_pb(stu_df):
+        allowed |= 1 << int(dosen)
+
+    targets = range(len(timeslots)) if sessions is None else sorted(sessions)
+
+    # busy[slot global] = bitset dosen yang sudah hadir di salah satu ruangan;
+    # cukup untuk slot dari sesi yang dilengkapi
+    busy = {}
+    for slot in {timeslots[i]['slot'] for i in targets}:
+        busy[slot] = 0
+        for i in range(slot * R, slot * R + R):
+            for dosen in Schedule[i]['supervisors']:
+                busy[slot] |= 1 << int(dosen)
+    if load is None:
+        load = {}
+        for info in Schedule.values():
+            for dosen in info['supervisors']:
+                load[dosen] = load.get(dosen, 0) + 1
+
+    for i in targets:
+        slot = timeslots[i]['slot']
+        if not Schedule[i]['students']:  # hanya sesi aktif
+            continue
+        need = D - len(Schedule[i]['supervisors'])
+        if need <= 0:
+            continue
+        ranked = index.co_available(slot, busy[slot], allowed, key=lambda d: (load.get(d, 0), d))
+        for dosen in ranked[:need]:
+            Schedule[i]['supervisors'].add(dosen)
+            busy[slot] |= 1 << dosen
+            load[dosen] = load.get(dosen, 0) + 1
 
 
-def schedule_to_dataframe(schedule, timeslots, seminar_dates=None,M=7, R=3, H=9, slot_is_per_room=False):
-    slot_map = {
-        0: "08:00-09:00",
-        1: "09:00-10:00",
-        2: "10:00-11:00",
-        3: "11:00-12:00",
-        4: "13:00-14:00",
-        5: "14:00-15:00",
-        6: "15:00-16:00",
-        # kalau memang hanya 7 slot per hari, jangan pakai index 7:
-        # 7: "16:00-17:00",
-    }
-    mbkm_map = {"Magang": 0, "Stupen": 1, "Penelitian":2, "Mengajar": 3, "KKN": 4, "Wirausaha": 5}
+def schedule_to_dataframe(schedule, timeslots, stu_df, seminar_dates=None, M=7, R=3, H=9, slot_is_per_room=False):
+    import pandas as pd
+    rows = schedule_rows(schedule, timeslots, stu_df, seminar_dates, M, R, H, slot_is_per_room)
+    return pd.DataFrame(rows, columns=TABLE_COLUMNS)
+
+
+
+def schedule_rows(schedule, timeslots, stu_df, seminar_dates=None, M=7, R=3, H=9, slot_is_per_room=False):
+    names = pembimbing_by_pb(stu_df)
     rows = []
     for i, info in schedule.items():
         if not info.get('students'):
@@ -275,15 +568,11 @@ def schedule_to_dataframe(schedule, timeslots, seminar_dates=None,M=7, R=3, H=9,
         # Supervisors (gabungan semua dosen yang hadir)
         supervisors_list = []
         for d in info.get("supervisors", []):
-            row = stu_df.loc[stu_df["PB"] == d, "PEMBIMBING"]
-            if not row.empty:
-                val = row.iloc[0]
-                if pd.isna(val):
-                    supervisors_list.append(f"PB-{d}")
-                else:
-                    supervisors_list.append(str(val))
-            else:
+            val = names.get(d)
+            if is_missing(val):
                 supervisors_list.append(f"PB-{d}")
+            else:
+                supervisors_list.append(str(val))
         supervisors_str = ";".join(supervisors_list) if supervisors_list else "-"
 
         # Baris per mahasiswa
@@ -336,219 +625,16 @@ def schedule_to_dataframe(schedule, timeslots, seminar_dates=None,M=7, R=3, H=9,
         return int(match.group(1)) - 1 if match else 999
 
     rows.sort(key=get_day_idx)
+    return rows
 
-    return pd.DataFrame(rows, columns=["Hari", "Slot", "Ruangan", "NIM", "Nama", "Type", "Pembimbing", "Dosen yang Hadir"])
-
-
-
-
-
-
-# =========================================================================================
-
-
-# C = kapasitas maksimal mahasiswa per ruangan (form)
-# C = 5
-# D = minimal jumlah dosen per sesi
-# D = 3
-# H = jumlah hari seminar diinginkan (form)
-# H = 9
-# M = jumlah slot per hari 
-# M = 7
-# R = jumlah ruangan (form)
-# R = 3
-# start_date_str = args.start_date
-
-
-
-stu_df = pd.read_excel("uploads/stu.xlsx")
-
-# Remove duplicate students based on NIM to ensure unique students
-initial_count = len(stu_df)
-stu_df = stu_df.drop_duplicates(subset=['NIM'], keep='first')
-removed_duplicates = initial_count - len(stu_df)
-if removed_duplicates > 0:
-    print(f"[INFO] Removed {removed_duplicates} duplicate student(s) based on NIM", file=sys.stderr)
-    print(f"[INFO] Unique students: {len(stu_df)}", file=sys.stderr)
-
-# Limit students if specified
-if args.limit is not None:
-    stu_df = stu_df.head(args.limit)
-
-
-# NIM -> stuID (index 0...)
-stu_df = stu_df.reset_index(drop=True)
-stu_df["stuID"] = stu_df.index
-
-
-# membuat kolom kosong sesuai dengan PB, dan encoding
-# Pembimbing -> PB
-stu_df_copy = stu_df.copy()  
-currPB = None
-pb_list = []
-for i, pembimbing in stu_df_copy["PEMBIMBING"].items():
-    if pd.notna(pembimbing):     # kalau bukan unknown
-        currPB = pembimbing
-    else:                        # kalau unknown
-        stu_df_copy.at[i, "PEMBIMBING"] = currPB
-    pb_list.append(currPB)
-stu_df_copy["PB_raw"] = pb_list
-
-# mapping pembimbing → angka unik (encoding)
-pb_map = {pb: idx for idx, pb in enumerate(pd.Series(pb_list).dropna().unique())}
-stu_df_copy["PB"] = stu_df_copy["PB_raw"].map(pb_map).fillna(0).astype(int)
-stu_df["PB"] = stu_df_copy["PB"].values
-stu_df["PEMBIMBING"] = stu_df_copy["PEMBIMBING"].values 
-
-# print(stu_df["PB"].unique() )
-
-
-# MBKM -> Type (mapping 0-5)
-mbkm_map = {"Magang": 0, "Stupen": 1, "Penelitian":2, "Mengajar": 3, "KKN": 4, "Wirausaha": 5} 
-stu_df["Type"] = stu_df["MBKM"].map(mbkm_map).fillna(-1).astype(int)
-
-# print(stu_df["Type"].unique())
-# [0 1 2 3 4 5]
-
-# print(stu_df[["NAMA","PEMBIMBING","PB"]])
-#                     NAMA                                  PEMBIMBING  PB
-# 0          JASON PERMANA  Prof. Dr. Ir. Dyah Erny Herwindiati, M.Si.   0
-# 1    ARYA WIRA KRISTANTO  Prof. Dr. Ir. Dyah Erny Herwindiati, M.Si.   0
-# 2        NICHOLAS MARTIN  Prof. Dr. Ir. Dyah Erny Herwindiati, M.Si.   0
-# 3             FINNIA LI   Prof. Dr. Ir. Dyah Erny Herwindiati, M.Si.   0
-# 4      KEVIN JONATHAN JM  Prof. Dr. Ir. Dyah Erny Herwindiati, M.Si.   0
-# ..                   ...                                         ...  ..
-# 330      ARMANTA TARIGAN                 Tony, S.Kom., M.Kom., Ph.D.  21
-# 331  GERRANT ENRIQO HIYA                 Tony, S.Kom., M.Kom., Ph.D.  21
-# 332       AMARA THURIDHA                 Tony, S.Kom., M.Kom., Ph.D.  21
-# 333           AHMAD RORY                 Tony, S.Kom., M.Kom., Ph.D.  21
-# 334        ANDRI RIZKIKA                 Tony, S.Kom., M.Kom., Ph.D.  21
-
-# print(stu_df["PEMBIMBING"].unique().shape[0])
-# ['Prof. Dr. Ir. Dyah Erny Herwindiati, M.Si.'
-#  'Ir. Jap Tji Beng, MMSI, M.Psi., Ph.D., PE, M.ASCE'
-#  'Lely Hiryanto, ST, M.Sc., Ph.D' 'Darius Andana Haris, S.Kom., MTI'
-#  'Ir. Jeanny Pragantha, M.Eng.' 'Janson Hendryli, S.Kom., M.Kom.'
-#  'Dr. Ing. Agus Budi Dharmawan, S.Kom., MT, M.Sc.'
-#  'Novario Jaya Perdana, S.Kom., MT' 'Desi Arisandi, S.Kom., MTI'
-#  'Tri Sutrisno, S.Si., M.Sc.' 'Dr. Wasino, S.Kom., M.Kom.'
-#  'Dra. Ery Dewayani, MMSI' 'Dr. Dedi Trisnawarman, S.Si., M.Kom.'
-#  'Bagus Mulyawan, S.Kom., MM' 'Manatap Dolok Lauro, S.Kom., MMSI'
-#  'Dra. Chairisni Lubis, M.Kom.' 'Prof. Lina, ST, M.Kom., Ph.D.'
-#  'Viny Christanti Mawardi, S.Kom., M.Kom.'
-#  'Teny Handhayani, S.Kom., M.Kom., Ph.D.' 'Irvan Lewenusa, S.Kom., M.Kom.'
-#  'Herman Tusiadi, S.Kom., MM' 'Tony, S.Kom., M.Kom., Ph.D.']
-
-# pref = [
-#     [ #dosen 0 .
-#         [1,1,1,0,0,0], # hari 1
-#         [0,1,1,0,0,0],  # hari 2
-#         [0,0,0,1,1,1]
-#     ],
-#     [ #dosen 1 .
-#         [0,1,1,0,1,0], # hari 1
-#         [1,0,0,1,0,1],  # hari 2
-#         [1,1,0,0,0,1]
-#     ]]
-
-# df_pref = pd.read_csv("uploads/timePref.csv")
-
-
-# print(stu_df[['NAMA', 'PEMBIMBING', 'PB']].head())
-# print(dos_df.head())
-
-
-#=========================================================================timepref
-
-pref_df = pd.read_csv("uploads/pref.csv", header=None)
-
-# Membuat mapping dari PEMBIMBING ke PB dari stu_df
-pembimbing_to_pb = stu_df.set_index('PEMBIMBING')['PB'].to_dict()
-
-# Menambahkan kolom PB ke pref_df berdasarkan kolom PEMBIMBING (kolom 0)
-pref_df['PB'] = pref_df[0].map(pembimbing_to_pb)
-
-# Urutkan pref_df berdasarkan kolom PB
-pref_df = pref_df.sort_values('PB').reset_index(drop=True)
-
-# Drop kolom PB dan kolom 0 (PEMBIMBING)
-if pref_df.iloc[:, 0].dtype == object:
-    pref_df = pref_df.drop(columns=[0])
-pref_df = pref_df.drop(columns=['PB'])
-
-# Konversi pref_df ke format list of lists untuk digunakan dalam algoritma
-pref = pref_df.values.tolist()
-
-# print("pref shape:", len(pref), "supervisors x", len(pref[0]) if pref else 0, "slots")
-
-
-# =========================================================================timepref
-# Generate timeslots
-timeslots = []
-
-# Generate timeslots
-timeslots = []
-for slot in range(H * M):  # 0 to 62 (H*M-1)
-    for r in range(R):     # 0,1,2
-        timeslots.append({
-            'slot': slot,  # slot in day range 0-62
-            'ruang': r
-        })
-
-# print("Total timeslots:", len(timeslots))
-# print("Sample timeslots:", timeslots)
-
-# Inisialisasi jadwal kosong
-Schedule = {
-    i: {
-        "students": [],         # daftar mahasiswa yang masuk ke timeslot i
-        "supervisors": set(),    # pakai set agar tidak ada duplikasi dosen
-    }
-    for i in range(len(timeslots))
-}
-
-
-    
-    
-
-nstu = stu_df.groupby("PB")["stuID"].count().sort_values().to_dict()
-# print("nstu: ",nstu)
-# nstu:  {5: 2, 6: 3, 2: 5, 3: 5, 4: 5, 0: 6, 1: 9}
-
-
-result = sort_with_type(compute_npref(pref), nstu)
-sorted_students_df = pd.DataFrame(result)
-# schedule = greedy_schedule(sorted_students_df, timeslots, sessions, pref, C, Schedule)
-# print("Final Schedule:", schedule)
-# Final Schedule: {0: {'students': [{'stuID': 1, 'Type': 0, 'PB': 0}, ....
-
-# Get unique PB in order of appearance
-unique_pb_ordered = sorted_students_df["PB"].drop_duplicates().tolist()
-sorted_lecturers = [stu_df[stu_df["PB"] == pb]["PEMBIMBING"].iloc[0] for pb in unique_pb_ordered]
-
-start_time = time.time()
-
-result, unassigned = greedy_schedule(
-    sorted_students_df, timeslots, pref, C, Schedule
-)
-additional_supervisors()
-
-end_time = time.time()
-execution_time = end_time - start_time
-
-# Count unique assigned students by NIM to avoid counting duplicates
-assigned_nims = set()
-for slot_info in result.values():
-    for student in slot_info.get("students", []):
-        nim = safe_get(student, ["NIM"])
-        if nim:
-            assigned_nims.add(nim)
-
-assigned_count = len(assigned_nims)
-unassigned_count = len(unassigned)
 
 # Function to create dataframe for unassigned students
 def unassigned_to_dataframe(unassigned_students):
+    import pandas as pd
+    return pd.DataFrame(unassigned_rows(unassigned_students), columns=UNASSIGNED_COLUMNS)
+
+
+def unassigned_rows(unassigned_students):
     rows = []
     for s in unassigned_students:
         nim = safe_get(s, ["NIM"])
@@ -557,10 +643,10 @@ def unassigned_to_dataframe(unassigned_students):
         Pemb = safe_get(s, ["PEMBIMBING"])
         alasan = s.get("alasan_unassigned", "-")
         time_pref = s.get("time_preference", [])
-        
+
         # Convert time preference list to readable string
         time_pref_str = ",".join(map(str, time_pref)) if time_pref else "-"
-        
+
         rows.append({
             "NIM": nim,
             "Nama": nama,
@@ -569,80 +655,50 @@ def unassigned_to_dataframe(unassigned_students):
             "Alasan Unassigned": alasan,
             "Time Preference": time_pref_str,
         })
-    
-    df = pd.DataFrame(
-        rows,
-        columns=["NIM", "Nama", "Type", "Pembimbing", "Alasan Unassigned", "Time Preference"]
-    )
-    return df
+    return rows
 
 # Generate dates for seminar scheduling
-def generate_dates(start_date_str=None, num_days=H):
+def generate_dates(start_date_str=None, num_days=9):
     if start_date_str:
         start_date = datetime.strptime(start_date_str, "%Y-%m-%d")
     else:
         today = datetime.now()
-        days_ahead = 7 - today.weekday()  
+        days_ahead = 7 - today.weekday()
         start_date = today + timedelta(days=days_ahead)
-    
+
     dates = []
     current_date = start_date
-    
+
     # Skip weekends when generating dates
     while len(dates) < num_days:
-        if current_date.weekday() < 5: 
+        if current_date.weekday() < 5:
             dates.append({
                 "date": current_date.strftime("%Y-%m-%d"),
                 "day_name": current_date.strftime("%A"),
                 "formatted_date": current_date.strftime("%d %B %Y")
             })
         current_date += timedelta(days=1)
-    
-    return dates
-
-# Generate seminar dates (weekdays only) using H (desired number of days)
-seminar_dates = generate_dates(start_date_str=start_date_str, num_days=H)
-# print("\nJadwal Seminar:")
-# for i, date_info in enumerate(seminar_dates, 1):
-#     print(f"Hari ke-{i}: {date_info['day_name']}, {date_info['formatted_date']}")
-
-# Generate both dataframes
-generated_schedule_df = schedule_to_dataframe(Schedule, timeslots, seminar_dates)
-unassigned_df = unassigned_to_dataframe(unassigned)
 
-# Create Excel writer object to write multiple sheets
-output_path = "greedy_finalForm(2D).xlsx"
-with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-    # Write assigned students to first sheet
-    generated_schedule_df.to_excel(writer, sheet_name='Jadwal', index=False)
-    # Write unassigned students to second sheet
-    unassigned_df.to_excel(writer, sheet_name='Tidak Terjadwal', index=False)
-    # Write sorted students to third sheet
-    sorted_students_df.to_excel(writer, sheet_name='Mahasiswa Terurut', index=False)
-
-# print(f"Total mahasiswa tidak terjadwal: {len(unassigned)}")
-# print(f"File tersimpan di: {output_path}")
-
-objectives = compute_greedy_objectives(Schedule, timeslots, H, M)
-total_obj = objectives["obj2_same_type_pairs"]+objectives["obj3_min_used_timeslots"]
+    return dates
 
 # Calculate statistics for output
 def calculate_statistics(schedule_df, unassigned_list, timeslots_list, M):
     """Calculate comprehensive statistics for scheduling result"""
-    
+    table_rows = records(schedule_df)
+
     # Calculate unique slots and days used
     unique_slots = set()
     unique_days = set()
-    for _, row in schedule_df.iterrows():
+    for row in table_rows:
         if row['Hari'] != "-" and row['Slot'] != "-":
             unique_slots.add(f"{row['Hari']}-{row['Slot']}-{row['Ruangan']}")
             unique_days.add(row['Hari'])
-    
+
     # Calculate lecturer statistics
     lecturer_stats = {}
-    
+
     # Count assigned students per lecturer
-    for _, row in schedule_df.iterrows():
+    for row in table_rows:
         lecturer = row['Pembimbing']
         if lecturer and lecturer != "-":
             if lecturer not in lecturer_stats:
@@ -653,7 +709,7 @@ def calculate_statistics(schedule_df, unassigned_list, timeslots_list, M):
                     'unassignedStudents': []
                 }
             lecturer_stats[lecturer]['assignedCount'] += 1
-    
+
     # Count unassigned students per lecturer
     for s in unassigned_list:
         lecturer = safe_get(s, ["PEMBIMBING"])
@@ -668,24 +724,24 @@ def calculate_statistics(schedule_df, unassigned_list, timeslots_list, M):
             lecturer_stats[lecturer]['unassignedCount'] += 1
             student_name = safe_get(s, ["NAMA", "Nama", "name"])
             lecturer_stats[lecturer]['unassignedStudents'].append(student_name)
-    
+
     # Separate lecturers into complete and incomplete
     complete_lecturers = []
     incomplete_lecturers = []
-    
+
     for lecturer_name, stats in lecturer_stats.items():
         if stats['unassignedCount'] == 0 and stats['assignedCount'] > 0:
             complete_lecturers.append(stats)
         elif stats['unassignedCount'] > 0:
             incomplete_lecturers.append(stats)
-    
+
     # Count unique assigned students (exclude placeholder rows with NIM="-")
     unique_assigned_nims = set()
-    for _, row in schedule_df.iterrows():
+    for row in table_rows:
         nim = row.get('NIM')
-        if nim and nim != "-" and not pd.isna(nim):
+        if nim and nim != "-" and not is_missing(nim):
             unique_assigned_nims.add(nim)
-    
+
     return {
         'slotsUsed': len(unique_slots),
         'daysUsed': len(unique_days),
@@ -697,48 +753,34 @@ def calculate_statistics(schedule_df, unassigned_list, timeslots_list, M):
         'incompleteLecturers': incomplete_lecturers
     }
 
-# Calculate statistics
-statistics = calculate_statistics(generated_schedule_df, unassigned, timeslots, M)
-
-rows = []
-for i, timeslot in enumerate(timeslots):
-    slot = timeslot['slot']  # 0-62
-    room = timeslot['ruang']
-    day_idx = slot // M  # Calculate day from slot (0-62)
-    
-    slot_info = result.get(i, {}) if isinstance(result, dict) else {}
-    studs = slot_info.get("students", [])
-    sups = slot_info.get("supervisors", [])
-
-    # ambil ID dari objek mahasiswa (atau nilai langsung jika sudah angka)
-    stud_ids = []
-    for s in studs:
-        if isinstance(s, dict):
-            stud_ids.append(s.get("stuID", s))
-        else:
-            stud_ids.append(s)
-
-    rows.append({
-        "timeslot": f"Hari ke-{day_idx + 1}, Slot {slot % M + 1}, Room {room + 1}",
-        "students": ", ".join(map(str, stud_ids)) if stud_ids else "-",
-        "supervisors": ", ".join(map(str, sups)) if sups else "-",
-    })
-
-output = {
-    "time": execution_time,
-    "assigned": assigned_count,
-    "unassigned": unassigned_count,
-    "objective": total_obj,
-    "objectives": objectives,  # Add detailed objectives including used_slots_count
-    "statistics": statistics,
-    "sorted_lecturers": sorted_lecturers,
-    "table": generated_schedule_df.to_dict(orient="records"),
-    "unassigned_table": unassigned_df.to_dict(orient="records"),
-    "raw_schedule": rows
-}
-# print("==================================output=================")
 
-# print(output)
+def raw_schedule_rows(result, timeslots, M=7):
+    rows = []
+    for i, timeslot in enumerate(timeslots):
+        slot = timeslot['slot']  # 0-62
+        room = timeslot['ruang']
+        day_idx = slot // M  # Calculate day from slot (0-62)
+
+        slot_info = result.get(i, {}) if isinstance(result, dict) else {}
+        studs = slot_info.get("students", [])
+        sups = slot_info.get("supervisors", [])
+
+        # ambil ID dari objek mahasiswa (atau nilai langsung jika sudah angka)
+        stud_ids = []
+        for s in studs:
+            if isinstance(s, dict):
+                stud_ids.append(s.get("stuID", s))
+            else:
+                stud_ids.append(s)
+
+        rows.append({
+            "timeslot": f"Hari ke-{day_idx + 1}, Slot {slot % M + 1}, Room {room + 1}",
+            "students": ", ".join(map(str, stud_ids)) if stud_ids else "-",
+            "supervisors": ", ".join(map(str, sups)) if sups else "-",
+        })
+    return rows
+
+
 class NaNSafeEncoder(json.JSONEncoder):
     def default(self, o):
         # set → list
@@ -748,20 +790,287 @@ class NaNSafeEncoder(json.JSONEncoder):
         if isinstance(o, float) and (math.isnan(o) or math.isinf(o)):
             return None
         # pandas NaN
-        if pd.isna(o):
+        if is_missing(o):
             return None
-        # numpy
-        try:
-            import numpy as np
-            if isinstance(o, (np.integer,)):
+        # numpy (hanya bila sudah ter-load)
+        np = sys.modules.get("numpy")
+        if np is not None:
+            if isinstance(o, np.integer):
                 return int(o)
-            if isinstance(o, (np.floating,)):
+            if isinstance(o, np.floating):
                 return float(o) if not np.isnan(o) else None
-        except Exception:
-            pass
         # fallback
         return super().default(o)
 
 
+# =========================================================================================
+
+
+# C = kapasitas maksimal mahasiswa per ruangan (form)
+# C = 5
+# D = minimal jumlah dosen per sesi
+# D = 3
+# H = jumlah hari seminar diinginkan (form)
+# H = 9
+# M = jumlah slot per hari
+# M = 7
+# R = jumlah ruangan (form)
+# R = 3
+# start_date_str = args.start_date
+
+def load_config(path="config.json", config=None):
+    # config inline (dict) dipakai apa adanya, selain itu baca file
+    if config is None:
+        with open(path, 'r') as f:
+            config = json.load(f)
+    return {
+        "C": config.get('C', 5),
+        "D": config.get('D', 3),
+        "H": config.get('H', 9),
+        "M": config.get('M', 7),
+        "R": config.get('R', 3),
+        "start_date": config.get('start_date'),
+        "placement": config.get('placement', 'firstfit'),
+        "bound": config.get('bound', False),
+        "lns": config.get('lns'),
+        "colgen": config.get('colgen'),
+        "kernel": config.get('kernel', 'python'),
+        "portfolio": config.get('portfolio'),
+    }
+
+
+# =========================================================================timepref
+def generate_timeslots(H, M, R):
+    timeslots = []
+    for slot in range(H * M):  # 0 to 62 (H*M-1)
+        for r in range(R):     # 0,1,2
+            timeslots.append({
+                'slot': slot,  # slot in day range 0-62
+                'ruang': r
+            })
+    return timeslots
+
 
-print(json.dumps(output, cls=NaNSafeEncoder))
+def empty_schedule(timeslots):
+    # Inisialisasi jadwal kosong
+    return {
+        i: {
+            "students": [],         # daftar mahasiswa yang masuk ke timeslot i
+            "supervisors": set(),    # pakai set agar tidak ada duplikasi dosen
+        }
+        for i in range(len(timeslots))
+    }
+
+
+def run_greedy(stu_df, pref, C=5, D=3, H=9, M=7, R=3, placement="firstfit", kernel="python", npref=None):
+    """
+    Jalankan greedy + pelengkap dosen. Mengembalikan state jadwal (dict).
+    placement: "firstfit" (scan timeslot dari awal), "bestfit" (skor sesi kandidat),
+    atau "dynamic" (urutan most-constrained-first, lihat dynamic_schedule).
+    kernel: "python" atau "numba" (first-fit terkompilasi, lihat greedy_kernel.py).
+    npref: kunci urutan dosen (default compute_npref(pref)); portfolio.py memakai versi acak.
+    """
+    import pandas as pd
+    from diagnostics import explain_unassigned
+
+    timeslots = generate_timeslots(H, M, R)
+    Schedule = empty_schedule(timeslots)
+
+    if npref is None:
+        npref = compute_npref(pref)
+    sorted_students_df = pd.DataFrame(sort_with_type(stu_df, npref))
+
+    place = placement_function(placement, kernel)
+    start_time = time.time()
+    Schedule, unassigned = place(sorted_students_df, timeslots, pref, C, Schedule, M, R, D)
+    diagnostics = explain_unassigned(unassigned, timeslots, pref, C, Schedule, M)
+    additional_supervisors(Schedule, timeslots, stu_df, pref, D, M, R)
+    execution_time = time.time() - start_time
+
+    return {
+        "Schedule": Schedule,
+        "timeslots": timeslots,
+        "unassigned": unassigned,
+        "sorted_students_df": sorted_students_df,
+        "execution_time": execution_time,
+        "diagnostics": diagnostics,
+    }
+
+
+def build_output(state, stu_df, H=9, M=7, R=3, start_date_str=None):
+    Schedule = state["Schedule"]
+    timeslots = state["timeslots"]
+    unassigned = state["unassigned"]
+    sorted_students_df = state["sorted_students_df"]
+
+    # Get unique PB in order of appearance
+    names = pembimbing_by_pb(stu_df)
+    unique_pb_ordered = dict.fromkeys(s["PB"] for s in records(sorted_students_df))
+    sorted_lecturers = [names[pb] for pb in unique_pb_ordered]
+
+    # Count unique assigned students by NIM to avoid counting duplicates
+    assigned_nims = set()
+    for slot_info in Schedule.values():
+        for student in slot_info.get("students", []):
+            nim = safe_get(student, ["NIM"])
+            if nim:
+                assigned_nims.add(nim)
+
+    # Generate seminar dates (weekdays only) using H (desired number of days)
+    seminar_dates = generate_dates(start_date_str=start_date_str, num_days=H)
+
+    # Generate both tables (list of dict, tanpa DataFrame)
+    table = schedule_rows(Schedule, timeslots, stu_df, seminar_dates, M, R, H)
+    unassigned_table = unassigned_rows(unassigned)
+
+    objectives = compute_greedy_objectives(Schedule, timeslots, H, M)
+    total_obj = objectives["obj2_same_type_pairs"] + objectives["obj3_min_used_timeslots"]
+
+    return {
+        "time": state["execution_time"],
+        "assigned": len(assigned_nims),
+        "unassigned": len(unassigned),
+        "objective": total_obj,
+        "objectives": objectives,  # Add detailed objectives including used_slots_count
+        "statistics": calculate_statistics(table, unassigned, timeslots, M),
+        "sorted_lecturers": sorted_lecturers,
+        "table": table,
+        "unassigned_table": unassigned_table,
+        "unassigned_diagnostics": state.get("diagnostics", []),
+        "raw_schedule": raw_schedule_rows(Schedule, timeslots, M)
+    }
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument('limit', nargs='?', type=int, default=None, help='Limit number of students to process')
+    parser.add_argument('--export', choices=['xlsx', 'csv', 'parquet'], default=None,
+                        help='Tulis file hasil (default: tidak ada ekspor, hanya JSON)')
+    parser.add_argument('--output', default='greedy_finalForm(2D).xlsx', help='Path file ekspor')
+    parser.add_argument('--save-result', default=None,
+                        help='Simpan hasil lengkap (JSON) untuk diekspor kemudian dengan export.py')
+    parser.add_argument('--placement', choices=['firstfit', 'bestfit', 'dynamic'], default=None,
+                        help='Strategi penempatan (default: config "placement" atau firstfit)')
+    parser.add_argument('--kernel', choices=['python', 'numba'], default=None,
+                        help='Implementasi first-fit (default: config "kernel" atau python; numba opsional)')
+    parser.add_argument('--no-cache', action='store_true', help='Selalu jalankan ulang, abaikan cache hasil')
+    parser.add_argument('--lns', type=float, default=None, metavar='SECONDS',
+                        help='Perbaiki hasil greedy dengan large neighbourhood search (Gurobi) selama SECONDS detik')
+    parser.add_argument('--colgen', type=float, default=None, metavar='SECONDS',
+                        help='Heuristik pola sesi (price-and-branch: column generation + master integer, scipy) '
+                             'selama SECONDS detik')
+    parser.add_argument('--portfolio', type=float, default=None, metavar='SECONDS',
+                        help='Jalankan semua engine paralel (portfolio.py), ambil hasil terbaik dalam SECONDS detik')
+    parser.add_argument('--bound', action='store_true',
+                        help='Hitung batas atas objective (relaksasi LP) dan gap hasil greedy')
+    parser.add_argument('--validate', action='store_true',
+                        help='Cek ulang semua constraint hasil (validate.py), laporan di kolom "validation"')
+    parser.add_argument('--repair', default=None,
+                        help='JSON hasil sebelumnya; hanya mahasiswa yang terdampak perubahan yang dijadwalkan ulang')
+    add_job_arguments(parser)
+    args = parser.parse_args()
+    job = resolve_job(args)
+
+    from bounds import objective_bound, relative_gap
+    from cache import ResultCache, fingerprint
+    from precheck import feasibility_report, format_report
+    from preprocess import lecturer_names, load_pref, load_students
+
+    # Read config
+    config = load_config(job["config_path"], job["config"])
+    C, D, H, M, R = config["C"], config["D"], config["H"], config["M"], config["R"]
+    start_date_str = config["start_date"]
+
+    # Debug: print start_date to stderr so it doesn't interfere with JSON output
+    print(f"DEBUG: start_date_str from config = {start_date_str}", file=sys.stderr)
+
+    stu_df = load_students(job["students"], args.limit)
+    pref = load_pref(stu_df, job["pref"])
+
+    # Cek kelayakan cepat: peringatan ke stderr, laporan lengkap ikut di JSON
+    precheck = feasibility_report(stu_df["PB"], pref, C, D, H, M, R, lecturer_names(stu_df))
+    if precheck["errors"] or precheck["warnings"]:
+        print(format_report(precheck), file=sys.stderr)
+
+    placement = args.placement or config["placement"]
+    kernel = args.kernel or config["kernel"]
+    with_bound = args.bound or bool(config["bound"])
+    lns_seconds = args.lns if args.lns is not None else config["lns"]
+    colgen_seconds = args.colgen if args.colgen is not None else config["colgen"]
+    portfolio_seconds = args.portfolio if args.portfolio is not None else config["portfolio"]
+
+    # Cache hanya untuk run biasa; repair bergantung pada file jadwal lama,
+    # ekspor butuh state lengkap, LNS / column generation / portfolio bergantung pada batas waktu.
+    # --bound dan --validate ikut fingerprint karena menambah kolom output; tanggal seminar
+    # ikut dalam bentuk yang sudah di-resolve, karena tanpa start_date tanggal dihitung dari hari ini.
+    cache = None
+    if not (args.no_cache or args.repair or args.export or args.save_result or lns_seconds or colgen_seconds
+            or portfolio_seconds):
+        cache = ResultCache()
+        seminar_dates = [d["date"] for d in generate_dates(start_date_str, H)]
+        cache_key, cache_family = fingerprint(
+            "greedy", stu_df.to_dict(orient="records"), pref,
+            dict(config, placement=placement, bound=with_bound, validate=args.validate, seminar_dates=seminar_dates),
+            args.limit)
+        entry = cache.get(cache_key)
+        if entry is not None:
+            print("[INFO] Cache hit: hasil sebelumnya dipakai", file=sys.stderr)
+            print(json.dumps(dict(entry["result"], cached=True), cls=NaNSafeEncoder))
+            return
+
+    if args.repair:
+        from repair import repair_schedule
+        with open(args.repair, 'r') as f:
+            previous = json.load(f)
+        state = repair_schedule(previous, stu_df, pref, C, D, H, M, R)
+    elif portfolio_seconds:
+        from portfolio import run_portfolio
+        state = run_portfolio(stu_df, pref, C, D, H, M, R, placement, deadline=portfolio_seconds, stream=sys.stderr)
+    elif lns_seconds:
+        from lns import run_lns
+        state = run_lns(stu_df, pref, C, D, H, M, R, placement, time_limit=lns_seconds, stream=sys.stderr)
+    elif colgen_seconds:
+        from colgen import run_colgen
+        state = run_colgen(stu_df, pref, C, D, H, M, R, placement, time_limit=colgen_seconds, stream=sys.stderr)
+    else:
+        state = run_greedy(stu_df, pref, C, D, H, M, R, placement, kernel)
+    output = build_output(state, stu_df, H, M, R, start_date_str)
+    output["precheck"] = precheck
+    if "repair" in state:
+        output["repair"] = state["repair"]
+    if "lns" in state:
+        output["lns"] = state["lns"]
+    if "colgen" in state:
+        output["colgen"] = state["colgen"]
+    if "portfolio" in state:
+        output["portfolio"] = state["portfolio"]
+    if args.validate:
+        from validate import validate_state
+        output["validation"] = validate_state(state, records(stu_df), pref, C, D, H, M, R)
+    if with_bound:
+        bound = objective_bound(stu_df["PB"], stu_df["Type"], pref, C, H, M, R, output["assigned"])
+        output["bound"] = bound["bound"]
+        output["gap"] = relative_gap(output["objective"], bound["bound"])
+        output["bound_detail"] = bound
+
+    print(json.dumps(output, cls=NaNSafeEncoder))
+    sys.stdout.flush()
+
+    if cache is not None:
+        cache.put(cache_key, json.loads(json.dumps(output, cls=NaNSafeEncoder)), cache_family)
+
+    # Ekspor file bersifat opsional dan dilakukan setelah JSON terkirim
+    if args.save_result or args.export:
+        saved = dict(output)
+        saved["sorted_students"] = state["sorted_students_df"].to_dict(orient="records")
+        if args.save_result:
+            with open(output_path(job, args.save_result), 'w') as f:
+                json.dump(saved, f, cls=NaNSafeEncoder)
+        if args.export:
+            from export import export_result
+            export_result(saved, output_path(job, args.output), args.export)
+
+
+if __name__ == "__main__":
+    main()
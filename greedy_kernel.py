@@ -0,0 +1,120 @@
+"""
+Kernel greedy first-fit atas array integer, dikompilasi dengan Numba bila ada.
+
+Loop yang sama dengan greedy.greedy_schedule (urutan mahasiswa, urutan
+timeslot kandidat, cek kapasitas -> ketersediaan -> konflik ruang paralel),
+tapi state-nya array: jumlah mahasiswa per timeslot, kehadiran dosen per
+timeslot, dan jumlah ruangan yang dihadiri dosen per slot global. Hasil
+penempatan identik dengan jalur Python; Schedule diisi ulang dari hasil
+kernel dengan urutan yang sama.
+
+Tanpa Numba fungsi kernel tetap jalan sebagai Python biasa (lambat, untuk
+verifikasi); greedy.placement_function memakai jalur Python dalam kasus itu.
+"""
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+HAVE_NUMBA = njit is not None
+
+
+def _greedy_kernel(pb, nim_id, avail, C, slot_of, count, present, occ, order_ptr, order_idx, use_order):
+    """
+    Return array timeslot tiap mahasiswa: -1 tidak terjadwal, -2 dilewati
+    (NIM yang sama sudah terjadwal). count / present / occ diubah di tempat.
+    """
+    n = pb.shape[0]
+    m = slot_of.shape[0]
+    result = np.full(n, -1, dtype=np.int64)
+    nim_done = np.zeros(nim_id.max() + 2 if n > 0 else 1, dtype=np.uint8)
+    for k in range(n):
+        if nim_id[k] >= 0 and nim_done[nim_id[k]]:
+            result[k] = -2
+            continue
+        a = pb[k]
+        if use_order:
+            lo = order_ptr[a]
+            hi = order_ptr[a + 1]
+        else:
+            lo = 0
+            hi = m
+        for q in range(lo, hi):
+            i = order_idx[q] if use_order else q
+            if count[i] >= C:
+                continue
+            t = slot_of[i]
+            if a < 0 or a >= avail.shape[0] or avail[a, t] == 0:
+                continue
+            if occ[t, a] - present[i, a] > 0:
+                continue
+            count[i] += 1
+            if present[i, a] == 0:
+                present[i, a] = 1
+                occ[t, a] += 1
+            result[k] = i
+            if nim_id[k] >= 0:
+                nim_done[nim_id[k]] = 1
+            break
+    return result
+
+
+_kernel = njit(cache=True)(_greedy_kernel) if HAVE_NUMBA else _greedy_kernel
+
+
+def kernel_greedy_schedule(sorted_students_df, timeslots, time_pref, C, Schedule, M=7, R=3, D=None):
+    """Pengganti greedy.greedy_schedule (signature & hasil sama)."""
+    from greedy import availability_index, records, safe_get, unassigned_record
+    from precheck import availability
+
+    students = records(sorted_students_df)
+    m = len(timeslots)
+    H = m // (M * R)
+    slot_of = np.fromiter((ts['slot'] for ts in timeslots), dtype=np.int64, count=m)
+    n_slots = int(slot_of.max()) + 1 if m else 0
+
+    pb = np.fromiter((s['PB'] for s in students), dtype=np.int64, count=len(students))
+    # NIM kosong ("" ) tidak dilacak, sama seperti greedy_schedule
+    nim_codes = {}
+    nim_id = np.fromiter((nim_codes.setdefault(nim, len(nim_codes)) if nim else -1
+                          for nim in (safe_get(s, ["NIM"]) for s in students)),
+                         dtype=np.int64, count=len(students))
+
+    existing = [a for info in Schedule.values() for a in info['supervisors']]
+    L = max([len(time_pref), int(pb.max()) + 1 if len(pb) else 0] + [int(a) + 1 for a in existing])
+    avail = np.zeros((L, n_slots), dtype=np.uint8)
+    pref_avail = availability(time_pref, H, M) if len(time_pref) else np.zeros((0, n_slots), dtype=bool)
+    avail[:pref_avail.shape[0], :pref_avail.shape[1]] = pref_avail[:, :n_slots]
+
+    # state awal dari Schedule (mis. penempatan lama pada repair)
+    count = np.zeros(m, dtype=np.int64)
+    present = np.zeros((m, L), dtype=np.uint8)
+    occ = np.zeros((n_slots, L), dtype=np.int64)
+    for i, info in Schedule.items():
+        count[i] = len(info['students'])
+        for a in info['supervisors']:
+            present[i, a] = 1
+            occ[slot_of[i], a] += 1
+
+    if D is not None:
+        index = availability_index(time_pref, timeslots, M, R)
+        orders = [index.timeslot_order(a, D, R) for a in range(L)]
+        order_ptr = np.zeros(L + 1, dtype=np.int64)
+        order_ptr[1:] = np.cumsum([len(o) for o in orders])
+        order_idx = np.fromiter((i for o in orders for i in o), dtype=np.int64, count=int(order_ptr[-1]))
+    else:
+        order_ptr = np.zeros(1, dtype=np.int64)
+        order_idx = np.zeros(0, dtype=np.int64)
+
+    result = _kernel(pb, nim_id, avail, C, slot_of, count, present, occ, order_ptr, order_idx, D is not None)
+
+    unassigned_students = []
+    for s, i in zip(students, result.tolist()):
+        if i >= 0:
+            Schedule[i]['students'].append(s)
+            Schedule[i]['supervisors'].add(s['PB'])
+        elif i == -1:
+            unassigned_students.append(unassigned_record(s, time_pref))
+    return Schedule, unassigned_students
@@ -4,77 +4,21 @@ import numpy as np
 import pandas as pd
 import argparse
 import json
+import os
+import signal
+import sys
 import time
 
-# Parse command line arguments
-parser = argparse.ArgumentParser()
-parser.add_argument('limit', nargs='?', type=int, default=None, help='Limit number of students to process')
-args = parser.parse_args()
+from cache import ResultCache, fingerprint
+from jobs import add_job_arguments, output_path, read_config, resolve_job
+from precheck import feasibility_report, format_report
+from preprocess import lecturer_names, load_pref, load_students
 
-try:
-    # ============== LOAD DATA FROM FILES (same as greedy) ==============
-    stu_df = pd.read_excel("uploads/stu.xlsx")
-    
-    # Limit students if specified
-    if args.limit is not None:
-        stu_df = stu_df.head(args.limit)
-    
-    # NIM -> stuID (index 0...)
-    stu_df = stu_df.reset_index(drop=True)
-    stu_df["stuID"] = stu_df.index
-    
-    # Pembimbing -> PB encoding
-    stu_df_copy = stu_df.copy()  
-    currPB = None
-    pb_list = []
-    for i, pembimbing in stu_df_copy["PEMBIMBING"].items():
-        if pd.notna(pembimbing):
-            currPB = pembimbing
-        else:
-            stu_df_copy.at[i, "PEMBIMBING"] = currPB
-        pb_list.append(currPB)
-    stu_df_copy["PB_raw"] = pb_list
-    pb_map = {pb: idx for idx, pb in enumerate(pd.Series(pb_list).dropna().unique())}
-    stu_df_copy["PB"] = stu_df_copy["PB_raw"].map(pb_map).fillna(0).astype(int)
-    stu_df["PB"] = stu_df_copy["PB"].values
-    stu_df["PEMBIMBING"] = stu_df_copy["PEMBIMBING"].values 
-    
-    # MBKM -> Type (mapping 0-5)
-    mbkm_map = {"Magang": 0, "Stupen": 1, "Penelitian": 2, "Mengajar": 3, "KKN": 4, "Wirausaha": 5} 
-    stu_df["Type"] = stu_df["MBKM"].map(mbkm_map).fillna(-1).astype(int)
-    
-    # Load time preferences
-    pref_df = pd.read_csv("test-data/pref_22.csv", header=None)
-    pembimbing_to_pb = stu_df.set_index('PEMBIMBING')['PB'].to_dict()
-    pref_df['PB'] = pref_df[0].map(pembimbing_to_pb)
-    pref_df = pref_df.sort_values('PB').reset_index(drop=True)
-    pref_df = pref_df.drop(columns=[0, 'PB'])
-    time_pref = pref_df.values.tolist()
-    # print(time_pref)
-    print("Data loaded successfully")
-    print(f"Students: {len(stu_df)}")
-    print(f"Supervisors: {len(time_pref)}")
-    print(f"Time pref slots: {len(time_pref[0]) if time_pref else 0}")
-    
-    # ============== PARAMETERS (same as greedy) ==============
-    C = 5  # max students per timeslot
-    D = 3  # minimum supervisors per day
-    H = 9  # number of days
-    M = 7  # slots per day
-    R = 3  # number of rooms
-    limit_stu = 25
-    
-    # Objective weights
-    ALPHA = 0.0  # time preference weight
-    BETA = 1   # same type grouping weight
-    GAMMA = 1  # minimize used timeslots weight
-    
-    # ============== DATA STRUCTURES ==============
-    # Convert students dataframe to list of dicts
-    students = stu_df.to_dict(orient="records")
-    students = students[:limit_stu]
-    
-    # Generate timeslots (same as greedy)
+# model penuh hanya sanggup untuk instance kecil
+LIMIT_STU = 25
+
+
+def generate_timeslots(H, M, R):
     timeslots = []
     for slot in range(H * M):  # 0 to 62
         for r in range(R):     # 0, 1, 2
@@ -82,33 +26,50 @@ try:
                 'slot': slot,    # global slot (0-62)
                 'ruang': r
             })
-    
+    return timeslots
+
+
+def build_model(students, time_pref, timeslots, C, D, H, M, ALPHA, BETA, GAMMA, lazy=False, pairs=None, env=None):
+    """
+    lazy=True: constraint 2 (parallel_sup) dan 3 (sup_capacity / sup_presence)
+    tidak ditambahkan di depan; LazyCuts menambahkannya lewat callback hanya
+    bila solusi kandidat melanggarnya. Optimize model ini wajib dengan callback LazyCuts.
+
+    pairs (opsional, dipakai lns.py untuk sub-masalah): pairs[j] = index timeslot
+    yang boleh untuk mahasiswa j. x di luar pairs tidak dibuat (tetap 0); y[i][a]
+    hanya dibuat bila ada mahasiswa dosen a yang boleh di sesi i, atau dosen a
+    tidak punya mahasiswa dan tersedia (bebas, seperti di model penuh).
+    Constraint yang semua variabelnya tidak dibuat dilewati. Tanpa pairs: model penuh.
+    """
     n = len(students)      # number of students
     m = len(timeslots)     # number of timeslots (189)
     d = len(time_pref)     # number of supervisors
-    
-    print(f"\nProblem size:")
-    print(f"Students (n): {n}")
-    print(f"Timeslots (m): {m}")
-    print(f"Supervisors (d): {d}")
-    print(f"Days (H): {H}")
-    
+    allowed = None if pairs is None else [set(p) for p in pairs]
+    students_of = {a: [j for j in range(n) if students[j]['PB'] == a] for a in range(d)}
+
     # ============== GUROBI MODEL ==============
-    model = gp.Model("issp_adjusted")
+    model = gp.Model("issp_adjusted", env=env)
     model.setParam('Threads', 10)
+    if lazy:
+        model.setParam('LazyConstraints', 1)
     
     # ============== DECISION VARIABLES ==============
-    # x[i][j] = 1 if student j is assigned to timeslot i
-    x = np.empty((m, n), dtype=object)
+    # x[i][j] = 1 if student j is assigned to timeslot i (0 = variabel tidak dibuat)
+    x = np.zeros((m, n), dtype=object)
     for i in range(m):
         for j in range(n):
-            x[i][j] = model.addVar(vtype=GRB.BINARY, name=f'x_{i}_{j}')
+            if allowed is None or i in allowed[j]:
+                x[i][j] = model.addVar(vtype=GRB.BINARY, name=f'x_{i}_{j}')
     
     # y[i][a] = 1 if supervisor a is assigned to timeslot i
-    y = np.empty((m, d), dtype=object)
+    y = np.zeros((m, d), dtype=object)
     for i in range(m):
+        slot = timeslots[i]['slot']
         for a in range(d):
-            y[i][a] = model.addVar(vtype=GRB.BINARY, name=f'y_{i}_{a}')
+            if (allowed is None
+                    or any(isinstance(x[i][j], gp.Var) for j in students_of[a])
+                    or (not students_of[a] and time_pref[a][slot] == 1)):
+                y[i][a] = model.addVar(vtype=GRB.BINARY, name=f'y_{i}_{a}')
     
     # s[i] = 1 if timeslot i is used
     s = np.empty(m, dtype=object)
@@ -125,47 +86,54 @@ try:
     # ============== CONSTRAINTS ==============
     
     # 1. Each student must be assigned to exactly one timeslot
+    assign = []
     for j in range(n):
-        model.addConstr(
-            sum(x[i][j] for i in range(m)) == 1,
+        assign.append(model.addConstr(
+            gp.quicksum(x[i][j] for i in range(m)) == 1,
             name=f'student_assignment_{j}'
-        )
+        ))
     
-    # 2. Parallel session constraint: supervisor cannot be in two rooms at same time
-    for a in range(d):
-        for slot in range(H * M):  # for each global slot
-            # Find all timeslots with this slot but different rooms
-            timeslot_indices = [i for i in range(m) if timeslots[i]['slot'] == slot]
-            if len(timeslot_indices) > 1:
-                model.addConstr(
-                    sum(y[i][a] for i in timeslot_indices) <= 1,
-                    name=f'parallel_sup_{a}_slot_{slot}'
-                )
-    
-    # 3. Student-supervisor-session relationship
-    for a in range(d):
-        for i in range(m):
-            # If supervisor a is assigned, all their students must fit in capacity
-            students_of_a = [j for j in range(n) if students[j]['PB'] == a]
-            if students_of_a:
-                model.addConstr(
-                    sum(x[i][j] for j in students_of_a) <= C * y[i][a],
-                    name=f'sup_capacity_{i}_{a}'
-                )
-                # If any student of supervisor a is assigned, supervisor must be present
-                model.addConstr(
-                    sum(x[i][j] for j in students_of_a) >= y[i][a],
-                    name=f'sup_presence_{i}_{a}'
-                )
+    rooms_of = {}
+    for i in range(m):
+        rooms_of.setdefault(timeslots[i]['slot'], []).append(i)
+
+    # 2 & 3 ditunda ke callback pada mode lazy (lihat LazyCuts)
+    if not lazy:
+        # 2. Parallel session constraint: supervisor cannot be in two rooms at same time
+        for a in range(d):
+            for slot in range(H * M):  # for each global slot
+                # Find all timeslots with this slot but different rooms
+                timeslot_indices = [i for i in rooms_of.get(slot, []) if isinstance(y[i][a], gp.Var)]
+                if len(timeslot_indices) > 1:
+                    model.addConstr(
+                        gp.quicksum(y[i][a] for i in timeslot_indices) <= 1,
+                        name=f'parallel_sup_{a}_slot_{slot}'
+                    )
+    
+        # 3. Student-supervisor-session relationship
+        for a in range(d):
+            students_of_a = students_of[a]
+            for i in range(m):
+                # If supervisor a is assigned, all their students must fit in capacity
+                if students_of_a and isinstance(y[i][a], gp.Var):
+                    model.addConstr(
+                        gp.quicksum(x[i][j] for j in students_of_a) <= C * y[i][a],
+                        name=f'sup_capacity_{i}_{a}'
+                    )
+                    # If any student of supervisor a is assigned, supervisor must be present
+                    model.addConstr(
+                        gp.quicksum(x[i][j] for j in students_of_a) >= y[i][a],
+                        name=f'sup_presence_{i}_{a}'
+                    )
     
     # 4. Timeslot capacity
     for i in range(m):
         model.addConstr(
-            sum(x[i][j] for j in range(n)) <= C * s[i],
+            gp.quicksum(x[i][j] for j in range(n)) <= C * s[i],
             name=f'timeslot_capacity_{i}'
         )
         model.addConstr(
-            sum(x[i][j] for j in range(n)) >= 0,
+            gp.quicksum(x[i][j] for j in range(n)) >= 0,
             name=f'timeslot_min_{i}'
         )
     
@@ -175,11 +143,11 @@ try:
         day_timeslots = [i for i in range(m) if (timeslots[i]['slot'] // M) == l]
         if day_timeslots:
             model.addConstr(
-                sum(s[i] for i in day_timeslots) <= len(day_timeslots) * z[l],
+                gp.quicksum(s[i] for i in day_timeslots) <= len(day_timeslots) * z[l],
                 name=f'day_usage_upper_{l}'
             )
             model.addConstr(
-                sum(s[i] for i in day_timeslots) >= z[l],
+                gp.quicksum(s[i] for i in day_timeslots) >= z[l],
                 name=f'day_usage_lower_{l}'
             )
     
@@ -187,9 +155,7 @@ try:
     for l in range(H):
         day_timeslots = [i for i in range(m) if (timeslots[i]['slot'] // M) == l]
         if day_timeslots:
-            totalD = gp.LinExpr()
-            for i in day_timeslots:
-                totalD += sum(y[i][a] for a in range(d))
+            totalD = gp.quicksum(y[i][a] for i in day_timeslots for a in range(d))
             model.addConstr(
                 totalD >= D * z[l],
                 name=f'min_supervisors_day_{l}'
@@ -198,12 +164,14 @@ try:
     # 7. Time preference constraint
     for i in range(m):
         slot = timeslots[i]['slot']  # 0-62
+        present = [a for a in range(d) if isinstance(y[i][a], gp.Var)]
         # Only assign supervisors who are available at this slot
-        model.addConstr(
-            sum(time_pref[a][slot] * y[i][a] for a in range(d)) == 
-            sum(y[i][a] for a in range(d)),
-            name=f'time_pref_{i}'
-        )
+        if present:
+            model.addConstr(
+                gp.quicksum(time_pref[a][slot] * y[i][a] for a in present) ==
+                gp.quicksum(y[i][a] for a in present),
+                name=f'time_pref_{i}'
+            )
     
     print("Constraints added")
     
@@ -214,20 +182,21 @@ try:
     for i in range(m):
         slot = timeslots[i]['slot']
         for j in range(n):
-            pb = students[j]['PB']
-            theobjp += time_pref[pb][slot] * x[i][j]
+            if isinstance(x[i][j], gp.Var):
+                pb = students[j]['PB']
+                theobjp += time_pref[pb][slot] * x[i][j]
     
     # Objective 2: Group students of same type
     theobjq = gp.QuadExpr()
     for i in range(m):
-        for j in range(n - 1):
-            for k in range(j + 1, n):
-                same_type = 1 if students[j]['Type'] == students[k]['Type'] else 0
-                theobjq += same_type * x[i][j] * x[i][k]
+        present = [j for j in range(n) if isinstance(x[i][j], gp.Var)]
+        for p, j in enumerate(present):
+            for k in present[p + 1:]:
+                if students[j]['Type'] == students[k]['Type']:
+                    theobjq += x[i][j] * x[i][k]
     
     # Objective 3: Minimize number of used timeslots
-    theobjm = gp.LinExpr()
-    theobjm = m - sum(s[i] for i in range(m))
+    theobjm = m - gp.quicksum(s[i] for i in range(m))
 
     # Combined objective
     model.setObjective(
@@ -236,196 +205,552 @@ try:
     )
     
     print("Objective function set")
-    
-    # ============== OPTIMIZE ==============
-    print("\nOptimizing...")
-    start_time = time.time()
-    model.optimize()
-    end_time = time.time()
-    execution_time = end_time - start_time
-    
-    # ============== DISPLAY RESULTS ==============
-    if model.status == GRB.OPTIMAL:
-        print(f'\nOptimal objective: {model.objVal}')
-        
-        # Count active days and timeslots
-        active_days = sum(1 for l in range(H) if z[l].X > 0.5)
-        active_timeslots = sum(1 for i in range(m) if s[i].X > 0.5)
-        
-        # Count assigned and unassigned students
-        assigned_students = sum(1 for j in range(n) for i in range(m) if x[i][j].X > 0.5)
-        unassigned_students = n - assigned_students
-        
-        print(f'Active days: {active_days}')
-        print(f'Active timeslots: {active_timeslots}')
-        print(f'Assigned students: {assigned_students}')
-        print(f'Unassigned students: {unassigned_students}')
-        print(f'Execution time: {execution_time:.4f} seconds')
-        # ===================================================================================================detail
-        
-        # ============== CALCULATE OBJECTIVE COMPONENTS ==============
-        print("\n" + "="*80)
-        print("OBJECTIVE FUNCTION BREAKDOWN")
-        print("="*80)
-        
-        # Calculate theobjp (time preference satisfaction)
-        objp_value = 0
-        for i in range(m):
-            slot = timeslots[i]['slot']
-            for j in range(n):
-                if x[i][j].X > 0.5:
-                    pb = students[j]['PB']
-                    objp_value += time_pref[pb][slot]
-        
-        print(f"\n1. Time Preference Satisfaction (theobjp):")
-        print(f"   Value: {objp_value}")
-        print(f"   Weight (ALPHA): {ALPHA}")
-        print(f"   Weighted contribution: {ALPHA * objp_value}")
-        
-        # Calculate theobjq (same type grouping)
-        objq_value = 0
-        same_type_pairs = []
-        for i in range(m):
-            students_in_slot = [j for j in range(n) if x[i][j].X > 0.5]
-            if len(students_in_slot) > 1:
-                for idx1 in range(len(students_in_slot)):
-                    for idx2 in range(idx1 + 1, len(students_in_slot)):
-                        j = students_in_slot[idx1]
-                        k = students_in_slot[idx2]
-                        if students[j]['Type'] == students[k]['Type']:
-                            objq_value += 1
-                            same_type_pairs.append({
-                                'timeslot': i,
-                                'slot': timeslots[i]['slot'],
-                                'room': timeslots[i]['ruang'],
-                                'student1': j,
-                                'student2': k,
-                                'type': students[j]['Type']
-                            })
-        
-        print(f"\n2. Same Type Grouping (theobjq):")
-        print(f"   Total same-type pairs: {objq_value}")
-        print(f"   Weight (BETA): {BETA}")
-        print(f"   Weighted contribution: {BETA * objq_value}")
-        
-        if same_type_pairs:
-            print(f"   Details of same-type pairs:")
-            type_names = {0: "Magang", 1: "Stupen", 2: "Penelitian", 3: "Mengajar", 4: "KKN", 5: "Wirausaha"}
-            for pair in same_type_pairs[:10]:  # Show first 10 pairs
-                day = pair['slot'] // M + 1
-                slot_in_day = pair['slot'] % M + 1
-                room = pair['room'] + 1
-                type_name = type_names.get(pair['type'], f"Type {pair['type']}")
-                print(f"     - Day {day}, Slot {slot_in_day}, Room {room}: Student {pair['student1']} & {pair['student2']} ({type_name})")
-            if len(same_type_pairs) > 10:
-                print(f"     ... and {len(same_type_pairs) - 10} more pairs")
-        
-        # Calculate theobjm (minimize used timeslots)
-        used_timeslots_count = sum(1 for i in range(m) if s[i].X > 0.5)
-        objm_value = m - used_timeslots_count
-        
-        print(f"\n3. Minimize Used Timeslots (theobjm):")
-        print(f"   Total timeslots available: {m}")
-        print(f"   Timeslots used: {used_timeslots_count}")
-        print(f"   Timeslots NOT used: {objm_value}")
-        print(f"   Weight (GAMMA): {GAMMA}")
-        print(f"   Weighted contribution: {GAMMA * objm_value}")
-        
-        # Show which slots are used
-        print(f"\n   Used timeslots distribution:")
-        for l in range(H):
-            day_timeslots = [i for i in range(m) if (timeslots[i]['slot'] // M) == l]
-            used_in_day = sum(1 for i in day_timeslots if s[i].X > 0.5)
-            if used_in_day > 0:
-                print(f"     Day {l + 1}: {used_in_day}/{len(day_timeslots)} timeslots used")
-        
-        # Total objective
-        total_objective = ALPHA * objp_value + BETA * objq_value + GAMMA * objm_value
-        print(f"\n" + "-"*80)
-        print(f"TOTAL OBJECTIVE VALUE: {total_objective}")
-        print(f"  = ({ALPHA} * {objp_value}) + ({BETA} * {objq_value}) + ({GAMMA} * {objm_value})")
-        print(f"  = {ALPHA * objp_value} + {BETA * objq_value} + {GAMMA * objm_value}")
-        print(f"  = {total_objective}")
-        print(f"\nGurobi reported objective: {model.objVal}")
-        print(f"Difference (should be ~0): {abs(total_objective - model.objVal)}")
-        print("="*80)
-        # ===================================================================================================
-        # Display schedule
-        print("\n" + "="*80)
-        print("SCHEDULE")
-        print("="*80)
-        
-        for l in range(H):
-            if z[l].X > 0.5:
-                print(f"\n>>> DAY {l + 1}")
-                day_timeslots = [i for i in range(m) if (timeslots[i]['slot'] // M) == l]
-                
-                for i in day_timeslots:
-                    if s[i].X > 0.5:
-                        slot = timeslots[i]['slot']
-                        room = timeslots[i]['ruang']
-                        slot_in_day = slot % M
-                        
-                        print(f"\n  Slot {slot_in_day}, Room {room + 1}:")
-                        
-                        # Supervisors
-                        active_sups = [a for a in range(d) if y[i][a].X > 0.5]
-                        print(f"    Supervisors: {active_sups}")
-                        
-                        # Students
-                        assigned_students = [j for j in range(n) if x[i][j].X > 0.5]
-                        for j in assigned_students:
-                            print(f"      Student {j}: Type={students[j]['Type']}, PB={students[j]['PB']}")
-        
-        print("\n" + "="*80)
-        
-    else:
-        print(f'Optimization ended with status {model.status}')
-        if model.status == GRB.INFEASIBLE:
-            print("Model is infeasible. Computing IIS...")
-            model.computeIIS()
-            model.write("model.ilp")
-            print("IIS written to model.ilp")
-
-except gp.GurobiError as e:
-    print(f"Gurobi Error {e.errno}: {e}")
-
-except Exception as e:
-    print(f"Error: {e}")
-    import traceback
-    traceback.print_exc()
-
-# Output JSON for API (at the very end)
-if 'model' in locals() and hasattr(model, 'status') and model.status == GRB.OPTIMAL:
-    # Count assigned and unassigned studentsun
+
+    v = {"x": x, "y": y, "s": s, "z": z, "assign": assign}
+    if lazy:
+        v["lazy"] = {"C": C, "students_of": students_of}
+    return model, v
+
+
+def print_solution(model, v, students, time_pref, timeslots, H, M, ALPHA, BETA, GAMMA, execution_time):
+    x, y, s, z = v["x"], v["y"], v["s"], v["z"]
+    n = len(students)
+    m = len(timeslots)
+    d = len(time_pref)
+
+    print(f'\nOptimal objective: {model.objVal}')
+
+    # Count active days and timeslots
+    active_days = sum(1 for l in range(H) if z[l].X > 0.5)
+    active_timeslots = sum(1 for i in range(m) if s[i].X > 0.5)
+
+    # Count assigned and unassigned students
     assigned_students = sum(1 for j in range(n) for i in range(m) if x[i][j].X > 0.5)
     unassigned_students = n - assigned_students
-    
-    result = {
+
+    print(f'Active days: {active_days}')
+    print(f'Active timeslots: {active_timeslots}')
+    print(f'Assigned students: {assigned_students}')
+    print(f'Unassigned students: {unassigned_students}')
+    print(f'Execution time: {execution_time:.4f} seconds')
+    # ===================================================================================================detail
+
+    # ============== CALCULATE OBJECTIVE COMPONENTS ==============
+    print("\n" + "="*80)
+    print("OBJECTIVE FUNCTION BREAKDOWN")
+    print("="*80)
+
+    # Calculate theobjp (time preference satisfaction)
+    objp_value = 0
+    for i in range(m):
+        slot = timeslots[i]['slot']
+        for j in range(n):
+            if x[i][j].X > 0.5:
+                pb = students[j]['PB']
+                objp_value += time_pref[pb][slot]
+
+    print(f"\n1. Time Preference Satisfaction (theobjp):")
+    print(f"   Value: {objp_value}")
+    print(f"   Weight (ALPHA): {ALPHA}")
+    print(f"   Weighted contribution: {ALPHA * objp_value}")
+
+    # Calculate theobjq (same type grouping)
+    objq_value = 0
+    same_type_pairs = []
+    for i in range(m):
+        students_in_slot = [j for j in range(n) if x[i][j].X > 0.5]
+        if len(students_in_slot) > 1:
+            for idx1 in range(len(students_in_slot)):
+                for idx2 in range(idx1 + 1, len(students_in_slot)):
+                    j = students_in_slot[idx1]
+                    k = students_in_slot[idx2]
+                    if students[j]['Type'] == students[k]['Type']:
+                        objq_value += 1
+                        same_type_pairs.append({
+                            'timeslot': i,
+                            'slot': timeslots[i]['slot'],
+                            'room': timeslots[i]['ruang'],
+                            'student1': j,
+                            'student2': k,
+                            'type': students[j]['Type']
+                        })
+
+    print(f"\n2. Same Type Grouping (theobjq):")
+    print(f"   Total same-type pairs: {objq_value}")
+    print(f"   Weight (BETA): {BETA}")
+    print(f"   Weighted contribution: {BETA * objq_value}")
+
+    if same_type_pairs:
+        print(f"   Details of same-type pairs:")
+        type_names = {0: "Magang", 1: "Stupen", 2: "Penelitian", 3: "Mengajar", 4: "KKN", 5: "Wirausaha"}
+        for pair in same_type_pairs[:10]:  # Show first 10 pairs
+            day = pair['slot'] // M + 1
+            slot_in_day = pair['slot'] % M + 1
+            room = pair['room'] + 1
+            type_name = type_names.get(pair['type'], f"Type {pair['type']}")
+            print(f"     - Day {day}, Slot {slot_in_day}, Room {room}: Student {pair['student1']} & {pair['student2']} ({type_name})")
+        if len(same_type_pairs) > 10:
+            print(f"     ... and {len(same_type_pairs) - 10} more pairs")
+
+    # Calculate theobjm (minimize used timeslots)
+    used_timeslots_count = sum(1 for i in range(m) if s[i].X > 0.5)
+    objm_value = m - used_timeslots_count
+
+    print(f"\n3. Minimize Used Timeslots (theobjm):")
+    print(f"   Total timeslots available: {m}")
+    print(f"   Timeslots used: {used_timeslots_count}")
+    print(f"   Timeslots NOT used: {objm_value}")
+    print(f"   Weight (GAMMA): {GAMMA}")
+    print(f"   Weighted contribution: {GAMMA * objm_value}")
+
+    # Show which slots are used
+    print(f"\n   Used timeslots distribution:")
+    for l in range(H):
+        day_timeslots = [i for i in range(m) if (timeslots[i]['slot'] // M) == l]
+        used_in_day = sum(1 for i in day_timeslots if s[i].X > 0.5)
+        if used_in_day > 0:
+            print(f"     Day {l + 1}: {used_in_day}/{len(day_timeslots)} timeslots used")
+
+    # Total objective
+    total_objective = ALPHA * objp_value + BETA * objq_value + GAMMA * objm_value
+    print(f"\n" + "-"*80)
+    print(f"TOTAL OBJECTIVE VALUE: {total_objective}")
+    print(f"  = ({ALPHA} * {objp_value}) + ({BETA} * {objq_value}) + ({GAMMA} * {objm_value})")
+    print(f"  = {ALPHA * objp_value} + {BETA * objq_value} + {GAMMA * objm_value}")
+    print(f"  = {total_objective}")
+    print(f"\nGurobi reported objective: {model.objVal}")
+    print(f"Difference (should be ~0): {abs(total_objective - model.objVal)}")
+    print("="*80)
+    # ===================================================================================================
+    # Display schedule
+    print("\n" + "="*80)
+    print("SCHEDULE")
+    print("="*80)
+
+    for l in range(H):
+        if z[l].X > 0.5:
+            print(f"\n>>> DAY {l + 1}")
+            day_timeslots = [i for i in range(m) if (timeslots[i]['slot'] // M) == l]
+
+            for i in day_timeslots:
+                if s[i].X > 0.5:
+                    slot = timeslots[i]['slot']
+                    room = timeslots[i]['ruang']
+                    slot_in_day = slot % M
+
+                    print(f"\n  Slot {slot_in_day}, Room {room + 1}:")
+
+                    # Supervisors
+                    active_sups = [a for a in range(d) if y[i][a].X > 0.5]
+                    print(f"    Supervisors: {active_sups}")
+
+                    # Students
+                    assigned_students = [j for j in range(n) if x[i][j].X > 0.5]
+                    for j in assigned_students:
+                        print(f"      Student {j}: Type={students[j]['Type']}, PB={students[j]['PB']}")
+
+    print("\n" + "="*80)
+
+
+def mip_gap(best, bound):
+    """Gap relatif seperti MIPGap Gurobi: |bound - incumbent| / |incumbent|."""
+    return abs(bound - best) / max(abs(best), 1e-10)
+
+
+class SolveMonitor:
+    """
+    Callback Gurobi untuk mode anytime: menulis progres (incumbent, bound, gap,
+    node, waktu) sebagai JSON lines ke stderr dan menghentikan solve bila ada
+    SIGTERM atau file kontrol pembatalan. Incumbent terbaik tetap dikembalikan.
+    """
+
+    def __init__(self, stream=sys.stderr, cancel_file=None, interval=1.0):
+        self.stream = stream
+        self.cancel_file = cancel_file
+        self.interval = interval
+        self.start = time.time()
+        self.last_emit = 0.0
+        self.last_file_check = 0.0
+        self.cancelled = False
+
+    def request_stop(self, signum=None, frame=None):
+        self.cancelled = True
+
+    def emit(self, record):
+        record["elapsed"] = round(time.time() - self.start, 3)
+        self.stream.write(json.dumps({"progress": record}) + "\n")
+        self.stream.flush()
+
+    def _cancel_requested(self, now):
+        if self.cancelled:
+            return True
+        if self.cancel_file and now - self.last_file_check >= 0.2:
+            self.last_file_check = now
+            self.cancelled = os.path.exists(self.cancel_file)
+        return self.cancelled
+
+    def __call__(self, model, where):
+        now = time.time()
+        if where == GRB.Callback.MIPSOL:
+            # MIPSOL_OBJ = solusi kandidat yang baru ditemukan (bisa lebih buruk dari
+            # incumbent, atau ditolak lazy cut); incumbent = MIPSOL_OBJBST
+            best = model.cbGet(GRB.Callback.MIPSOL_OBJBST)
+            bound = model.cbGet(GRB.Callback.MIPSOL_OBJBND)
+            has_incumbent = model.cbGet(GRB.Callback.MIPSOL_SOLCNT) > 0
+            self.emit({
+                "event": "incumbent",
+                "objective": best if has_incumbent else None,
+                "candidate": model.cbGet(GRB.Callback.MIPSOL_OBJ),
+                "bound": bound,
+                "gap": mip_gap(best, bound) if has_incumbent else None,
+                "nodes": model.cbGet(GRB.Callback.MIPSOL_NODCNT),
+            })
+        elif where == GRB.Callback.MIP and now - self.last_emit >= self.interval:
+            self.last_emit = now
+            best = model.cbGet(GRB.Callback.MIP_OBJBST)
+            bound = model.cbGet(GRB.Callback.MIP_OBJBND)
+            has_incumbent = model.cbGet(GRB.Callback.MIP_SOLCNT) > 0
+            self.emit({
+                "event": "progress",
+                "objective": best if has_incumbent else None,
+                "bound": bound,
+                "gap": mip_gap(best, bound) if has_incumbent else None,
+                "nodes": model.cbGet(GRB.Callback.MIP_NODCNT),
+            })
+        if self._cancel_requested(now):
+            model.terminate()
+
+
+class LazyCuts:
+    """
+    Callback mode lazy: pada tiap solusi kandidat (MIPSOL) cek constraint yang
+    ditunda -- parallel_sup (dosen di dua ruangan pada slot yang sama),
+    sup_capacity (mahasiswa dosen a di timeslot i tanpa y[i][a]) dan
+    sup_presence (y[i][a] tanpa mahasiswa dosen a) -- dan tambahkan yang
+    dilanggar dengan cbLazy. Callback lain (mis. SolveMonitor) diteruskan lewat `inner`.
+    """
+
+    def __init__(self, v, timeslots, inner=None):
+        self.x, self.y = v["x"], v["y"]
+        self.C = v["lazy"]["C"]
+        self.students_of = {a: js for a, js in v["lazy"]["students_of"].items() if js}
+        self.inner = inner
+        self.rooms_of = {}
+        for i, ts in enumerate(timeslots):
+            self.rooms_of.setdefault(ts['slot'], []).append(i)
+        self.rooms_of = {slot: idx for slot, idx in self.rooms_of.items() if len(idx) > 1}
+        self.added = {"parallel_sup": 0, "sup_capacity": 0, "sup_presence": 0}
+
+    def _cut(self, model, kind, expr):
+        model.cbLazy(expr)
+        self.added[kind] += 1
+
+    def __call__(self, model, where):
+        if where == GRB.Callback.MIPSOL:
+            m, n = self.x.shape
+            xs = np.array(model.cbGetSolution(self.x.ravel().tolist())).reshape(m, n) > 0.5
+            ys = np.array(model.cbGetSolution(self.y.ravel().tolist())).reshape(m, -1) > 0.5
+            for a, js in self.students_of.items():
+                load = xs[:, js].sum(axis=1)
+                for i in np.flatnonzero((load > 0) & ~ys[:, a]):
+                    self._cut(model, "sup_capacity",
+                              gp.quicksum(self.x[i][j] for j in js) <= self.C * self.y[i][a])
+                for i in np.flatnonzero((load == 0) & ys[:, a]):
+                    self._cut(model, "sup_presence", gp.quicksum(self.x[i][j] for j in js) >= self.y[i][a])
+            for idx in self.rooms_of.values():
+                for a in np.flatnonzero(ys[idx].sum(axis=0) > 1):
+                    self._cut(model, "parallel_sup", gp.quicksum(self.y[i][a] for i in idx) <= 1)
+        if self.inner is not None:
+            self.inner(model, where)
+
+
+def extract_schedule(v, students, timeslots, M):
+    """Sesi terisi dari solusi (optimal atau incumbent terbaik)."""
+    x, y = v["x"], v["y"]
+    sessions = []
+    for i, ts in enumerate(timeslots):
+        studs = [j for j in range(len(students)) if x[i][j].X > 0.5]
+        if not studs:
+            continue
+        slot = ts['slot']
+        sessions.append({
+            "timeslot": f"Hari ke-{slot // M + 1}, Slot {slot % M + 1}, Room {ts['ruang'] + 1}",
+            "index": i,
+            "students": [str(students[j].get("NIM")) for j in studs],
+            "supervisors": [a for a in range(y.shape[1]) if y[i][a].X > 0.5],
+        })
+    return sessions
+
+
+def solution_result(model, v, students, timeslots, M, execution_time):
+    """Ringkasan JSON dari model yang punya solusi (optimal atau incumbent)."""
+    x = v["x"]
+    n = len(students)
+    m = len(timeslots)
+    assigned_students = sum(1 for j in range(n) for i in range(m) if x[i][j].X > 0.5)
+    return {
         "algorithm": "gurobi",
-        "time": execution_time if 'execution_time' in locals() else 0,
+        "time": execution_time,
         "assigned": assigned_students,
-        "unassigned": unassigned_students,
-        "objective": model.objVal
+        "unassigned": n - assigned_students,
+        "objective": model.objVal,
+        "status": "optimal" if model.status == GRB.OPTIMAL else "interrupted",
+        "bound": model.ObjBound,
+        "gap": model.MIPGap,
+        "schedule": extract_schedule(v, students, timeslots, M),
     }
-    print(json.dumps(result))
-elif 'model' in locals() and hasattr(model, 'status') and model.status == GRB.INFEASIBLE:
-    result = {
+
+
+def failed_result(n, error, execution_time=0):
+    return {
         "algorithm": "gurobi",
-        "time": execution_time if 'execution_time' in locals() else 0,
+        "time": execution_time,
         "assigned": 0,
-        "unassigned": n if 'n' in locals() else 0,
+        "unassigned": n,
         "objective": 0,
-        "error": "infeasible"
+        "error": error,
     }
+
+
+def solve_instance(students, time_pref, C=5, D=3, H=9, M=7, R=3, ALPHA=0.0, BETA=1, GAMMA=1, lazy=False):
+    """
+    Bangun dan solve satu instance tanpa cache / IIS (dipakai compare.py).
+    `time` hanya mencakup optimize, sama seperti main().
+    """
+    timeslots = generate_timeslots(H, M, R)
+    model, v = build_model(students, time_pref, timeslots, C, D, H, M, ALPHA, BETA, GAMMA, lazy)
+    start_time = time.time()
+    if lazy:
+        model.optimize(LazyCuts(v, timeslots))
+    else:
+        model.optimize()
+    execution_time = time.time() - start_time
+    if model.SolCount > 0:
+        return solution_result(model, v, students, timeslots, M, execution_time)
+    if model.status == GRB.INFEASIBLE:
+        return failed_result(len(students), "infeasible", execution_time)
+    return failed_result(len(students), "unknown")
+
+
+def solve_warm_start(students, time_pref, start, C=5, D=3, H=9, M=7, R=3, time_limit=30.0,
+                     ALPHA=0.0, BETA=1, GAMMA=1, on_solution=None, env=None):
+    """
+    Model penuh dengan warm start `start` ({j: timeslot}, mis. hasil greedy).
+    on_solution(assignment) dipanggil untuk tiap incumbent yang lebih baik
+    (dipakai portfolio.py). Return assignment terbaik {j: timeslot} atau None.
+    """
+    timeslots = generate_timeslots(H, M, R)
+    model, v = build_model(students, time_pref, timeslots, C, D, H, M, ALPHA, BETA, GAMMA, env=env)
+    x = v["x"]
+    m, n = x.shape
+    for j in range(n):
+        for i in range(m):
+            x[i][j].Start = 1 if start.get(j) == i else 0
+    model.Params.TimeLimit = max(0.1, time_limit)
+    flat = [x[i][j] for i in range(m) for j in range(n)]
+    best = [-GRB.INFINITY]
+
+    def callback(model, where):
+        if where == GRB.Callback.MIPSOL and on_solution is not None:
+            objective = model.cbGet(GRB.Callback.MIPSOL_OBJ)
+            if objective > best[0]:
+                best[0] = objective
+                values = model.cbGetSolution(flat)
+                on_solution({k % n: k // n for k, val in enumerate(values) if val > 0.5})
+
+    model.optimize(callback)
+    assignment = None
+    if model.SolCount > 0:
+        assignment = {j: i for i in range(m) for j in range(n) if x[i][j].X > 0.5}
+    model.dispose()
+    return assignment
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser()
+    parser.add_argument('limit', nargs='?', type=int, default=None, help='Limit number of students to process')
+    parser.add_argument('--no-cache', action='store_true', help='Selalu solve ulang, abaikan cache hasil')
+    parser.add_argument('--anytime', action='store_true',
+                        help='Tulis progres (JSON lines, stderr) dan bisa dihentikan dengan SIGTERM / --cancel-file')
+    parser.add_argument('--cancel-file', default=None, help='Solve dihentikan bila file ini muncul (mode anytime)')
+    parser.add_argument('--validate', action='store_true',
+                        help='Cek ulang solusi dengan validate.py (panel D per hari, seperti model)')
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument('--template', action='store_true',
+                      help='Pakai template model (.cache/models) yang dibangun untuk seluruh data mahasiswa')
+    mode.add_argument('--lazy', action='store_true',
+                      help='Model inti saja; constraint ruang paralel & kehadiran dosen ditambah lewat callback')
+    add_job_arguments(parser)
+    args = parser.parse_args()
+    job = resolve_job(args, default_pref="test-data/pref_22.csv")
+
+    model = None
+    n = 0
+    execution_time = 0
+    precheck = None
+    cache = None if args.no_cache else ResultCache()
+    cache_key = cache_family = None
+
+    try:
+        # ============== LOAD DATA FROM FILES (same as greedy) ==============
+        stu_df = load_students(job["students"], args.limit)
+
+        # Load time preferences (baris ke-a = dosen dengan PB a)
+        time_pref = load_pref(stu_df, job["pref"])
+        # print(time_pref)
+        print("Data loaded successfully")
+        print(f"Students: {len(stu_df)}")
+        print(f"Supervisors: {len(time_pref)}")
+        print(f"Time pref slots: {len(time_pref[0]) if time_pref else 0}")
+
+        # ============== PARAMETERS (same as greedy) ==============
+        C = 5  # max students per timeslot
+        D = 3  # minimum supervisors per day
+        H = 9  # number of days
+        M = 7  # slots per day
+        R = 3  # number of rooms
+
+        # Objective weights
+        ALPHA = 0.0  # time preference weight
+        BETA = 1   # same type grouping weight
+        GAMMA = 1  # minimize used timeslots weight
+
+        # Config eksplisit (--config / --config-json / config.json di job dir) menentukan
+        # ukuran instance; bobot objektif tetap supaya sebanding dengan objective greedy
+        if job["explicit_config"]:
+            job_config = read_config(job)
+            C = job_config.get("C", C)
+            D = job_config.get("D", D)
+            H = job_config.get("H", H)
+            M = job_config.get("M", M)
+            R = job_config.get("R", R)
+
+        # ============== DATA STRUCTURES ==============
+        # Convert students dataframe to list of dicts
+        students = stu_df.to_dict(orient="records")
+        students = students[:LIMIT_STU]
+
+        # Generate timeslots (same as greedy)
+        timeslots = generate_timeslots(H, M, R)
+
+        n = len(students)      # number of students
+        m = len(timeslots)     # number of timeslots (189)
+        d = len(time_pref)     # number of supervisors
+
+        print(f"\nProblem size:")
+        print(f"Students (n): {n}")
+        print(f"Timeslots (m): {m}")
+        print(f"Supervisors (d): {d}")
+        print(f"Days (H): {H}")
+
+        # ============== PRECHECK (tanpa membangun MIP) ==============
+        precheck = feasibility_report([st['PB'] for st in students], time_pref, C, D, H, M, R,
+                                      lecturer_names(stu_df))
+        if cache is not None:
+            params = {"C": C, "D": D, "H": H, "M": M, "R": R, "ALPHA": ALPHA, "BETA": BETA, "GAMMA": GAMMA}
+            cache_key, cache_family = fingerprint("gurobi", students, time_pref, params, args.limit)
+            entry = cache.get(cache_key)
+            if entry is not None:
+                print("\nCache hit: hasil solve sebelumnya dipakai")
+                result = dict(entry["result"], cached=True)
+                if args.validate:
+                    # hasil di cache disimpan tanpa laporan validasi
+                    from validate import validate
+                    result["validation"] = validate(result, students, time_pref, C, D, H, M, R, "schedule", "day")
+                print(json.dumps(result))
+                return
+
+        if not precheck["feasible"]:
+            print("\nPrecheck: instance pasti infeasible, model tidak dibangun")
+            print(format_report(precheck))
+        else:
+            if args.template:
+                # template untuk LIMIT_STU mahasiswa pertama & semua dosen dari file penuh;
+                # limit / C / D run ini diterapkan di tempat
+                from model_template import ModelTemplate
+                full_df = load_students(job["students"])
+                template = ModelTemplate.cached(full_df.to_dict(orient="records")[:LIMIT_STU],
+                                                load_pref(full_df, job["pref"]),
+                                                C, D, H, M, R, ALPHA, BETA, GAMMA)
+                template.configure(n=len(students), d=len(time_pref), C=C, D=D)
+                model, v = template.model, template.v
+            else:
+                model, v = build_model(students, time_pref, timeslots, C, D, H, M, ALPHA, BETA, GAMMA,
+                                       lazy=args.lazy)
+
+            # Warm start dari solusi optimal tersimpan (config & preferensi sama)
+            warm = cache.family_assignment(cache_family) if cache is not None else None
+            if warm:
+                n_start = 0
+                for j, st in enumerate(students):
+                    i = warm.get(str(st.get("NIM")))
+                    if i is not None and i < len(timeslots):
+                        v["x"][i][j].Start = 1
+                        n_start += 1
+                print(f"Warm start: {n_start} mahasiswa dari cache")
+
+            # ============== OPTIMIZE ==============
+            print("\nOptimizing...")
+            callback = None
+            if args.anytime:
+                callback = SolveMonitor(cancel_file=args.cancel_file)
+                signal.signal(signal.SIGTERM, callback.request_stop)
+            if args.lazy:
+                callback = lazy_cuts = LazyCuts(v, timeslots, inner=callback)
+            start_time = time.time()
+            if callback is not None:
+                model.optimize(callback)
+            else:
+                model.optimize()
+            end_time = time.time()
+            execution_time = end_time - start_time
+
+            # ============== DISPLAY RESULTS ==============
+            if model.status != GRB.OPTIMAL and model.SolCount > 0:
+                print(f'Optimization stopped with status {model.status}, using best incumbent')
+            if model.SolCount > 0:
+                print_solution(model, v, students, time_pref, timeslots, H, M, ALPHA, BETA, GAMMA, execution_time)
+            else:
+                print(f'Optimization ended with status {model.status}')
+                if model.status == GRB.INFEASIBLE:
+                    print("Model is infeasible. Computing IIS...")
+                    model.computeIIS()
+                    model.write(output_path(job, "model.ilp"))
+                    print(f"IIS written to {output_path(job, 'model.ilp')}")
+
+    except gp.GurobiError as e:
+        print(f"Gurobi Error {e.errno}: {e}")
+
+    except Exception as e:
+        print(f"Error: {e}")
+        import traceback
+        traceback.print_exc()
+
+    # Output JSON for API (at the very end)
+    if model is not None and model.SolCount > 0:
+        x = v["x"]
+        m = len(timeslots)
+        result = solution_result(model, v, students, timeslots, M, execution_time)
+        if model.status == GRB.OPTIMAL and cache is not None and cache_key is not None:
+            assignment = {str(students[j].get("NIM")): i
+                          for j in range(n) for i in range(m) if x[i][j].X > 0.5}
+            cache.put(cache_key, result, cache_family, assignment)
+        if args.lazy:
+            result["lazy_constraints"] = lazy_cuts.added
+        if args.validate:
+            from validate import validate
+            result["validation"] = validate(result, students, time_pref, C, D, H, M, R, "schedule", "day")
+    elif (model is not None and model.status == GRB.INFEASIBLE) or (precheck is not None and not precheck["feasible"]):
+        result = failed_result(n, "infeasible", execution_time)
+        if precheck is not None and not precheck["feasible"]:
+            result["precheck"] = precheck
+    else:
+        cancelled = model is not None and model.status == GRB.INTERRUPTED
+        result = failed_result(n, "cancelled" if cancelled else "unknown",
+                               execution_time if cancelled else 0)
     print(json.dumps(result))
-else:
-    result = {
-        "algorithm": "gurobi",
-        "time": 0,
-        "assigned": 0,
-        "unassigned": n if 'n' in locals() else 0,
-        "objective": 0,
-        "error": "unknown"
-    }
-    print(json.dumps(result))
\ No newline at end of file
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Path input/output per job.
+
+Setiap run bisa diberi direktori job sendiri (berisi stu.xlsx, pref.csv,
+config.json) atau path eksplisit dan config inline, sehingga beberapa job
+bisa berjalan paralel tanpa saling menimpa file bersama.
+"""
+import json
+import os
+
+DEFAULT_STUDENTS = os.path.join("uploads", "stu.xlsx")
+DEFAULT_PREF = os.path.join("uploads", "pref.csv")
+DEFAULT_CONFIG = "config.json"
+
+
+def add_job_arguments(parser):
+    parser.add_argument('--job-dir', default=None,
+                        help='Direktori job: stu.xlsx, pref.csv, config.json dibaca dan hasil ditulis di sini')
+    parser.add_argument('--students', default=None, help='Path file mahasiswa (xlsx)')
+    parser.add_argument('--pref', default=None, help='Path file preferensi dosen (csv)')
+    parser.add_argument('--config', default=None, help='Path config.json')
+    parser.add_argument('--config-json', default=None, help='Config inline (JSON), menggantikan file config')
+
+
+def resolve_job(args, default_pref=DEFAULT_PREF):
+    """
+    Tentukan path input/output. Prioritas: argumen eksplisit > isi --job-dir > default.
+    Return dict: students, pref, config (dict atau None), config_path, out_dir, explicit_config.
+    """
+    job_dir = args.job_dir
+
+    def pick(explicit, name, default):
+        if explicit:
+            return explicit
+        if job_dir and os.path.exists(os.path.join(job_dir, name)):
+            return os.path.join(job_dir, name)
+        return default
+
+    config = None
+    config_path = pick(args.config, "config.json", DEFAULT_CONFIG)
+    explicit_config = bool(args.config_json or args.config or
+                           (job_dir and os.path.exists(os.path.join(job_dir, "config.json"))))
+    if args.config_json:
+        config = json.loads(args.config_json)
+        config_path = None
+
+    return {
+        "students": pick(args.students, "stu.xlsx", DEFAULT_STUDENTS),
+        "pref": pick(args.pref, "pref.csv", default_pref),
+        "config": config,
+        "config_path": config_path,
+        "explicit_config": explicit_config,
+        "out_dir": job_dir or ".",
+    }
+
+
+def read_config(job):
+    """Config job sebagai dict mentah (inline atau dari file)."""
+    if job["config"] is not None:
+        return dict(job["config"])
+    with open(job["config_path"], "r") as f:
+        return json.load(f)
+
+
+def output_path(job, name):
+    """Path output relatif ke direktori job (nama absolut dibiarkan)."""
+    if os.path.isabs(name) or os.path.dirname(name):
+        return name
+    return os.path.join(job["out_dir"], name)
@@ -0,0 +1,274 @@
+"""
+Large neighbourhood search (LNS): greedy + sub-MIP.
+
+Mulai dari hasil greedy, lalu berulang kali satu lingkungan dilepas -- satu
+hari, semua sesi seorang dosen, atau mahasiswa tidak terjadwal beserta sesi
+yang bisa mereka pakai -- dan dioptimasi ulang dengan model guroby.build_model
+yang sama, dibangun hanya untuk ruangan di slot global lingkungan itu dengan
+isi ruangan lain dikunci (lihat build_neighbourhood_model). Constraint-nya
+persis model Gurobi, termasuk panel D per hari; panel D per sesi dilengkapi
+additional_supervisors di akhir seperti greedy. Objective sub-masalah = objective
+Gurobi; perubahan hanya diterima bila objective greedy (obj2 + obj3) tidak
+turun. Mahasiswa yang sudah terjadwal tidak boleh terlepas dan mahasiswa
+tidak terjadwal diutamakan untuk masuk.
+
+    python greedy.py --lns 60
+"""
+import contextlib
+import io
+import random
+import time
+
+import gurobipy as gp
+from gurobipy import GRB
+
+from diagnostics import explain_unassigned
+from greedy import (
+    additional_supervisors,
+    compute_greedy_objectives,
+    plain_record,
+    run_greedy,
+    supervisor_available,
+    unassigned_record,
+)
+
+NEIGHBOURHOODS = ("day", "lecturer", "unassigned")
+# bobot objective sama dengan guroby.py
+ALPHA, BETA, GAMMA = 0.0, 1, 1
+
+
+def report_incumbent(report, Schedule, timeslots, stu_df, pref, D, M, R):
+    """Kirim salinan Schedule dengan panel lengkap ke `report(Schedule, timeslots)`."""
+    snapshot = {i: {"students": list(info['students']), "supervisors": set(info['supervisors'])}
+                for i, info in Schedule.items()}
+    additional_supervisors(snapshot, timeslots, stu_df, pref, D, M, R)
+    report(snapshot, timeslots)
+
+
+def total_objective(Schedule, timeslots, H, M):
+    objectives = compute_greedy_objectives(Schedule, timeslots, H, M)
+    return objectives["obj2_same_type_pairs"] + objectives["obj3_min_used_timeslots"]
+
+
+def _take_sessions(Schedule, ordered, budget, max_sessions, C):
+    """Ambil sesi sesuai urutan selama jumlah mahasiswa yang dilepas <= budget."""
+    chosen = []
+    freed = 0
+    for i in ordered:
+        if len(chosen) >= max_sessions:
+            break
+        k = len(Schedule[i]['students'])
+        if freed + k > budget:
+            continue
+        chosen.append(i)
+        freed += k
+    return chosen
+
+
+def pick_neighbourhood(kind, Schedule, timeslots, unassigned, pref, rng, M=7, R=3, C=5,
+                       max_students=30, max_sessions=30):
+    """
+    Return (sesi yang dibuka, mahasiswa tambahan yang ikut dijadwalkan ulang)
+    atau None bila lingkungan jenis ini kosong.
+    """
+    occupied = [i for i in Schedule if Schedule[i]['students']]
+    if kind == "day":
+        days = sorted({timeslots[i]['slot'] // M for i in occupied})
+        if not days:
+            return None
+        day = rng.choice(days)
+        in_day = [i for i in range(len(timeslots)) if timeslots[i]['slot'] // M == day]
+        busy = [i for i in in_day if Schedule[i]['students']]
+        rng.shuffle(busy)
+        empty = [i for i in in_day if not Schedule[i]['students']]
+        return _take_sessions(Schedule, busy + empty, max_students, max_sessions, C), []
+
+    if kind == "lecturer":
+        lecturers = sorted({st['PB'] for i in occupied for st in Schedule[i]['students']}
+                           | {s['PB'] for s in unassigned})
+        if not lecturers:
+            return None
+        a = rng.choice(lecturers)
+        extra = [s for s in unassigned if s['PB'] == a][:max_students]
+        own = [i for i in occupied if any(st['PB'] == a for st in Schedule[i]['students'])]
+        free = [i for i in range(len(timeslots))
+                if len(Schedule[i]['students']) < C and i not in own
+                and supervisor_available(pref, a, timeslots[i]['slot'], M, R)]
+        rng.shuffle(free)
+        # sesi yang kosong dulu supaya lebih banyak ruang gerak per mahasiswa dilepas
+        free.sort(key=lambda i: len(Schedule[i]['students']))
+        return _take_sessions(Schedule, own + free, max_students - len(extra), max_sessions, C), extra
+
+    if kind == "unassigned":
+        if not unassigned:
+            return None
+        extra = rng.sample(unassigned, min(len(unassigned), max_students // 2))
+        sups = {s['PB'] for s in extra}
+        usable = [i for i in range(len(timeslots))
+                  if any(supervisor_available(pref, a, timeslots[i]['slot'], M, R) for a in sups)]
+        rng.shuffle(usable)
+        usable.sort(key=lambda i: len(Schedule[i]['students']))
+        return _take_sessions(Schedule, usable, max_students - len(extra), max_sessions, C), extra
+
+    raise ValueError(f"Neighbourhood tidak dikenal: {kind}")
+
+
+def build_neighbourhood_model(Schedule, timeslots, sessions, freed, must_assign, pref, C, D, H, M=7, R=3, env=None):
+    """
+    Sub-masalah model guroby.build_model untuk satu lingkungan. Timeslot = semua
+    ruangan di slot global sesi yang dibuka (supaya ruang paralel lengkap),
+    mahasiswa = `freed` (sudah dikeluarkan dari Schedule) ditambah isi tetap
+    ruangan lain di slot tsb, yang x-nya dikunci ke ruangannya. Mahasiswa
+    `freed` hanya boleh ke sesi yang dibuka tempat pembimbingnya tersedia;
+    yang tidak terjadwal (must_assign False) boleh tetap tidak terjadwal tapi
+    diberi bobot lebih besar dari seluruh objective.
+    Return (model, x) dengan x[(i, j)] = var biner mahasiswa freed j di sesi i.
+    """
+    from guroby import build_model
+
+    touched = {timeslots[i]['slot'] for i in sessions}
+    local = [i for i in range(len(timeslots)) if timeslots[i]['slot'] in touched]
+    position = {i: k for k, i in enumerate(local)}
+    fixed = [(st, i) for i in local for st in Schedule[i]['students']]
+    students = list(freed) + [st for st, _ in fixed]
+    pairs = [[position[i] for i in sessions if supervisor_available(pref, st['PB'], timeslots[i]['slot'], M, R)]
+             for st in freed]
+    pairs += [[position[i]] for _, i in fixed]
+
+    # build_model mencetak progres ke stdout; stdout greedy.py harus tetap JSON
+    with contextlib.redirect_stdout(io.StringIO()):
+        model, v = build_model(students, pref, [timeslots[i] for i in local], C, D, H, M,
+                               ALPHA, BETA, GAMMA, pairs=pairs, env=env)
+    model.update()
+    x = v["x"]
+    for k in range(len(freed), len(students)):
+        x[pairs[k][0]][k].LB = 1
+    weight = len(local) * (BETA * C * (C - 1) // 2 + GAMMA) + 1
+    for j in range(len(freed)):
+        if not must_assign[j]:
+            v["assign"][j].Sense = GRB.LESS_EQUAL
+            for k in pairs[j]:
+                x[k][j].Obj += weight
+    return model, {(local[k], j): x[k][j] for j in range(len(freed)) for k in pairs[j]}
+
+
+def run_lns(stu_df, pref, C=5, D=3, H=9, M=7, R=3, placement="firstfit", time_limit=30.0,
+            seed=0, max_students=30, max_sessions=30, iteration_time=5.0, stream=None, report=None):
+    """
+    Greedy lalu LNS sampai time_limit detik. Return state seperti run_greedy (+ "lns").
+    report(Schedule, timeslots) dipanggil untuk hasil greedy dan tiap perbaikan (dipakai portfolio.py).
+    """
+    start_time = time.time()
+    state = run_greedy(stu_df, pref, C, D, H, M, R, placement)
+    Schedule = state["Schedule"]
+    timeslots = state["timeslots"]
+    if report is not None:
+        report(Schedule, timeslots)
+
+    # selama LNS supervisors = pembimbing saja; panel dilengkapi lagi di akhir
+    for info in Schedule.values():
+        info['supervisors'] = {st['PB'] for st in info['students']}
+    unassigned = [plain_record(s) for s in state["unassigned"]]
+
+    rng = random.Random(seed)
+    env = gp.Env(empty=True)
+    env.setParam("OutputFlag", 0)
+    env.start()
+
+    objective_start = total_objective(Schedule, timeslots, H, M)
+    best = (len(stu_df) - len(unassigned), objective_start)
+    stats = {"iterations": 0, "improvements": 0, "skipped": 0, "history": []}
+    kinds = list(NEIGHBOURHOODS)
+
+    while time.time() - start_time < time_limit:
+        kind = kinds[stats["iterations"] % len(kinds)]
+        stats["iterations"] += 1
+        picked = pick_neighbourhood(kind, Schedule, timeslots, unassigned, pref, rng,
+                                    M, R, C, max_students, max_sessions)
+        if not picked or not picked[0]:
+            stats["skipped"] += 1
+            if all(pick_neighbourhood(k, Schedule, timeslots, unassigned, pref, rng, M, R, C,
+                                      max_students, max_sessions) is None for k in kinds):
+                break
+            continue
+        sessions, extra = picked
+
+        # lepas mahasiswa dari sesi yang dibuka
+        previous = {i: list(Schedule[i]['students']) for i in sessions}
+        freed, must_assign, origin = [], [], []
+        for i in sessions:
+            for st in Schedule[i]['students']:
+                freed.append(st)
+                must_assign.append(True)
+                origin.append(i)
+            Schedule[i]['students'] = []
+            Schedule[i]['supervisors'] = set()
+        for s in extra:
+            freed.append(s)
+            must_assign.append(False)
+            origin.append(None)
+
+        assignment = None
+        try:
+            model, x = build_neighbourhood_model(Schedule, timeslots, sessions, freed, must_assign,
+                                                 pref, C, D, H, M, R, env)
+            for (i, j), var in x.items():
+                var.Start = 1 if origin[j] == i else 0
+            model.Params.TimeLimit = max(0.1, min(iteration_time, time_limit - (time.time() - start_time)))
+            model.optimize()
+            if model.SolCount > 0:
+                assignment = {j: i for (i, j), var in x.items() if var.X > 0.5}
+            model.dispose()
+        except gp.GurobiError as e:
+            # mis. lisensi terbatas ukuran: lingkungan ini dilewati
+            if stream is not None:
+                print(f"[LNS] {kind}: {e}", file=stream)
+
+        if assignment is None or any(must_assign[j] and j not in assignment for j in range(len(freed))):
+            assignment = {j: origin[j] for j in range(len(freed)) if origin[j] is not None}
+
+        for j, i in sorted(assignment.items()):
+            Schedule[i]['students'].append(freed[j])
+            Schedule[i]['supervisors'].add(freed[j]['PB'])
+
+        candidate = (len(stu_df) - len(unassigned) + sum(1 for j in assignment if not must_assign[j]),
+                     total_objective(Schedule, timeslots, H, M))
+        if candidate < best:
+            # tidak lebih baik (mis. time limit sebelum solusi awal diterima): kembalikan
+            for i in sessions:
+                Schedule[i]['students'] = previous[i]
+                Schedule[i]['supervisors'] = {st['PB'] for st in previous[i]}
+            continue
+
+        placed = {id(freed[j]) for j in assignment if not must_assign[j]}
+        unassigned = [s for s in unassigned if id(s) not in placed]
+        if candidate > best:
+            stats["improvements"] += 1
+            stats["history"].append({
+                "iteration": stats["iterations"],
+                "neighbourhood": kind,
+                "assigned": candidate[0],
+                "objective": candidate[1],
+                "time": time.time() - start_time,
+            })
+            if stream is not None:
+                print(f"[LNS] iter {stats['iterations']} {kind}: objective {candidate[1]}, "
+                      f"assigned {candidate[0]}", file=stream)
+            if report is not None:
+                report_incumbent(report, Schedule, timeslots, stu_df, pref, D, M, R)
+        best = candidate
+
+    env.dispose()
+
+    unassigned = [unassigned_record(s, pref) for s in unassigned]
+    diagnostics = explain_unassigned(unassigned, timeslots, pref, C, Schedule, M)
+    additional_supervisors(Schedule, timeslots, stu_df, pref, D, M, R)
+
+    state.update({
+        "Schedule": Schedule,
+        "unassigned": unassigned,
+        "execution_time": time.time() - start_time,
+        "diagnostics": diagnostics,
+        "lns": dict(stats, objective_start=objective_start, objective=best[1], time_limit=time_limit),
+    })
+    return state
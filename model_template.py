@@ -0,0 +1,183 @@
+"""
+Template model Gurobi yang dipakai ulang lintas ukuran sampel dan config.
+
+Model guroby.build_model dibangun sekali untuk instance terbesar (mahasiswa,
+dosen, dan H terbanyak). Instance lain yang merupakan prefix-nya -- sampel
+/api/compare, `limit` yang lebih kecil, C / D / H berbeda -- cukup diterapkan
+di tempat: variabel mahasiswa, dosen, dan slot di luar instance di-fix ke 0,
+RHS student_assignment dinolkan, koefisien C dan D diubah, dan konstanta
+obj3 disesuaikan. Hanya bagian yang berubah dari solve sebelumnya yang
+disentuh. Struktur bisa disimpan sebagai .mps di .cache/models supaya proses
+berikutnya tidak perlu membangun ulang. M dan R mengubah struktur slot,
+jadi template baru diperlukan.
+"""
+import json
+import os
+import time
+
+import gurobipy as gp
+import numpy as np
+from gurobipy import GRB
+
+from cache import _digest, pref_hash, students_hash
+
+MODEL_DIR = os.path.join(".cache", "models")
+
+
+def template_key(students, time_pref, H, M, R, ALPHA, BETA, GAMMA):
+    weights = json.dumps([H, M, R, ALPHA, BETA, GAMMA]).encode("utf-8")
+    return _digest(b"|".join([students_hash(students).encode("utf-8"),
+                              pref_hash(time_pref).encode("utf-8"), weights]))
+
+
+def _index(model, n, m, d, H):
+    """Array variabel (format v dari build_model) dan constraint yang diubah, lewat nama."""
+    x = np.empty((m, n), dtype=object)
+    y = np.empty((m, d), dtype=object)
+    s = np.empty(m, dtype=object)
+    z = np.empty(H, dtype=object)
+    arrays = {"x": x, "y": y, "s": s, "z": z}
+    for var in model.getVars():
+        kind, *idx = var.VarName.split("_")
+        arrays[kind][tuple(int(k) for k in idx)] = var
+
+    constrs = {"assign": [None] * n, "sup_capacity": {}, "capacity": [None] * m, "day": [None] * H}
+    for c in model.getConstrs():
+        name = c.ConstrName
+        if name.startswith("student_assignment_"):
+            constrs["assign"][int(name.rsplit("_", 1)[1])] = c
+        elif name.startswith("sup_capacity_"):
+            i, a = name[len("sup_capacity_"):].split("_")
+            constrs["sup_capacity"][(int(i), int(a))] = c
+        elif name.startswith("timeslot_capacity_"):
+            constrs["capacity"][int(name.rsplit("_", 1)[1])] = c
+        elif name.startswith("min_supervisors_day_"):
+            constrs["day"][int(name.rsplit("_", 1)[1])] = c
+    return arrays, constrs
+
+
+class ModelTemplate:
+    def __init__(self, model, students, time_pref, timeslots, C, D, H, M, R, GAMMA=1):
+        self.model = model
+        self.students = students
+        self.time_pref = time_pref
+        self.timeslots = timeslots
+        self.H, self.M, self.R = H, M, R
+        self.GAMMA = GAMMA
+        model.update()
+        self.v, self.constrs = _index(model, len(students), len(timeslots), len(time_pref), H)
+        self.slot_of = np.array([ts['slot'] for ts in timeslots], dtype=int)
+        # instance yang sedang aktif di model (awal: instance terbesar)
+        self.current = {"n": len(students), "d": len(time_pref), "C": C, "D": D, "H": H}
+
+    @classmethod
+    def build(cls, students, time_pref, C=5, D=3, H=9, M=7, R=3, ALPHA=0.0, BETA=1, GAMMA=1):
+        from guroby import build_model, generate_timeslots
+
+        timeslots = generate_timeslots(H, M, R)
+        model, _ = build_model(students, time_pref, timeslots, C, D, H, M, ALPHA, BETA, GAMMA)
+        return cls(model, students, time_pref, timeslots, C, D, H, M, R, GAMMA)
+
+    @classmethod
+    def cached(cls, students, time_pref, C=5, D=3, H=9, M=7, R=3, ALPHA=0.0, BETA=1, GAMMA=1,
+               directory=MODEL_DIR):
+        """Baca template dari .mps bila ada, kalau tidak bangun lalu simpan."""
+        from guroby import generate_timeslots
+
+        key = template_key(students, time_pref, H, M, R, ALPHA, BETA, GAMMA)
+        path = os.path.join(directory, f"{key}.mps")
+        meta_path = os.path.join(directory, f"{key}.json")
+        if os.path.exists(path) and os.path.exists(meta_path):
+            try:
+                with open(meta_path, "r") as f:
+                    meta = json.load(f)
+                model = gp.read(path)
+                model.setParam('Threads', 10)
+                print(f"Template model dibaca dari {path}")
+                return cls(model, students, time_pref, generate_timeslots(H, M, R),
+                           meta["C"], meta["D"], H, M, R, GAMMA)
+            except (OSError, ValueError, KeyError, gp.GurobiError):
+                pass
+
+        template = cls.build(students, time_pref, C, D, H, M, R, ALPHA, BETA, GAMMA)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            template.model.write(path)
+            with open(meta_path, "w") as f:
+                json.dump({"C": C, "D": D}, f)
+        except (OSError, gp.GurobiError):
+            pass
+        return template
+
+    def configure(self, n=None, d=None, C=None, D=None, H=None):
+        """
+        Jadikan model sama dengan instance n mahasiswa pertama, d dosen pertama,
+        dan H hari pertama (default: semuanya), dengan kapasitas C dan panel D.
+        """
+        new = dict(self.current)
+        for k, val in (("n", n), ("d", d), ("C", C), ("D", D), ("H", H)):
+            if val is not None:
+                new[k] = val
+        if not (0 <= new["n"] <= len(self.students) and 0 <= new["d"] <= len(self.time_pref)
+                and 0 < new["H"] <= self.H):
+            raise ValueError(f"instance di luar template: {new}")
+        old = self.current
+        x, y, s, z = self.v["x"], self.v["y"], self.v["s"], self.v["z"]
+
+        def active_slots(h):
+            return self.slot_of < h * self.M
+
+        def update_bounds(var, old_mask, new_mask):
+            changed = old_mask != new_mask
+            if changed.any():
+                self.model.setAttr("UB", list(var[changed]), new_mask[changed].astype(float).tolist())
+
+        slots_old, slots_new = active_slots(old["H"]), active_slots(new["H"])
+        stu_old = np.arange(x.shape[1]) < old["n"]
+        stu_new = np.arange(x.shape[1]) < new["n"]
+        sup_old = np.arange(y.shape[1]) < old["d"]
+        sup_new = np.arange(y.shape[1]) < new["d"]
+        update_bounds(x, np.outer(slots_old, stu_old), np.outer(slots_new, stu_new))
+        update_bounds(y, np.outer(slots_old, sup_old), np.outer(slots_new, sup_new))
+        update_bounds(s, slots_old, slots_new)
+        update_bounds(z, np.arange(self.H) < old["H"], np.arange(self.H) < new["H"])
+
+        # mahasiswa di luar instance tidak wajib dijadwalkan
+        changed = np.flatnonzero(stu_old != stu_new)
+        if len(changed):
+            self.model.setAttr("RHS", [self.constrs["assign"][j] for j in changed],
+                               stu_new[changed].astype(float).tolist())
+
+        if new["C"] != old["C"]:
+            for (i, a), c in self.constrs["sup_capacity"].items():
+                self.model.chgCoeff(c, y[i][a], -new["C"])
+            for i, c in enumerate(self.constrs["capacity"]):
+                self.model.chgCoeff(c, s[i], -new["C"])
+        if new["D"] != old["D"]:
+            for l, c in enumerate(self.constrs["day"]):
+                if c is not None:
+                    self.model.chgCoeff(c, z[l], -new["D"])
+
+        # obj3 = (jumlah timeslot instance) - sum s
+        self.model.ObjCon = self.GAMMA * new["H"] * self.M * self.R
+        self.current = new
+
+    def solve(self, n=None, d=None, C=None, D=None, H=None, callback=None):
+        """configure + optimize. Return hasil dengan format guroby.solution_result."""
+        from guroby import failed_result, solution_result
+
+        self.configure(n, d, C, D, H)
+        n = self.current["n"]
+        students = self.students[:n]
+        timeslots = self.timeslots[:self.current["H"] * self.M * self.R]
+        start_time = time.time()
+        if callback is not None:
+            self.model.optimize(callback)
+        else:
+            self.model.optimize()
+        execution_time = time.time() - start_time
+        if self.model.SolCount > 0:
+            return solution_result(self.model, self.v, students, timeslots, self.M, execution_time)
+        if self.model.status == GRB.INFEASIBLE:
+            return failed_result(n, "infeasible", execution_time)
+        return failed_result(n, "unknown")
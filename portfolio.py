@@ -0,0 +1,244 @@
+"""
+Portfolio solver: beberapa engine berjalan bersamaan sampai satu deadline.
+
+Tiap engine berjalan di proses sendiri:
+
+- greedy / bestfit / dynamic: greedy deterministik (placement config lebih dulu)
+- random-k: greedy berulang dengan urutan dosen diacak (npref x noise) dan
+  placement bergantian, hasil terbaik per seed
+- colgen (scipy, heuristic price-and-branch) dan lns (gurobipy): perbaikan
+  hasil greedy (warm start), dengan batas waktu sedikit di bawah deadline
+- gurobi (gurobipy, hanya bila jumlah mahasiswa <= guroby.LIMIT_STU): model
+  eksak guroby.py dengan warm start dari greedy. Model itu memakai panel D per
+  hari, jadi tiap incumbent dilengkapi panelnya (additional_supervisors) dan
+  hanya dikirim bila lolos validate.py (panel D per sesi)
+
+Setiap kali engine punya hasil lebih baik (colgen / lns juga di tengah jalan:
+hasil greedy awal lalu tiap perbaikan), hanya Schedule, timeslots, dan skornya
+yang dikirim ke proses utama; mahasiswa tidak terjadwal, urutan mahasiswa, dan
+diagnostik dibangun ulang di proses utama untuk pemenang saja. Saat deadline
+(atau semua engine selesai) proses yang masih berjalan dihentikan dan hasil
+terbaik dipakai: mahasiswa terjadwal terbanyak, lalu objective greedy
+(obj2 + obj3). Engine pemenang dan ringkasan tiap engine masuk ke kolom
+"portfolio" dan dicatat di .cache/portfolio.jsonl.
+
+    python greedy.py --portfolio 30
+"""
+import contextlib
+import importlib.util
+import json
+import multiprocessing
+import os
+import queue
+import random
+import sys
+import time
+
+from greedy import (
+    compute_greedy_objectives,
+    compute_npref,
+    records,
+    run_greedy,
+    safe_get,
+    sort_with_type,
+    unassigned_record,
+)
+
+PLACEMENTS = ["firstfit", "bestfit", "dynamic"]
+LOG_PATH = os.path.join(".cache", "portfolio.jsonl")
+# bagian deadline yang diberikan ke engine; sisanya untuk kirim hasil
+ENGINE_SHARE = 0.85
+
+
+def score(Schedule, timeslots, H, M):
+    """(jumlah terjadwal, objective) -- makin besar makin baik."""
+    objectives = compute_greedy_objectives(Schedule, timeslots, H, M)
+    assigned = sum(len(info['students']) for info in Schedule.values())
+    return (assigned, objectives["obj2_same_type_pairs"] + objectives["obj3_min_used_timeslots"])
+
+
+def engines(placement="firstfit", n_random=None, n_students=None):
+    """
+    Daftar (nama, seed) engine yang dijalankan; colgen / lns / gurobi hanya bila
+    library-nya ada, gurobi hanya untuk instance kecil (n_students <= LIMIT_STU).
+    """
+    names = [placement] + [p for p in PLACEMENTS if p != placement]
+    if importlib.util.find_spec("scipy") is not None:
+        names.append("colgen")
+    if importlib.util.find_spec("gurobipy") is not None:
+        from guroby import LIMIT_STU
+        names.append("lns")
+        if n_students is not None and n_students <= LIMIT_STU:
+            names.append("gurobi")
+    if n_random is None:
+        n_random = max(1, (os.cpu_count() or 1) - len(names))
+    return [(name, 0) for name in names] + [(f"random-{k}", k) for k in range(n_random)]
+
+
+def _engine(name, seed, results, stu_df, pref, params, time_limit):
+    """
+    Isi proses engine: kirim ("result", nama, skor, Schedule, timeslots) tiap ada
+    perbaikan, lalu ("done", nama, error).
+    """
+    C, D, H, M, R = params["C"], params["D"], params["H"], params["M"], params["R"]
+    error = None
+
+    def send(Schedule, timeslots):
+        results.put(("result", name, score(Schedule, timeslots, H, M), Schedule, timeslots))
+
+    # log engine ke stderr supaya stdout proses utama tetap JSON
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            if name == "colgen":
+                from colgen import run_colgen
+                run_colgen(stu_df, pref, C, D, H, M, R, params["placement"], time_limit=time_limit, report=send)
+            elif name == "lns":
+                from lns import run_lns
+                run_lns(stu_df, pref, C, D, H, M, R, params["placement"], time_limit=time_limit, report=send)
+            elif name == "gurobi":
+                _exact_engine(stu_df, pref, params, time_limit, send)
+            elif name.startswith("random-"):
+                rng = random.Random(seed)
+                npref = compute_npref(pref)
+                deadline = time.time() + time_limit
+                best = None
+                k = 0
+                while time.time() < deadline:
+                    noisy = [v * rng.uniform(0.7, 1.3) for v in npref]
+                    state = run_greedy(stu_df, pref, C, D, H, M, R, PLACEMENTS[k % len(PLACEMENTS)], npref=noisy)
+                    k += 1
+                    key = score(state["Schedule"], state["timeslots"], H, M)
+                    if best is None or key > best:
+                        best = key
+                        send(state["Schedule"], state["timeslots"])
+            else:
+                state = run_greedy(stu_df, pref, C, D, H, M, R, name)
+                send(state["Schedule"], state["timeslots"])
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+    results.put(("done", name, error))
+
+
+def _exact_engine(stu_df, pref, params, time_limit, send):
+    """Greedy (dikirim lebih dulu) sebagai warm start model penuh guroby.py."""
+    from greedy import additional_supervisors, empty_schedule
+    from guroby import solve_warm_start
+    from validate import validate_state
+
+    C, D, H, M, R = params["C"], params["D"], params["H"], params["M"], params["R"]
+    state = run_greedy(stu_df, pref, C, D, H, M, R, params["placement"])
+    timeslots = state["timeslots"]
+    send(state["Schedule"], timeslots)
+
+    students = records(stu_df)
+    position = {s["stuID"]: j for j, s in enumerate(students)}
+    start = {position[s["stuID"]]: i for i, info in state["Schedule"].items() for s in info['students']}
+
+    def found(assignment):
+        Schedule = empty_schedule(timeslots)
+        for j, i in sorted(assignment.items()):
+            Schedule[i]['students'].append(students[j])
+            Schedule[i]['supervisors'].add(students[j]['PB'])
+        additional_supervisors(Schedule, timeslots, stu_df, pref, D, M, R)
+        if validate_state({"Schedule": Schedule}, students, pref, C, D, H, M, R)["valid"]:
+            send(Schedule, timeslots)
+
+    solve_warm_start(students, pref, start, C, D, H, M, R, time_limit, on_solution=found)
+
+
+def rebuild_state(Schedule, timeslots, stu_df, pref, C, M):
+    """State seperti run_greedy dari Schedule kiriman engine (tanpa execution_time)."""
+    import pandas as pd
+    from diagnostics import explain_unassigned
+
+    sorted_students_df = pd.DataFrame(sort_with_type(stu_df, compute_npref(pref)))
+    placed = [s for info in Schedule.values() for s in info['students']]
+    placed_ids = {s["stuID"] for s in placed}
+    # NIM dobel dilewati greedy (bukan tidak terjadwal); NIM kosong tidak dilacak
+    placed_nims = {safe_get(s, ["NIM"]) for s in placed} - {""}
+    unassigned = [unassigned_record(s, pref) for s in records(sorted_students_df)
+                  if s["stuID"] not in placed_ids and safe_get(s, ["NIM"]) not in placed_nims]
+    diagnostics = explain_unassigned(unassigned, timeslots, pref, C, Schedule, M)
+    return {
+        "Schedule": Schedule,
+        "timeslots": timeslots,
+        "unassigned": unassigned,
+        "sorted_students_df": sorted_students_df,
+        "diagnostics": diagnostics,
+    }
+
+
+def run_portfolio(stu_df, pref, C=5, D=3, H=9, M=7, R=3, placement="firstfit", deadline=30.0,
+                  n_random=None, stream=None):
+    """Return state engine terbaik seperti run_greedy (+ "portfolio")."""
+    start_time = time.time()
+    params = {"C": C, "D": D, "H": H, "M": M, "R": R, "placement": placement}
+    time_limit = max(0.1, ENGINE_SHARE * deadline)
+    results = multiprocessing.Queue()
+    processes = {}
+    for name, seed in engines(placement, n_random, len(stu_df)):
+        proc = multiprocessing.Process(target=_engine, args=(name, seed, results, stu_df, pref, params, time_limit),
+                                       daemon=True)
+        proc.start()
+        processes[name] = proc
+
+    summary = {name: {"assigned": None, "objective": None, "time": None, "finished": False}
+               for name in processes}
+    best_key = best_name = best = None
+    running = set(processes)
+    end = start_time + deadline
+    while running:
+        remaining = end - time.time()
+        if remaining <= 0:
+            break
+        try:
+            message = results.get(timeout=remaining)
+        except queue.Empty:
+            break
+        if message[0] == "done":
+            _, name, error = message
+            running.discard(name)
+            summary[name]["finished"] = True
+            if error:
+                summary[name]["error"] = error
+            continue
+        _, name, key, Schedule, timeslots = message
+        summary[name].update(assigned=key[0], objective=key[1], time=round(time.time() - start_time, 3))
+        if stream is not None:
+            print(f"[PORTFOLIO] {name}: assigned {key[0]}, objective {key[1]}", file=stream)
+        if best_key is None or key > best_key:
+            best_key, best_name, best = key, name, (Schedule, timeslots)
+
+    for proc in processes.values():
+        if proc.is_alive():
+            proc.terminate()
+        proc.join()
+
+    if best is None:
+        # tidak ada engine yang selesai sebelum deadline: greedy biasa
+        best_name = "greedy-fallback"
+        best_state = run_greedy(stu_df, pref, C, D, H, M, R, placement)
+    else:
+        best_state = rebuild_state(best[0], best[1], stu_df, pref, C, M)
+
+    stats = {
+        "winner": best_name,
+        "deadline": deadline,
+        "engines": summary,
+        "time": time.time() - start_time,
+    }
+    best_state["execution_time"] = stats["time"]
+    best_state["portfolio"] = stats
+    log_run(stats, len(stu_df), params)
+    return best_state
+
+
+def log_run(stats, n, params, path=LOG_PATH):
+    """Satu baris JSON per run (pemenang & hasil tiap engine) untuk tuning portfolio."""
+    record = dict(stats, n=n, config=params, timestamp=time.time())
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "a") as f:
+            f.write(json.dumps(record) + "\n")
+    except OSError:
+        pass
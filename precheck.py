@@ -0,0 +1,149 @@
+"""
+Cek kelayakan cepat sebelum menjalankan solver.
+
+Semua cek adalah syarat perlu (necessary conditions) yang dihitung dengan
+numpy dalam hitungan milidetik, tanpa membangun model MIP. Jika salah satu
+error terpenuhi, model Gurobi pasti infeasible (setiap mahasiswa wajib
+terjadwal), dan greedy pasti menyisakan mahasiswa tidak terjadwal.
+
+    python precheck.py [limit]
+"""
+import argparse
+import json
+import time
+
+import numpy as np
+
+
+def availability(pref, H, M):
+    """Matriks bool (dosen x H*M); kolom di luar file preferensi = tidak tersedia."""
+    pref = np.asarray(pref, dtype=float)
+    avail = np.zeros((pref.shape[0] if pref.ndim == 2 else 0, H * M), dtype=bool)
+    if avail.shape[0]:
+        width = min(pref.shape[1], H * M)
+        avail[:, :width] = pref[:, :width] == 1
+    return avail
+
+
+def feasibility_report(pb, pref, C, D, H, M, R, lecturers=None):
+    """
+    pb: PB tiap mahasiswa yang akan dijadwalkan; pref: matriks preferensi (baris = PB).
+    Return dict: feasible, errors, warnings, stats, time.
+    """
+    start = time.time()
+    pb = np.asarray(pb, dtype=np.int64)
+    avail = availability(pref, H, M)
+    d = max(avail.shape[0], int(pb.max()) + 1 if len(pb) else 0)
+    if avail.shape[0] < d:
+        avail = np.vstack([avail, np.zeros((d - avail.shape[0], H * M), dtype=bool)])
+
+    def name(a):
+        if lecturers is not None and a < len(lecturers):
+            return str(lecturers[a])
+        return f"PB-{a}"
+
+    errors = []
+    warnings = []
+    n = len(pb)
+
+    # 1. tiap dosen: jumlah mahasiswa <= slot tersedia x C
+    #    (dosen hanya bisa di satu ruangan per slot global)
+    nstu = np.bincount(pb, minlength=d)
+    avail_slots = avail.sum(axis=1)
+    for a in np.flatnonzero(nstu > avail_slots * C):
+        errors.append({
+            "code": "lecturer_capacity",
+            "PB": int(a),
+            "lecturer": name(a),
+            "students": int(nstu[a]),
+            "available_slots": int(avail_slots[a]),
+            "capacity": int(avail_slots[a] * C),
+            "message": f"{name(a)}: {nstu[a]} mahasiswa, hanya {avail_slots[a]} slot tersedia x C={C}",
+        })
+
+    # 2. total kebutuhan vs H*M*R*C
+    total_capacity = H * M * R * C
+    if n > total_capacity:
+        errors.append({
+            "code": "total_capacity",
+            "students": n,
+            "capacity": total_capacity,
+            "message": f"{n} mahasiswa melebihi kapasitas total H*M*R*C = {total_capacity}",
+        })
+
+    # 3. kapasitas sesi paralel per slot global: tiap sesi butuh pembimbing
+    #    mahasiswanya, jadi sesi di slot t <= min(R, dosen pembimbing yang tersedia di t)
+    supervising = nstu > 0
+    lecturers_per_slot = avail[supervising].sum(axis=0)
+    sessions_per_slot = np.minimum(R, lecturers_per_slot)
+    parallel_capacity = int(sessions_per_slot.sum()) * C
+    if n > parallel_capacity:
+        errors.append({
+            "code": "parallel_capacity",
+            "students": n,
+            "capacity": parallel_capacity,
+            "message": f"{n} mahasiswa melebihi kapasitas sesi paralel ({parallel_capacity})",
+        })
+
+    # 4. panel D dosen: hari / slot dengan dosen tersedia < D
+    all_per_slot = avail.sum(axis=0)
+    per_day = avail.reshape(avail.shape[0], H, M).any(axis=2).sum(axis=0)
+    short_days = np.flatnonzero(per_day < D)
+    if len(short_days):
+        warnings.append({
+            "code": "day_panel",
+            "days": [int(l) + 1 for l in short_days],
+            "message": f"Hari dengan kurang dari D={D} dosen tersedia: "
+                       + ", ".join(str(int(l) + 1) for l in short_days),
+        })
+    short_slots = int((all_per_slot < D).sum())
+    if short_slots:
+        warnings.append({
+            "code": "slot_panel",
+            "slots": short_slots,
+            "message": f"{short_slots} dari {H * M} slot tidak bisa mendapat panel {D} dosen",
+        })
+
+    return {
+        "feasible": not errors,
+        "errors": errors,
+        "warnings": warnings,
+        "stats": {
+            "students": n,
+            "lecturers": int(supervising.sum()),
+            "total_capacity": total_capacity,
+            "parallel_capacity": parallel_capacity,
+        },
+        "time": time.time() - start,
+    }
+
+
+def format_report(report):
+    lines = []
+    for item in report["errors"]:
+        lines.append(f"[PRECHECK][ERROR] {item['message']}")
+    for item in report["warnings"]:
+        lines.append(f"[PRECHECK][WARN] {item['message']}")
+    return "\n".join(lines)
+
+
+def main():
+    from greedy import load_config
+    from jobs import add_job_arguments, resolve_job
+    from preprocess import prepare
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('limit', nargs='?', type=int, default=None, help='Limit number of students to process')
+    add_job_arguments(parser)
+    args = parser.parse_args()
+    job = resolve_job(args)
+
+    config = load_config(job["config_path"], job["config"])
+    data = prepare(job["students"], job["pref"], args.limit)
+    report = feasibility_report(data["pb"], data["pref_arr"], config["C"], config["D"],
+                                config["H"], config["M"], config["R"], data["lecturers"])
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Preprocessing bersama untuk greedy.py dan guroby.py.
+
+Kedua engine membaca file mahasiswa dan preferensi dosen lewat modul ini,
+sehingga encoding PB / Type dan urutan baris preferensi selalu identik.
+Semua langkah vektor (ffill, factorize, reindex, lexsort), linear terhadap
+jumlah mahasiswa.
+"""
+import sys
+
+import numpy as np
+import pandas as pd
+
+from core import mbkm_map
+
+
+def encode_students(stu_df, limit=None):
+    """Dedup NIM, limit, stuID, lalu encoding PEMBIMBING -> PB dan MBKM -> Type."""
+    # Remove duplicate students based on NIM to ensure unique students
+    initial_count = len(stu_df)
+    stu_df = stu_df.drop_duplicates(subset=['NIM'], keep='first')
+    removed_duplicates = initial_count - len(stu_df)
+    if removed_duplicates > 0:
+        print(f"[INFO] Removed {removed_duplicates} duplicate student(s) based on NIM", file=sys.stderr)
+        print(f"[INFO] Unique students: {len(stu_df)}", file=sys.stderr)
+
+    # Limit students if specified
+    if limit is not None:
+        stu_df = stu_df.head(limit)
+
+    # NIM -> stuID (index 0...)
+    stu_df = stu_df.reset_index(drop=True)
+    stu_df["stuID"] = stu_df.index
+
+    # sel PEMBIMBING kosong = dosen yang sama dengan baris di atasnya (merged cell di Excel)
+    stu_df["PEMBIMBING"] = stu_df["PEMBIMBING"].ffill()
+
+    # mapping pembimbing -> angka unik sesuai urutan kemunculan (encoding)
+    codes, _ = pd.factorize(stu_df["PEMBIMBING"])
+    stu_df["PB"] = np.where(codes < 0, 0, codes).astype(int)
+
+    # MBKM -> Type (mapping 0-5), tidak dikenal = -1
+    stu_df["Type"] = stu_df["MBKM"].map(mbkm_map).fillna(-1).astype(int)
+    return stu_df
+
+
+def load_students(path="uploads/stu.xlsx", limit=None):
+    return encode_students(pd.read_excel(path), limit)
+
+
+def lecturer_names(stu_df):
+    """Nama dosen per PB (index list = PB)."""
+    first = stu_df.drop_duplicates("PB").sort_values("PB")
+    return first["PEMBIMBING"].tolist()
+
+
+def align_pref(pref_df, stu_df):
+    """
+    Baris preferensi (kolom 0 = nama dosen) disusun ulang supaya baris ke-a
+    adalah dosen dengan PB a. Dosen tanpa baris preferensi dianggap tidak
+    pernah tersedia; baris untuk dosen yang tidak membimbing siapa pun dibuang.
+    Return: np.ndarray int (jumlah dosen x jumlah slot)
+    """
+    n_pb = int(stu_df["PB"].max()) + 1 if len(stu_df) else 0
+    first_col = pref_df.iloc[:, 0]
+    if pd.api.types.is_numeric_dtype(first_col):
+        # tanpa kolom nama: diasumsikan sudah urut PB; dosen tanpa baris = tidak tersedia
+        values = pref_df.to_numpy()[:n_pb].astype(int)
+        if len(values) < n_pb:
+            values = np.vstack([values, np.zeros((n_pb - len(values), values.shape[1]), dtype=int)])
+        return values
+
+    names = first_col.astype(str).str.strip().str.lstrip("\ufeff")
+    values = pref_df.iloc[:, 1:].apply(pd.to_numeric, errors="coerce").fillna(0).astype(int)
+    values.index = names
+    values = values[~values.index.duplicated(keep="first")]
+    pb_names = [str(n).strip() for n in lecturer_names(stu_df)]
+    return values.reindex(pb_names, fill_value=0).to_numpy()
+
+
+def load_pref(stu_df, path="uploads/pref.csv"):
+    """Baca CSV preferensi dan kembalikan list of lists (baris = PB)."""
+    return align_pref(pd.read_csv(path, header=None), stu_df).tolist()
+
+
+def student_order(stu_df, npref):
+    """
+    Urutan penjadwalan: dosen berdasarkan (npref, nstu, PB), lalu Type, lalu stuID.
+    Satu lexsort stabil, menggantikan filter per dosen di sort_with_type.
+    """
+    pb = stu_df["PB"].to_numpy()
+    npref = np.asarray(npref)
+    nstu = np.bincount(pb, minlength=len(npref))
+    npref_pb = npref[pb] if len(npref) else np.zeros(len(pb), dtype=int)
+    return np.lexsort((
+        stu_df["stuID"].to_numpy(),
+        stu_df["Type"].to_numpy(),
+        pb,
+        nstu[pb],
+        npref_pb,
+    ))
+
+
+def prepare(stu_path="uploads/stu.xlsx", pref_path="uploads/pref.csv", limit=None):
+    """Siapkan semua array yang dipakai engine greedy maupun Gurobi."""
+    stu_df = load_students(stu_path, limit)
+    pref_arr = align_pref(pd.read_csv(pref_path, header=None), stu_df)
+    npref = pref_arr.sum(axis=1)
+    order = student_order(stu_df, npref)
+    return {
+        "stu_df": stu_df,
+        "pref": pref_arr.tolist(),
+        "pref_arr": pref_arr,
+        "pb": stu_df["PB"].to_numpy(),
+        "type": stu_df["Type"].to_numpy(),
+        "lecturers": lecturer_names(stu_df),
+        "npref": npref,
+        "order": order,
+    }
@@ -0,0 +1,203 @@
+"""
+Penjadwalan ulang inkremental dari hasil sebelumnya.
+
+Jadwal lama (kolom `table` dari output greedy.py) dibaca kembali, lalu hanya
+mahasiswa yang terdampak perubahan input yang dilepas dan dijadwalkan ulang:
+mahasiswa baru, yang pembimbingnya berganti, yang slotnya tidak lagi cocok
+dengan preferensi dosen, dan yang sebelumnya tidak terjadwal. Mahasiswa lain
+tetap di slot & ruangan yang sama.
+"""
+import re
+import time
+
+from availability import AvailabilityIndex
+from greedy import (
+    additional_supervisors,
+    compute_npref,
+    empty_schedule,
+    generate_timeslots,
+    safe_get,
+    slot_map,
+    sort_with_type,
+    supervisor_available,
+    unassigned_record,
+)
+
+slot_label_to_idx = {label: idx for idx, label in slot_map.items()}
+
+
+def parse_table_position(row, M=7, R=3, H=9):
+    """(Hari, Slot, Ruangan) pada tabel hasil -> index timeslot, None kalau tidak valid."""
+    day = re.search(r'Hari ke-(\d+)', str(row.get("Hari", "")))
+    room = re.search(r'R(\d+)', str(row.get("Ruangan", "")))
+    slot_label = str(row.get("Slot", ""))
+    if slot_label in slot_label_to_idx:
+        slot_in_day = slot_label_to_idx[slot_label]
+    else:
+        match = re.search(r'Slot (\d+)', slot_label)
+        slot_in_day = int(match.group(1)) - 1 if match else None
+    if not day or not room or slot_in_day is None:
+        return None
+
+    day_idx = int(day.group(1)) - 1
+    room_idx = int(room.group(1)) - 1
+    if not (0 <= day_idx < H and 0 <= slot_in_day < M and 0 <= room_idx < R):
+        return None
+    # urutan generate_timeslots: slot global dulu, lalu ruangan
+    return (day_idx * M + slot_in_day) * R + room_idx
+
+
+def load_previous_assignment(previous, M=7, R=3, H=9):
+    """
+    Baca jadwal lama.
+    Return: ({NIM: (timeslot, pembimbing)}, {timeslot: [nama dosen hadir]})
+    """
+    placed = {}
+    panels = {}
+    for row in previous.get("table", []):
+        nim = str(row.get("NIM", "-"))
+        if nim == "-":
+            continue
+        i = parse_table_position(row, M, R, H)
+        if i is None:
+            continue
+        placed[nim] = (i, row.get("Pembimbing"))
+        hadir = row.get("Dosen yang Hadir", "-")
+        if hadir and hadir != "-":
+            panels.setdefault(i, hadir.split(";"))
+    return placed, panels
+
+
+def place_released(pending, Schedule, timeslots, index, busy, load, C, D=None, R=3):
+    """
+    First-fit seperti greedy_schedule, hanya untuk mahasiswa yang dilepas (sudah
+    diurutkan). Kandidat = timeslot tempat pembimbing tersedia (urutan
+    AvailabilityIndex.timeslot_order), konflik ruang paralel dicek lewat `busy`
+    dari penempatan yang dipertahankan, jadi jadwal lain tidak discan.
+    Return (mahasiswa tidak terjadwal, timeslot yang berubah).
+    """
+    unassigned = []
+    changed = set()
+    assigned_nims = set()
+    order_by_sup = {}
+    for s in pending:
+        pb = s["PB"]
+        nim = safe_get(s, ["NIM"])
+        if nim in assigned_nims:
+            continue
+        if pb not in order_by_sup:
+            order_by_sup[pb] = index.timeslot_order(pb, D, R)
+        for i in order_by_sup[pb]:
+            slot = timeslots[i]['slot']
+            if len(Schedule[i]['students']) >= C or busy.get((slot, pb), i) != i:
+                continue
+            Schedule[i]['students'].append(s)
+            if pb not in Schedule[i]['supervisors']:
+                Schedule[i]['supervisors'].add(pb)
+                load[pb] = load.get(pb, 0) + 1
+            busy[(slot, pb)] = i
+            changed.add(i)
+            assigned_nims.add(nim)
+            break
+        else:
+            unassigned.append(s)
+    return unassigned, changed
+
+
+def repair_schedule(previous, stu_df, pref, C=5, D=3, H=9, M=7, R=3):
+    """
+    Pertahankan penempatan lama yang masih feasible, jadwalkan ulang sisanya
+    (first-fit, lihat place_released). Hanya mahasiswa yang dilepas yang
+    diurutkan dan dicarikan slot, dan panel dosen hanya dilengkapi ulang untuk
+    sesi yang berubah.
+    Return state dengan format yang sama seperti run_greedy.
+    """
+    import pandas as pd
+    from diagnostics import explain_unassigned
+
+    timeslots = generate_timeslots(H, M, R)
+    Schedule = empty_schedule(timeslots)
+    placed, panels = load_previous_assignment(previous, M, R, H)
+    name_to_pb = stu_df.drop_duplicates("PEMBIMBING").set_index("PEMBIMBING")["PB"].to_dict()
+    students = stu_df.to_dict(orient="records")
+
+    start_time = time.time()
+
+    # busy[(slot global, dosen)] = timeslot -> cek konflik ruang paralel O(1);
+    # load[dosen] = jumlah sesi yang dihadiri (untuk additional_supervisors)
+    busy = {}
+    load = {}
+    kept = 0
+    released = []
+    pending = []
+    for s in students:
+        nim = safe_get(s, ["NIM"])
+        if nim not in placed:
+            pending.append(s)
+            continue
+        i, prev_pemb = placed[nim]
+        pb = s["PB"]
+        slot = timeslots[i]['slot']
+        other = busy.get((slot, pb), i)
+        if (prev_pemb == s["PEMBIMBING"]
+                and len(Schedule[i]['students']) < C
+                and supervisor_available(pref, pb, slot, M, R)
+                and other == i):
+            Schedule[i]['students'].append(s)
+            if pb not in Schedule[i]['supervisors']:
+                Schedule[i]['supervisors'].add(pb)
+                load[pb] = load.get(pb, 0) + 1
+            busy[(slot, pb)] = i
+            kept += 1
+        else:
+            released.append(nim)
+            pending.append(s)
+
+    # Panel dosen lama dipertahankan selama dosennya masih tersedia;
+    # sesi yang kehilangan anggota panel ikut dilengkapi ulang
+    affected = set()
+    for i, names in panels.items():
+        if not Schedule[i]['students']:
+            continue
+        slot = timeslots[i]['slot']
+        for name in names:
+            pb = name_to_pb.get(name)
+            if pb is None or pb in Schedule[i]['supervisors'] or len(Schedule[i]['supervisors']) >= D:
+                continue
+            if supervisor_available(pref, pb, slot, M, R) and busy.get((slot, pb), i) == i:
+                Schedule[i]['supervisors'].add(pb)
+                busy[(slot, pb)] = i
+                load[pb] = load.get(pb, 0) + 1
+        if len(Schedule[i]['supervisors']) < min(D, len(set(names))):
+            affected.add(i)
+
+    # Sisanya (baru / berubah / dulu tidak terjadwal): hanya mahasiswa ini
+    # yang diurutkan dan ditempatkan terhadap okupansi yang dipertahankan
+    if pending:
+        pending = sort_with_type(pd.DataFrame(pending), compute_npref(pref))
+    index = AvailabilityIndex(pref, H, M)
+    unassigned, changed = place_released(pending, Schedule, timeslots, index, busy, load, C, D, R)
+    unassigned = [unassigned_record(s, pref) for s in unassigned]
+    affected |= changed
+    diagnostics = explain_unassigned(unassigned, timeslots, pref, C, Schedule, M)
+    additional_supervisors(Schedule, timeslots, students, pref, D, M, R, sessions=affected, load=load)
+
+    execution_time = time.time() - start_time
+
+    current_nims = set(safe_get(s, ["NIM"]) for s in students)
+    return {
+        "Schedule": Schedule,
+        "timeslots": timeslots,
+        "unassigned": unassigned,
+        # urutan kohort tidak dibangun ulang; output memakai urutan input
+        "sorted_students_df": stu_df,
+        "execution_time": execution_time,
+        "diagnostics": diagnostics,
+        "repair": {
+            "kept": kept,
+            "released": released,
+            "rescheduled": len(pending) - len(unassigned),
+            "removed": sorted(nim for nim in placed if nim not in current_nims),
+            "sessions_updated": len(affected),
+        },
+    }
@@ -40,6 +40,55 @@ const storage = multer.diskStorage({
 
 const upload = multer({ storage: storage });
 
+// ===== direktori job per request =====
+// Setiap run Python mendapat input (stu.xlsx, pref.csv, config.json) di
+// direktori sendiri, jadi beberapa request bisa berjalan paralel tanpa saling
+// menimpa. uploads/stu.xlsx & uploads/pref.csv hanya menyimpan upload terakhir
+// untuk request berikutnya yang tidak membawa file.
+const jobsDir = path.join(uploadDir, "jobs");
+
+function createJobDir() {
+    fs.mkdirSync(jobsDir, { recursive: true });
+    return fs.mkdtempSync(path.join(jobsDir, "job-"));
+}
+
+function removeJobDir(jobDir) {
+    if (jobDir) {
+        fs.rmSync(jobDir, { recursive: true, force: true });
+    }
+}
+
+// Upload /api/generate & /api/generate2 langsung ke direktori job request
+const jobStorage = multer.diskStorage({
+    destination: (req, file, cb) => {
+        if (!req.jobDir) {
+            req.jobDir = createJobDir();
+        }
+        cb(null, req.jobDir);
+    },
+    filename: (req, file, cb) => {
+        cb(null, `${file.fieldname}${path.extname(file.originalname)}`);
+    },
+});
+
+const jobUpload = multer({ storage: jobStorage });
+
+// Salin file upload terakhir (uploads/<name>) ke job bila ada
+function copyLatestUpload(name, jobDir) {
+    const src = path.join(uploadDir, name);
+    if (fs.existsSync(src)) {
+        fs.copyFileSync(src, path.join(jobDir, name));
+    }
+}
+
+// Simpan input job sebagai upload terakhir (tulis ke file sementara lalu
+// rename, supaya request lain tidak pernah membaca file setengah jadi)
+function publishLatestUpload(name, jobDir) {
+    const tmp = path.join(uploadDir, `.${name}.${process.pid}.${Date.now()}`);
+    fs.copyFileSync(path.join(jobDir, name), tmp);
+    fs.renameSync(tmp, path.join(uploadDir, name));
+}
+
 // ===== halaman utama =====
 // FIXME: sementara saja
 app.get("/", (req, res) => {
@@ -175,11 +224,12 @@ app.post(
 
 app.post(
     "/api/generate",
-    upload.fields([
+    jobUpload.fields([
         { name: "fileMahasiswa", maxCount: 1 },
         { name: "filePreferensi", maxCount: 1 },
     ]),
     async (req, res) => {
+        const jobDir = req.jobDir || createJobDir();
         try {
             const {
                 jumlahRuangan,
@@ -203,14 +253,17 @@ app.post(
                 BETA: 0.5,
                 GAMMA: 0.5,
             };
-            const configPath = path.join(process.cwd(), "config.json");
+            const configPath = path.join(jobDir, "config.json");
             fs.writeFileSync(configPath, JSON.stringify(config));
 
             // Save uploaded mahasiswa file if exists
             if (req.files.fileMahasiswa) {
-                const stuPath = path.join(uploadDir, "stu.xlsx");
+                const stuPath = path.join(jobDir, "stu.xlsx");
                 fs.renameSync(req.files.fileMahasiswa[0].path, stuPath);
+                publishLatestUpload("stu.xlsx", jobDir);
                 console.log("Mahasiswa file saved to:", stuPath);
+            } else {
+                copyLatestUpload("stu.xlsx", jobDir);
             }
 
             // Handle preferences: prioritize table data over uploaded file
@@ -258,8 +311,10 @@ app.post(
                     csvContent += row.join(",") + "\n";
                 }
 
-                const prefPath = path.join(uploadDir, "pref.csv");
+                const prefPath = path.join(jobDir, "pref.csv");
                 fs.writeFileSync(prefPath, csvContent);
+                // simpan juga sebagai preferensi terakhir untuk run berikutnya
+                publishLatestUpload("pref.csv", jobDir);
                 console.log("CSV saved to:", prefPath);
                 console.log(
                     "CSV content preview:",
@@ -267,15 +322,17 @@ app.post(
                 );
             } else if (req.files.filePreferensi) {
                 // Fall back to uploaded file if no table preferences
-                const prefPath = path.join(uploadDir, "pref.csv");
+                const prefPath = path.join(jobDir, "pref.csv");
                 fs.renameSync(req.files.filePreferensi[0].path, prefPath);
+                publishLatestUpload("pref.csv", jobDir);
                 console.log("Uploaded pref file saved to:", prefPath);
             } else {
+                copyLatestUpload("pref.csv", jobDir);
                 console.log("No preferences provided (neither table nor file)");
             }
 
             // Run Python script
-            const result = await runPythonScript();
+            const result = await runPythonScript(jobDir);
             if (result) {
                 // Add config to result for frontend use
                 result.config = config;
@@ -288,13 +345,15 @@ app.post(
         } catch (error) {
             console.error("Error in generate:", error);
             res.status(500).json({ error: "Gagal generate jadwal" });
+        } finally {
+            removeJobDir(jobDir);
         }
     }
 );
 
 app.post(
     "/api/generate2",
-    upload.fields([
+    jobUpload.fields([
         { name: "config1_fileMahasiswa", maxCount: 1 },
         { name: "config1_filePreferensi", maxCount: 1 },
         { name: "config2_fileMahasiswa", maxCount: 1 },
@@ -338,21 +397,33 @@ app.post(
                     BETA: 0.5,
                     GAMMA: 0.5,
                 };
-                const configPath = path.join(process.cwd(), "config.json");
-                fs.writeFileSync(configPath, JSON.stringify(config));
 
                 if (req.files[stuKey] && req.files[prefKey]) {
-                    // Rename files to standard names
-                    const stuPath = path.join(uploadDir, "stu.xlsx");
-                    const prefPath = path.join(uploadDir, "pref.csv");
-                    fs.renameSync(req.files[stuKey][0].path, stuPath);
-                    fs.renameSync(req.files[prefKey][0].path, prefPath);
+                    // Input konfigurasi ini disimpan di job dir sendiri
+                    const jobDir = createJobDir();
+                    fs.writeFileSync(
+                        path.join(jobDir, "config.json"),
+                        JSON.stringify(config)
+                    );
+                    fs.renameSync(
+                        req.files[stuKey][0].path,
+                        path.join(jobDir, "stu.xlsx")
+                    );
+                    fs.renameSync(
+                        req.files[prefKey][0].path,
+                        path.join(jobDir, "pref.csv")
+                    );
 
                     // Run Python script
                     console.log(
                         `\n[Config ${i}] Running greedy algorithm with H=${jumlahHari}, M=${jumlahSlot}, R=${jumlahRuangan}`
                     );
-                    const result = await runPythonScript();
+                    let result;
+                    try {
+                        result = await runPythonScript(jobDir);
+                    } finally {
+                        removeJobDir(jobDir);
+                    }
 
                     if (result) {
                         const table = result.table || [];
@@ -440,14 +511,17 @@ app.post(
             res.status(500).json({
                 error: "Gagal generate penjadwalan 2: " + error.message,
             });
+        } finally {
+            // file upload yang tidak terpakai oleh konfigurasi mana pun
+            removeJobDir(req.jobDir);
         }
     }
 );
 
 // Function to run Python script
-function runPythonScript() {
+function runPythonScript(jobDir) {
     return new Promise((resolve, reject) => {
-        const pythonProcess = spawn("python", ["greedy.py"], {
+        const pythonProcess = spawn("python", ["greedy.py", "--job-dir", jobDir], {
             cwd: process.cwd(),
             stdio: ["pipe", "pipe", "pipe"],
         });
@@ -502,6 +576,7 @@ function runPythonScript() {
 }
 
 app.post("/api/compare", async (req, res) => {
+    const jobDir = createJobDir();
     try {
         const { jumlahRuangan, jumlahHari, tanggalMulai, kapasitasRuangan } =
             req.body;
@@ -519,103 +594,26 @@ app.post("/api/compare", async (req, res) => {
             BETA: 0.5,
             GAMMA: 0.5,
         };
-        const configPath = path.join(process.cwd(), "config.json");
+        const configPath = path.join(jobDir, "config.json");
         fs.writeFileSync(configPath, JSON.stringify(config));
+        // greedy dan gurobi membaca data upload terakhir yang sama
+        copyLatestUpload("stu.xlsx", jobDir);
+        copyLatestUpload("pref.csv", jobDir);
 
+        // Data dibaca sekali, semua sampel greedy & gurobi dijalankan paralel
+        // oleh compare.py, yang juga menulis hasil_sampel_greedy.json dan
+        // hasil_sampel_gurobi.json
         const sampleSizes = [3, 5, 10];
-        const results = [];
-
-        for (let i = 0; i < sampleSizes.length; i++) {
-            const sampleSize = sampleSizes[i];
-            const sampleResult = {
-                sample: i + 1,
-                sampleSize: sampleSize,
-                greedy: {
-                    time: 0,
-                    assigned: 0,
-                    unassigned: 0,
-                    objective: 0,
-                    output: "",
-                },
-                gurobi: {
-                    time: 0,
-                    assigned: 0,
-                    unassigned: 0,
-                    objective: 0,
-                    output: "",
-                },
-            };
-
-            // Run Greedy
-            try {
-                const greedyData = await runPythonScriptWithLimit(
-                    "greedy.py",
-                    sampleSize
-                );
-                if (greedyData.result) {
-                    sampleResult.greedy.time = greedyData.result.time || 0;
-                    sampleResult.greedy.assigned =
-                        greedyData.result.assigned || 0;
-                    sampleResult.greedy.unassigned =
-                        greedyData.result.unassigned || 0;
-                    sampleResult.greedy.objective =
-                        greedyData.result.objective || 0;
-                }
-                sampleResult.greedy.output = greedyData.fullOutput || "999";
-            } catch (error) {
-                console.error(`Greedy error for sample ${sampleSize}:`, error);
-            }
-
-            // Run Gurobi
-            try {
-                const gurobiData = await runPythonScriptWithLimit(
-                    "guroby.py",
-                    sampleSize
-                );
-                if (gurobiData.result) {
-                    sampleResult.gurobi.time = gurobiData.result.time || 0;
-                    sampleResult.gurobi.assigned =
-                        gurobiData.result.assigned || 0;
-                    sampleResult.gurobi.unassigned =
-                        gurobiData.result.unassigned || 0;
-                    sampleResult.gurobi.objective =
-                        gurobiData.result.objective || 0;
-                }
-                sampleResult.gurobi.output = gurobiData.fullOutput || "";
-            } catch (error) {
-                console.error(`Gurobi error for sample ${sampleSize}:`, error);
-            }
-
-            results.push(sampleResult);
+        const compareData = await runPythonScriptWithArgs("compare.py", [
+            "--job-dir",
+            jobDir,
+            "--samples",
+            ...sampleSizes.map(String),
+        ]);
+        if (!compareData.result || !compareData.result.ok) {
+            throw new Error("compare.py tidak mengembalikan hasil");
         }
-
-        // Save results to JSON files
-        const greedyResults = results.map((r) => ({
-            sample: r.sample,
-            sampleSize: r.sampleSize,
-            time: r.greedy.time,
-            assigned: r.greedy.assigned,
-            unassigned: r.greedy.unassigned,
-            objective: r.greedy.objective,
-        }));
-
-        const gurobiResults = results.map((r) => ({
-            sample: r.sample,
-            sampleSize: r.sampleSize,
-            time: r.gurobi.time,
-            assigned: r.gurobi.assigned,
-            unassigned: r.gurobi.unassigned,
-            objective: r.gurobi.objective,
-        }));
-
-        fs.writeFileSync(
-            "hasil_sampel_greedy.json",
-            JSON.stringify(greedyResults, null, 2)
-        );
-        fs.writeFileSync(
-            "hasil_sampel_gurobi.json",
-            JSON.stringify(gurobiResults, null, 2)
-        );
+        const results = compareData.result.results;
 
         console.log(
             "Results saved to hasil_sampel_greedy.json and hasil_sampel_gurobi.json"
@@ -625,13 +623,16 @@ app.post("/api/compare", async (req, res) => {
     } catch (error) {
         console.error("Error in compare:", error);
         res.status(500).json({ error: "Gagal menjalankan perbandingan" });
+    } finally {
+        removeJobDir(jobDir);
     }
 });
 
-// Function to run Python script with student limit
-function runPythonScriptWithLimit(scriptName, limit) {
+// Function to run a Python script with extra arguments
+function runPythonScriptWithArgs(scriptName, scriptArgs) {
     return new Promise((resolve, reject) => {
-        const pythonProcess = spawn("python", [scriptName, limit.toString()], {
+        const args = [scriptName, ...scriptArgs];
+        const pythonProcess = spawn("python", args, {
             cwd: process.cwd(),
             stdio: ["pipe", "pipe", "pipe"],
         });
@@ -0,0 +1,362 @@
+"""
+Sesi edit jadwal (what-if) di atas state greedy.
+
+Perencana bisa menanyakan dulu apakah perubahan manual -- pindah mahasiswa,
+tukar dua mahasiswa, tambah / hapus dosen panel -- masih feasible (kapasitas
+C, preferensi dosen, ruang paralel, panel D dosen) dan berapa perubahan
+obj2/obj3-nya, lalu menerapkannya. Jawaban dihitung dari indeks yang
+dipelihara inkremental (jumlah Type per sesi, mahasiswa per slot global,
+kehadiran dosen per slot), jadi cukup untuk validasi drag-and-drop langsung.
+
+Dipakai sebagai library (ScheduleSession) atau lewat stdin/stdout, satu
+perintah JSON per baris:
+
+    python session.py hasil.json
+    {"op": "move", "nim": "535220002", "to": 12}
+    {"op": "swap", "nim": "535220002", "other": "535220004", "apply": true}
+    {"op": "add_lecturer", "lecturer": 3, "to": 12}
+    {"op": "result"}
+"""
+import argparse
+import json
+import sys
+
+from availability import AvailabilityIndex
+from greedy import (
+    NaNSafeEncoder,
+    build_output,
+    load_config,
+    pembimbing_by_pb,
+    plain_record,
+    safe_get,
+    unassigned_record,
+)
+from jobs import add_job_arguments, resolve_job
+
+
+class ScheduleSession:
+    def __init__(self, Schedule, timeslots, unassigned, pref, C=5, D=3, M=7, R=3):
+        self.Schedule = Schedule
+        self.timeslots = timeslots
+        self.pref = pref
+        self.C, self.D, self.M, self.R = C, D, M, R
+        self.index = AvailabilityIndex(pref, len(timeslots) // (M * R), M)
+
+        self.student = {}       # NIM -> record
+        self.where = {}         # NIM -> timeslot (None = tidak terjadwal)
+        self.type_count = {i: {} for i in Schedule}
+        self.sup_count = {}     # (timeslot, dosen) -> jumlah mahasiswa bimbingan di sesi tsb
+        self.panel = {i: set() for i in Schedule}   # dosen tambahan (bukan pembimbing di sesi tsb)
+        self.rooms = {}         # (slot global, dosen) -> set timeslot tempat dosen hadir
+        self.busy = [0] * self.index.n_slots        # slot global -> bitset dosen yang hadir
+        self.load = {}          # dosen -> jumlah sesi yang dihadiri
+        self.slot_students = {}
+        self.obj2 = 0
+        self.used = 0
+
+        for i, info in Schedule.items():
+            students = list(info['students'])
+            panel = set(info['supervisors']) - {s['PB'] for s in students}
+            info['students'] = []
+            info['supervisors'] = set()
+            for s in students:
+                self._place(s, i, [])
+            for a in panel:
+                self._add_panel(a, i, [])
+        for s in unassigned:
+            s = plain_record(s)
+            nim = safe_get(s, ["NIM"])
+            self.student[nim] = s
+            self.where[nim] = None
+
+    @classmethod
+    def from_result(cls, previous, students, pref, C=5, D=3, H=9, M=7, R=3):
+        """Sesi dari JSON hasil greedy (kolom `table`), mis. hasil yang sudah diedit."""
+        from greedy import empty_schedule, generate_timeslots
+        from repair import load_previous_assignment
+
+        timeslots = generate_timeslots(H, M, R)
+        Schedule = empty_schedule(timeslots)
+        placed, panels = load_previous_assignment(previous, M, R, H)
+        name_to_pb = {name: pb for pb, name in pembimbing_by_pb(students).items()}
+        unassigned = []
+        for s in students:
+            nim = safe_get(s, ["NIM"])
+            if nim in placed:
+                i = placed[nim][0]
+                Schedule[i]['students'].append(s)
+                Schedule[i]['supervisors'].add(s['PB'])
+            else:
+                unassigned.append(s)
+        for i, names in panels.items():
+            if Schedule[i]['students']:
+                Schedule[i]['supervisors'].update(name_to_pb[n] for n in names if n in name_to_pb)
+        return cls(Schedule, timeslots, unassigned, pref, C, D, M, R)
+
+    # ------------------------------------------------------------------ indeks
+    def _attend(self, a, i, undo):
+        slot = self.timeslots[i]['slot']
+        self.Schedule[i]['supervisors'].add(a)
+        rooms = self.rooms.setdefault((slot, a), set())
+        rooms.add(i)
+        self.busy[slot] |= 1 << a
+        self.load[a] = self.load.get(a, 0) + 1
+        undo.append(lambda: self._leave(a, i, []))
+
+    def _leave(self, a, i, undo):
+        slot = self.timeslots[i]['slot']
+        self.Schedule[i]['supervisors'].discard(a)
+        rooms = self.rooms[(slot, a)]
+        rooms.discard(i)
+        if not rooms:
+            self.busy[slot] &= ~(1 << a)
+            del self.rooms[(slot, a)]
+        self.load[a] -= 1
+        if not self.load[a]:
+            del self.load[a]
+        undo.append(lambda: self._attend(a, i, []))
+
+    def _place(self, s, i, undo, position=None):
+        nim = safe_get(s, ["NIM"])
+        self.student[nim] = s
+        self.where[nim] = i
+        studs = self.Schedule[i]['students']
+        studs.insert(len(studs) if position is None else position, s)
+        t = s['Type']
+        counts = self.type_count[i]
+        self.obj2 += counts.get(t, 0)
+        counts[t] = counts.get(t, 0) + 1
+        slot = self.timeslots[i]['slot']
+        self.slot_students[slot] = self.slot_students.get(slot, 0) + 1
+        if self.slot_students[slot] == 1:
+            self.used += 1
+        key = (i, s['PB'])
+        self.sup_count[key] = self.sup_count.get(key, 0) + 1
+        if self.sup_count[key] == 1 and s['PB'] not in self.panel[i]:
+            self._attend(s['PB'], i, [])
+        undo.append(lambda: self._remove(s, i, []))
+
+    def _remove(self, s, i, undo):
+        nim = safe_get(s, ["NIM"])
+        self.where[nim] = None
+        studs = self.Schedule[i]['students']
+        position = next(k for k, st in enumerate(studs) if st is s)
+        del studs[position]
+        t = s['Type']
+        counts = self.type_count[i]
+        counts[t] -= 1
+        self.obj2 -= counts[t]
+        if not counts[t]:
+            del counts[t]
+        slot = self.timeslots[i]['slot']
+        self.slot_students[slot] -= 1
+        if self.slot_students[slot] == 0:
+            del self.slot_students[slot]
+            self.used -= 1
+        key = (i, s['PB'])
+        self.sup_count[key] -= 1
+        if self.sup_count[key] == 0:
+            del self.sup_count[key]
+            if s['PB'] not in self.panel[i]:
+                self._leave(s['PB'], i, [])
+        # urutan mahasiswa di sesi dikembalikan persis saat undo
+        undo.append(lambda: self._place(s, i, [], position))
+
+    def _add_panel(self, a, i, undo):
+        self.panel[i].add(a)
+        if not self.sup_count.get((i, a)):
+            self._attend(a, i, [])
+        undo.append(lambda: self._remove_panel(a, i, []))
+
+    def _remove_panel(self, a, i, undo):
+        self.panel[i].discard(a)
+        if not self.sup_count.get((i, a)):
+            self._leave(a, i, [])
+        undo.append(lambda: self._add_panel(a, i, []))
+
+    # ------------------------------------------------------------------ evaluasi
+    def objective(self):
+        obj3 = len(self.timeslots) - self.used
+        return {"obj2": self.obj2, "obj3": obj3, "objective": self.obj2 + obj3}
+
+    def _violations(self, sessions):
+        """Pelanggaran di sesi yang terdampak, sebagai set tuple (code, timeslot, dosen)."""
+        found = set()
+        for i in sessions:
+            info = self.Schedule[i]
+            if not info['students']:
+                continue
+            slot = self.timeslots[i]['slot']
+            if len(info['students']) > self.C:
+                found.add(("capacity", i, None))
+            for a in info['supervisors']:
+                if not self.index.available(a, slot):
+                    found.add(("preference", i, a))
+                if len(self.rooms[(slot, a)]) > 1:
+                    found.add(("parallel", i, a))
+            if len(info['supervisors']) < self.D:
+                found.add(("panel_size", i, None))
+        return found
+
+    def _fill_panel(self, sessions, undo):
+        """Lengkapi panel sesi terdampak sampai D dosen dari dosen yang tersedia & tidak sibuk."""
+        added = []
+        for i in sessions:
+            info = self.Schedule[i]
+            need = self.D - len(info['supervisors'])
+            if not info['students'] or need <= 0:
+                continue
+            slot = self.timeslots[i]['slot']
+            ranked = self.index.co_available(slot, self.busy[slot], key=lambda d: (self.load.get(d, 0), d))
+            for a in ranked[:need]:
+                self._add_panel(a, i, undo)
+                added.append([i, a])
+        return added
+
+    def _run(self, sessions, change, apply, fill_panel, force):
+        sessions = [i for i in dict.fromkeys(sessions) if i is not None]
+        before = self._violations(sessions)
+        before_obj = self.objective()
+        kept = {i: set(self.Schedule[i]['supervisors']) for i in sessions}
+        undo = []
+        change(undo)
+        added = self._fill_panel(sessions, undo) if fill_panel else []
+        new = self._violations(sessions) - before
+        after_obj = self.objective()
+
+        feasible = not new
+        applied = bool(apply and (feasible or force))
+        if not applied:
+            for step in reversed(undo):
+                step()
+            # set dosen dikembalikan utuh supaya urutan tampilannya tidak berubah
+            for i, sups in kept.items():
+                self.Schedule[i]['supervisors'] = sups
+        return {
+            "feasible": feasible,
+            "violations": [
+                {"code": code, "timeslot": i, "lecturer": a} if a is not None else {"code": code, "timeslot": i}
+                for code, i, a in sorted(new, key=lambda v: (v[1], v[0], -1 if v[2] is None else v[2]))
+            ],
+            "delta": {k: after_obj[k] - before_obj[k] for k in after_obj},
+            "objective": after_obj if applied else before_obj,
+            "added_lecturers": added,
+            "applied": applied,
+        }
+
+    # ------------------------------------------------------------------ operasi
+    def move(self, nim, target, apply=False, fill_panel=True, force=False):
+        """Pindah mahasiswa ke timeslot `target` (None = lepas dari jadwal)."""
+        s = self.student[nim]
+        source = self.where[nim]
+
+        def change(undo):
+            if source == target:
+                return
+            if source is not None:
+                self._remove(s, source, undo)
+            if target is not None:
+                self._place(s, target, undo)
+
+        return self._run([source, target], change, apply, fill_panel, force)
+
+    def swap(self, nim, other, apply=False, fill_panel=True, force=False):
+        """Tukar sesi dua mahasiswa."""
+        s1, s2 = self.student[nim], self.student[other]
+        i1, i2 = self.where[nim], self.where[other]
+
+        def change(undo):
+            if i1 == i2:
+                return
+            for s, i in ((s1, i1), (s2, i2)):
+                if i is not None:
+                    self._remove(s, i, undo)
+            for s, i in ((s1, i2), (s2, i1)):
+                if i is not None:
+                    self._place(s, i, undo)
+
+        return self._run([i1, i2], change, apply, fill_panel, force)
+
+    def add_lecturer(self, a, target, apply=False, force=False):
+        """Tambah dosen `a` ke panel sesi `target`."""
+        def change(undo):
+            if a not in self.Schedule[target]['supervisors']:
+                self._add_panel(a, target, undo)
+
+        return self._run([target], change, apply, False, force)
+
+    def remove_lecturer(self, a, target, apply=False, force=False):
+        """Hapus dosen panel `a` dari sesi `target` (pembimbing tetap hadir selama ada mahasiswanya)."""
+        def change(undo):
+            if a in self.panel[target]:
+                self._remove_panel(a, target, undo)
+
+        return self._run([target], change, apply, False, force)
+
+    def state(self, students=()):
+        """State untuk greedy.build_output (tabel, statistik, objective)."""
+        unassigned = [unassigned_record(self.student[nim], self.pref)
+                      for nim, i in self.where.items() if i is None]
+        return {
+            "Schedule": self.Schedule,
+            "timeslots": self.timeslots,
+            "unassigned": unassigned,
+            "sorted_students_df": list(students) or list(self.student.values()),
+            "execution_time": 0,
+            "diagnostics": [],
+        }
+
+
+def handle(session, cmd, students, lecturer_ids, H, M, R, start_date):
+    op = cmd.get("op")
+    lecturer = cmd.get("lecturer")
+    if isinstance(lecturer, str):
+        lecturer = lecturer_ids[lecturer]
+    apply = bool(cmd.get("apply", False))
+    force = bool(cmd.get("force", False))
+    if op == "move":
+        return session.move(str(cmd["nim"]), cmd.get("to"), apply, cmd.get("fill_panel", True), force)
+    if op == "swap":
+        return session.swap(str(cmd["nim"]), str(cmd["other"]), apply, cmd.get("fill_panel", True), force)
+    if op == "add_lecturer":
+        return session.add_lecturer(lecturer, cmd["to"], apply, force)
+    if op == "remove_lecturer":
+        return session.remove_lecturer(lecturer, cmd["to"], apply, force)
+    if op == "objective":
+        return session.objective()
+    if op == "result":
+        return build_output(session.state(students), students, H, M, R, start_date)
+    return {"error": f"op tidak dikenal: {op}"}
+
+
+def main():
+    from core import encode_students, read_pref, read_students
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('result', help='JSON hasil greedy (output greedy.py / --save-result)')
+    add_job_arguments(parser)
+    args = parser.parse_args()
+    job = resolve_job(args)
+
+    config = load_config(job["config_path"], job["config"])
+    C, D, H, M, R = config["C"], config["D"], config["H"], config["M"], config["R"]
+    students = encode_students(read_students(job["students"]))
+    pref = read_pref(job["pref"], students)
+    with open(args.result, 'r') as f:
+        previous = json.load(f)
+
+    session = ScheduleSession.from_result(previous, students, pref, C, D, H, M, R)
+    lecturer_ids = {str(name): pb for pb, name in pembimbing_by_pb(students).items()}
+    for line in sys.stdin:
+        if not line.strip():
+            continue
+        try:
+            response = handle(session, json.loads(line), students, lecturer_ids, H, M, R, config["start_date"])
+        except (KeyError, ValueError, TypeError) as e:
+            response = {"error": str(e)}
+        print(json.dumps(response, cls=NaNSafeEncoder))
+        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import json
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+# modul proyek berada di root repo (bukan package)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DATA = os.path.join(ROOT, "test-data")
+sys.path.insert(0, ROOT)
+
+# config kecil untuk data angkatan 20 (136 mahasiswa)
+SMALL = {"C": 4, "D": 3, "H": 5, "M": 7, "R": 3}
+
+
+@pytest.fixture
+def run_script(tmp_path):
+    """Jalankan script proyek dengan cwd tmp_path (cache .cache/ terisolasi); return JSON stdout."""
+    def run(script, *args):
+        proc = subprocess.run([sys.executable, os.path.join(ROOT, script), *args], cwd=tmp_path,
+                              capture_output=True, text=True, check=True)
+        return json.loads(proc.stdout[proc.stdout.index('{"'):])
+    return run
+
+
+@pytest.fixture
+def load_instance():
+    """
+    Loader data test-data/stu_<angkatan>.xlsx + pref_<angkatan>.csv. Return namespace
+    stu_df, pref, C, D, H, M, R, params (tuple C..R), dan args (argumen CLI greedy.py).
+    """
+    from preprocess import load_pref, load_students
+
+    def load(year=20, **config):
+        config = dict(SMALL, **config)
+        students = os.path.join(DATA, f"stu_{year}.xlsx")
+        pref_path = os.path.join(DATA, f"pref_{year}.csv")
+        stu_df = load_students(students)
+        args = ["--students", students, "--pref", pref_path, "--config-json", json.dumps(config)]
+        return SimpleNamespace(stu_df=stu_df, pref=load_pref(stu_df, pref_path), args=args,
+                               params=tuple(config[k] for k in "CDHMR"), **config)
+    return load
+
+
+@pytest.fixture
+def instance(load_instance):
+    """stu_20 / pref_20 dengan config SMALL."""
+    return load_instance()
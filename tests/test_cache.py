@@ -0,0 +1,63 @@
+from cache import ResultCache, fingerprint
+
+
+def test_fingerprint_depends_on_config_and_students():
+    students = [{"NIM": "1", "PB": 0, "Type": 1}]
+    pref = [[1, 0, 1]]
+    key, family = fingerprint("greedy", students, pref, {"C": 4})
+    assert fingerprint("greedy", students, pref, {"C": 4}) == (key, family)
+    assert fingerprint("greedy", students, pref, {"C": 5})[0] != key
+    other_key, other_family = fingerprint("greedy", [dict(students[0], Type=2)], pref, {"C": 4})
+    assert other_key != key and other_family == family
+
+
+def test_put_get_roundtrip(tmp_path):
+    cache = ResultCache(str(tmp_path), max_entries=2)
+    for k in range(3):
+        cache.put(f"k{k}", {"objective": k})
+    assert cache.get("k2")["result"] == {"objective": 2}
+    assert len(cache.entries()) == 2
+
+
+def test_cache_hit_equals_miss(run_script, instance):
+    miss = run_script("greedy.py", *instance.args)
+    hit = run_script("greedy.py", *instance.args)
+    assert "cached" not in miss
+    assert hit.pop("cached") is True
+    assert hit == miss
+
+
+def test_cache_hit_keeps_validation(run_script, instance):
+    miss = run_script("greedy.py", *instance.args, "--validate")
+    hit = run_script("greedy.py", *instance.args, "--validate")
+    assert "validation" in miss and "validation" in hit
+    assert hit["validation"] == miss["validation"]
+
+
+def test_cache_miss_when_default_dates_change(instance, tmp_path, monkeypatch, capsys):
+    import datetime as dt
+    import json
+    import sys
+
+    import greedy
+
+    class Day(dt.datetime):
+        today = dt.datetime(2025, 1, 6)
+
+        @classmethod
+        def now(cls, tz=None):
+            return cls.today
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(greedy, "datetime", Day)
+    monkeypatch.setattr(sys, "argv", ["greedy.py", *instance.args])
+
+    outputs = []
+    for today in (dt.datetime(2025, 1, 6), dt.datetime(2025, 1, 6), dt.datetime(2025, 1, 13)):
+        Day.today = today
+        greedy.main()
+        out = capsys.readouterr().out
+        outputs.append(json.loads(out[out.index('{"'):]))
+    assert outputs[1].get("cached") is True
+    assert "cached" not in outputs[2]
+    assert outputs[2]["table"][0]["Hari"] != outputs[0]["table"][0]["Hari"]
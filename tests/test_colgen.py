@@ -0,0 +1,21 @@
+import pytest
+
+pytest.importorskip("scipy")
+
+from colgen import run_colgen  # noqa: E402
+from greedy import compute_greedy_objectives  # noqa: E402
+
+
+def test_complete_pricing_gives_valid_bound(instance):
+    # 12 mahasiswa, satu hari: pricing selesai dan hasilnya terbukti optimal
+    stu_df = instance.stu_df.head(12).reset_index(drop=True)
+    C, D, H, M, R = 4, 1, 1, 3, 2
+    state = run_colgen(stu_df, instance.pref, C, D, H, M, R, time_limit=30)
+    stats = state["colgen"]
+    objectives = compute_greedy_objectives(state["Schedule"], state["timeslots"], H, M)
+    objective = objectives["obj2_same_type_pairs"] + objectives["obj3_min_used_timeslots"]
+    assert stats["pricing_complete"]
+    assert objective - stats["penalty"] * len(state["unassigned"]) <= stats["lp_bound"] + 1e-4
+    assert objective <= stats["bound"]
+    assert stats["optimal"] == (objective == stats["bound"])
+    assert stats["optimal"]
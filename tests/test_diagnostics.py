@@ -0,0 +1,27 @@
+from diagnostics import explain_unassigned
+from greedy import empty_schedule, generate_timeslots
+
+
+def test_alternatives_skip_unavailable_slots_and_are_capped():
+    H, M, R, C = 1, 4, 2, 1
+    timeslots = generate_timeslots(H, M, R)
+    Schedule = empty_schedule(timeslots)
+    # dosen 0 tidak tersedia di slot 0; slot 1 penuh; di slot 2 dosen 0 sudah di ruang 1
+    pref = [[0, 1, 1, 1], [1, 1, 1, 1]]
+    for i in (2, 3):
+        Schedule[i]['students'].append({"NIM": f"x{i}", "PB": 1, "Type": 0})
+        Schedule[i]['supervisors'].add(1)
+    Schedule[4]['students'].append({"NIM": "y", "PB": 0, "Type": 0})
+    Schedule[4]['supervisors'].add(0)
+    student = {"NIM": "1", "PB": 0, "Type": 0}
+
+    diagnostics = explain_unassigned([student], timeslots, pref, C, Schedule, M, max_alternatives=4)
+
+    alternatives = diagnostics[0]["alternatives"]
+    assert [a["blocked_by"] for a in alternatives] == ["penuh", "penuh", "penuh", "konflik dosen"]
+    assert alternatives[0]["timeslot"] == "Hari ke-1, Slot 2, Room 1"
+    assert diagnostics[0]["blocked"] == {"penuh": 3, "pref!=": 2, "konflik dosen": 1}
+    assert student["alasan_unassigned"] == "penuh, pref!=, konflik dosen"
+
+    capped = explain_unassigned([dict(student)], timeslots, pref, C, Schedule, M, max_alternatives=2)
+    assert len(capped[0]["alternatives"]) == 2
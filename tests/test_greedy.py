@@ -0,0 +1,109 @@
+import random
+
+import pytest
+
+from greedy import (
+    check_supervisor_conflict,
+    empty_schedule,
+    generate_timeslots,
+    greedy_schedule,
+    records,
+    run_greedy,
+    room_bitsets,
+    safe_get,
+    supervisor_available,
+    supervisor_free,
+    unassigned_record,
+)
+
+
+def instance(seed, n=60, d=8, H=3, M=4, R=3):
+    rng = random.Random(seed)
+    students = [{"stuID": j, "NIM": str(1000 + j), "PB": rng.randrange(d), "Type": rng.randrange(4)}
+                for j in range(n)]
+    students.sort(key=lambda s: (s["PB"], s["Type"], s["stuID"]))
+    pref = [[1 if rng.random() < 0.5 else 0 for _ in range(H * M)] for _ in range(d)]
+    return students, pref
+
+
+def scan_schedule(students, timeslots, time_pref, C, Schedule, M, R):
+    """First-fit dengan scan konflik O(m) (implementasi sebelum bitset)."""
+    unassigned = []
+    for s in students:
+        a = s['PB']
+        for i in range(len(timeslots)):
+            if len(Schedule[i]['students']) >= C:
+                continue
+            if not supervisor_available(time_pref, a, timeslots[i]['slot'], M, R):
+                continue
+            if not check_supervisor_conflict(Schedule, timeslots, i, a, M):
+                continue
+            Schedule[i]['students'].append(s)
+            Schedule[i]['supervisors'].add(a)
+            break
+        else:
+            unassigned.append(unassigned_record(s, time_pref))
+    return Schedule, unassigned
+
+
+def test_supervisor_free_matches_scan():
+    rng = random.Random(0)
+    H, M, R = 2, 4, 3
+    timeslots = generate_timeslots(H, M, R)
+    Schedule = empty_schedule(timeslots)
+    for i in Schedule:
+        Schedule[i]['supervisors'] = {a for a in range(6) if rng.random() < 0.2}
+    room_bits = room_bitsets(Schedule)
+    for i in range(len(timeslots)):
+        for a in range(6):
+            assert supervisor_free(room_bits, i, a, R) == check_supervisor_conflict(Schedule, timeslots, i, a, M)
+
+
+def test_greedy_placement_matches_scan():
+    H, M, R = 3, 4, 3
+    timeslots = generate_timeslots(H, M, R)
+    for seed in range(5):
+        students, pref = instance(seed, H=H, M=M, R=R)
+        for C in (2, 4):
+            ours, ours_un = greedy_schedule(students, timeslots, pref, C, empty_schedule(timeslots), M, R)
+            ref, ref_un = scan_schedule(students, timeslots, pref, C, empty_schedule(timeslots), M, R)
+            assert ours == ref
+            assert [safe_get(s, ["NIM"]) for s in ours_un] == [safe_get(s, ["NIM"]) for s in ref_un]
+
+
+@pytest.mark.parametrize("year, config", [(20, {}), (22, {"C": 5, "D": 3, "H": 9, "M": 7, "R": 3})])
+def test_bestfit_keeps_panels_feasible(load_instance, year, config):
+    from validate import check, from_schedule
+
+    inst = load_instance(year, **config)
+    state = run_greedy(inst.stu_df, inst.pref, *inst.params, "bestfit")
+    entries, panels = from_schedule(state["Schedule"])
+    report = check(entries, panels, records(inst.stu_df), inst.pref, *inst.params)
+    assert report["valid"], report["counts"]
+
+
+@pytest.mark.parametrize("compiled", [False, True])
+def test_kernel_matches_first_fit(compiled, monkeypatch):
+    import greedy_kernel
+
+    if compiled:
+        pytest.importorskip("numba")
+    else:
+        # fungsi kernel yang sama sebagai Python biasa
+        monkeypatch.setattr(greedy_kernel, "_kernel", greedy_kernel._greedy_kernel)
+    H, M, R = 3, 4, 3
+    timeslots = generate_timeslots(H, M, R)
+    for seed in range(5):
+        students, pref = instance(seed, H=H, M=M, R=R)
+        for C, D in ((2, None), (4, None), (3, 2)):
+            # sebagian mahasiswa sudah terjadwal lebih dulu (seperti repair)
+            ours, ref = empty_schedule(timeslots), empty_schedule(timeslots)
+            greedy_schedule(students[:10], timeslots, pref, C, ours, M, R, D)
+            greedy_schedule(students[:10], timeslots, pref, C, ref, M, R, D)
+            ours, ours_un = greedy_kernel.kernel_greedy_schedule(students[10:], timeslots, pref, C, ours, M, R, D)
+            ref, ref_un = greedy_schedule(students[10:], timeslots, pref, C, ref, M, R, D)
+            assert ours == ref
+            assert [safe_get(s, ["NIM"]) for s in ours_un] == [safe_get(s, ["NIM"]) for s in ref_un]
+    if compiled:
+        # benar-benar dikompilasi (nopython), bukan fallback Python
+        assert greedy_kernel._kernel.signatures
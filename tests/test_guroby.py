@@ -0,0 +1,99 @@
+import io
+import json
+
+import pytest
+
+gp = pytest.importorskip("gurobipy")
+
+from guroby import SolveMonitor  # noqa: E402
+
+GRB = gp.GRB
+
+
+class FakeModel:
+    def __init__(self, values):
+        self.values = values
+
+    def cbGet(self, what):
+        return self.values[what]
+
+    def terminate(self):
+        pass
+
+
+def test_incumbent_record_uses_best_objective_and_gap():
+    stream = io.StringIO()
+    monitor = SolveMonitor(stream=stream)
+    # kandidat 80 lebih buruk dari incumbent 90 (maksimisasi)
+    monitor(FakeModel({
+        GRB.Callback.MIPSOL_OBJ: 80.0,
+        GRB.Callback.MIPSOL_OBJBST: 90.0,
+        GRB.Callback.MIPSOL_OBJBND: 99.0,
+        GRB.Callback.MIPSOL_SOLCNT: 1,
+        GRB.Callback.MIPSOL_NODCNT: 5.0,
+    }), GRB.Callback.MIPSOL)
+    record = json.loads(stream.getvalue())["progress"]
+    assert record["event"] == "incumbent"
+    assert record["objective"] == 90.0
+    assert record["candidate"] == 80.0
+    assert record["gap"] == pytest.approx(0.1)
+
+
+def test_first_candidate_has_no_incumbent_yet():
+    stream = io.StringIO()
+    SolveMonitor(stream=stream)(FakeModel({
+        GRB.Callback.MIPSOL_OBJ: 80.0,
+        GRB.Callback.MIPSOL_OBJBST: -GRB.INFINITY,
+        GRB.Callback.MIPSOL_OBJBND: 99.0,
+        GRB.Callback.MIPSOL_SOLCNT: 0,
+        GRB.Callback.MIPSOL_NODCNT: 0.0,
+    }), GRB.Callback.MIPSOL)
+    record = json.loads(stream.getvalue())["progress"]
+    assert record["objective"] is None and record["gap"] is None
+
+
+def test_neighbourhood_model_keeps_fixed_rooms_and_parallel_rule():
+    from greedy import empty_schedule, generate_timeslots
+    from lns import build_neighbourhood_model
+
+    H, M, R, C, D = 1, 2, 2, 2, 1
+    timeslots = generate_timeslots(H, M, R)
+    Schedule = empty_schedule(timeslots)
+    fixed = {"NIM": "1", "stuID": 0, "PB": 0, "Type": 0}
+    Schedule[1]['students'].append(fixed)
+    Schedule[1]['supervisors'].add(0)
+    freed = [{"NIM": "2", "stuID": 1, "PB": 0, "Type": 0}, {"NIM": "3", "stuID": 2, "PB": 1, "Type": 1}]
+    pref = [[1, 1], [1, 1]]
+
+    env = gp.Env(empty=True)
+    env.setParam("OutputFlag", 0)
+    env.start()
+    model, x = build_neighbourhood_model(Schedule, timeslots, [0, 2], freed, [True, False], pref, C, D, H, M, R, env)
+    model.optimize()
+    assignment = {j: i for (i, j), var in x.items() if var.X > 0.5}
+    # dosen 0 sudah di timeslot 1 (slot 0): mahasiswanya harus ke slot 1
+    assert assignment[0] == 2
+    # mahasiswa tidak terjadwal ikut masuk karena bobotnya
+    assert 1 in assignment
+    model.dispose()
+    env.dispose()
+
+
+def test_warm_start_reports_feasible_incumbents():
+    from guroby import solve_warm_start
+
+    H, M, R, C, D = 1, 2, 2, 2, 1
+    students = [{"NIM": str(j), "stuID": j, "PB": j % 2, "Type": j % 2} for j in range(4)]
+    pref = [[1, 1], [1, 1]]
+    env = gp.Env(empty=True)
+    env.setParam("OutputFlag", 0)
+    env.start()
+    found = []
+    # start: semua di timeslot 0 (melanggar kapasitas C) -> tetap diselesaikan
+    best = solve_warm_start(students, pref, {j: 0 for j in range(4)}, C, D, H, M, R, time_limit=10,
+                            on_solution=found.append, env=env)
+    env.dispose()
+    assert sorted(best) == [0, 1, 2, 3]
+    assert found and found[-1] == best
+    for i in set(best.values()):
+        assert sum(1 for t in best.values() if t == i) <= C
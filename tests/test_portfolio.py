@@ -0,0 +1,33 @@
+import json
+
+import pytest
+
+from greedy import NaNSafeEncoder, build_output, run_greedy
+from portfolio import rebuild_state, score
+
+
+def output(state, instance):
+    result = build_output(dict(state, execution_time=0), instance.stu_df, instance.H, instance.M, instance.R)
+    return json.loads(json.dumps(result, cls=NaNSafeEncoder))
+
+
+def test_rebuilt_state_gives_same_output_as_engine_state(instance):
+    state = run_greedy(instance.stu_df, instance.pref, *instance.params)
+    rebuilt = rebuild_state(state["Schedule"], state["timeslots"], instance.stu_df, instance.pref,
+                            instance.C, instance.M)
+    assert output(rebuilt, instance) == output(state, instance)
+
+
+def test_colgen_reports_greedy_incumbent_first(instance):
+    pytest.importorskip("scipy")
+    from colgen import run_colgen
+
+    stu_df, pref = instance.stu_df, instance.pref
+    C, D, H, M, R = instance.params
+    reported = []
+    state = run_colgen(stu_df, pref, C, D, H, M, R, time_limit=1.0,
+                       report=lambda Schedule, timeslots: reported.append(score(Schedule, timeslots, H, M)))
+    greedy = run_greedy(stu_df, pref, C, D, H, M, R)
+    assert reported[0] == score(greedy["Schedule"], greedy["timeslots"], H, M)
+    assert reported[-1] == score(state["Schedule"], state["timeslots"], H, M)
+    assert reported == sorted(reported)
@@ -0,0 +1,22 @@
+import pandas as pd
+
+from preprocess import align_pref, student_order
+
+
+def students(pbs):
+    return pd.DataFrame({"stuID": range(len(pbs)), "PB": pbs, "Type": [0] * len(pbs),
+                         "PEMBIMBING": [f"Dosen {pb}" for pb in pbs]})
+
+
+def test_numeric_pref_pads_missing_lecturers_with_zero():
+    stu_df = students([0, 2, 1, 2])
+    pref = align_pref(pd.DataFrame([[1, 0, 1], [0, 1, 1]]), stu_df)
+    assert pref.tolist() == [[1, 0, 1], [0, 1, 1], [0, 0, 0]]
+    # lecturer 2 (tanpa baris) tidak tersedia sama sekali -> paling depan
+    assert list(student_order(stu_df, pref.sum(axis=1))[:2]) == [1, 3]
+
+
+def test_named_pref_matches_numeric_padding():
+    stu_df = students([0, 2, 1, 2])
+    named = pd.DataFrame([["Dosen 0", 1, 0, 1], ["Dosen 1", 0, 1, 1]])
+    assert align_pref(named, stu_df).tolist() == [[1, 0, 1], [0, 1, 1], [0, 0, 0]]
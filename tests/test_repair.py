@@ -0,0 +1,63 @@
+import copy
+
+from greedy import build_output, run_greedy, safe_get
+from repair import repair_schedule
+
+
+def placement(state):
+    return {safe_get(s, ["NIM"]): i for i, info in state["Schedule"].items() for s in info["students"]}
+
+
+def test_repair_without_changes_keeps_every_placement(instance):
+    stu_df, pref = instance.stu_df, instance.pref
+    C, D, H, M, R = instance.params
+    state = run_greedy(stu_df, pref, C, D, H, M, R)
+    previous = build_output(state, stu_df, H, M, R)
+
+    repaired = repair_schedule(previous, stu_df, pref, C, D, H, M, R)
+    assert placement(repaired) == placement(state)
+    assert repaired["repair"]["released"] == []
+    assert repaired["repair"]["sessions_updated"] == 0
+
+
+def test_repair_only_moves_students_of_changed_lecturer(instance):
+    stu_df, pref = instance.stu_df, instance.pref
+    C, D, H, M, R = instance.params
+    state = run_greedy(stu_df, pref, C, D, H, M, R)
+    previous = build_output(state, stu_df, H, M, R)
+    before = placement(state)
+
+    # dosen 0 tidak lagi tersedia di slot yang dipakainya
+    changed = copy.deepcopy(pref)
+    for i, info in state["Schedule"].items():
+        if 0 in {s["PB"] for s in info["students"]}:
+            changed[0][state["timeslots"][i]["slot"]] = 0
+    repaired = repair_schedule(previous, stu_df, changed, C, D, H, M, R)
+    after = placement(repaired)
+
+    pb = {safe_get(s, ["NIM"]): s["PB"] for s in stu_df.to_dict(orient="records")}
+    moved = {nim for nim in before if after.get(nim) != before[nim]}
+    assert moved
+    assert all(pb[nim] == 0 for nim in moved)
+    assert set(repaired["repair"]["released"]) == moved
+
+
+def test_repair_only_places_released_students(instance, monkeypatch):
+    import repair
+
+    stu_df, pref = instance.stu_df, instance.pref
+    C, D, H, M, R = instance.params
+    state = run_greedy(stu_df, pref, C, D, H, M, R)
+    previous = build_output(state, stu_df, H, M, R)
+    seen = []
+    place = repair.place_released
+
+    def spy(pending, *args, **kwargs):
+        seen.extend(safe_get(s, ["NIM"]) for s in pending)
+        return place(pending, *args, **kwargs)
+
+    monkeypatch.setattr(repair, "place_released", spy)
+    repaired = repair_schedule(previous, stu_df, pref, C, D, H, M, R)
+    # tanpa perubahan: hanya yang dulu tidak terjadwal yang dicarikan slot
+    assert sorted(seen) == sorted(safe_get(s, ["NIM"]) for s in state["unassigned"])
+    assert repaired["sorted_students_df"] is stu_df
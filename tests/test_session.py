@@ -0,0 +1,51 @@
+import copy
+
+from greedy import run_greedy, safe_get
+from session import ScheduleSession
+
+INDEXES = ("where", "type_count", "sup_count", "panel", "rooms", "busy", "load", "slot_students", "obj2", "used")
+
+
+def make_session(instance):
+    state = run_greedy(instance.stu_df, instance.pref, *instance.params)
+    return ScheduleSession(state["Schedule"], state["timeslots"], state["unassigned"], instance.pref,
+                           instance.C, instance.D, instance.M, instance.R)
+
+
+def snapshot(session, ordered=True):
+    indexes = {name: copy.deepcopy(getattr(session, name)) for name in INDEXES}
+    schedule = {}
+    for i, info in session.Schedule.items():
+        nims = [safe_get(s, ["NIM"]) for s in info["students"]]
+        schedule[i] = (nims if ordered else sorted(nims), set(info["supervisors"]))
+    return indexes, schedule
+
+
+def test_rejected_operations_leave_indexes_identical(instance):
+    session = make_session(instance)
+    before = snapshot(session)
+    placed = [nim for nim, i in session.where.items() if i is not None]
+    free = next(i for i, info in session.Schedule.items() if not info["students"])
+    full = next(i for i, info in session.Schedule.items() if len(info["students"]) == instance.C)
+    lecturer = next(iter(session.Schedule[full]["supervisors"]))
+
+    session.move(placed[0], free)
+    session.move(placed[1], full)
+    session.move(placed[2], None)
+    session.swap(placed[0], placed[-1])
+    session.add_lecturer(lecturer, free)
+    session.remove_lecturer(lecturer, full)
+    assert snapshot(session) == before
+
+
+def test_applied_move_and_move_back_restores_indexes(instance):
+    session = make_session(instance)
+    before = snapshot(session, ordered=False)
+    nim = next(nim for nim, i in session.where.items() if i is not None)
+    source = session.where[nim]
+    free = next(i for i, info in session.Schedule.items() if not info["students"])
+
+    assert session.move(nim, free, apply=True, fill_panel=False, force=True)["applied"]
+    assert session.where[nim] == free
+    assert session.move(nim, source, apply=True, fill_panel=False, force=True)["applied"]
+    assert snapshot(session, ordered=False) == before
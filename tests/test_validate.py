@@ -0,0 +1,38 @@
+from validate import check, from_schedule
+
+# H=1, M=2, R=2: timeslot 0, 1 di slot global 0; timeslot 2, 3 di slot global 1
+C, D, H, M, R = 2, 2, 1, 2, 2
+PREF = [[1, 1], [1, 1], [1, 0]]
+STUDENTS = [{"NIM": str(j + 1), "stuID": j, "PB": pb, "Type": 1} for j, pb in enumerate([0, 1, 0, 1, 2])]
+
+
+def session(students, supervisors):
+    return {"students": [STUDENTS[j] for j in students], "supervisors": set(supervisors)}
+
+
+def run_check(Schedule):
+    entries, panels = from_schedule(Schedule)
+    return check(entries, panels, STUDENTS, PREF, C, D, H, M, R)
+
+
+def test_unassigned_is_a_warning_not_a_violation():
+    report = run_check({0: session([0, 1], [0, 1]), 2: session([2, 3], [0, 1])})
+    assert report["valid"]
+    assert report["violations"] == []
+    assert report["unassigned"] == 1
+    assert report["warnings"][0]["students"] == ["5"]
+
+
+def test_known_bad_schedule_reports_each_violation():
+    report = run_check({
+        0: session([0, 1, 2], [0, 1]),   # 3 mahasiswa > C
+        1: session([3], [1]),            # dosen 1 juga di timeslot 0, panel < D
+        2: session([4], [2]),            # dosen 2 tidak tersedia di slot 1, panel < D
+    })
+    assert not report["valid"]
+    assert report["unassigned"] == 0
+    assert report["counts"] == {"capacity": 1, "parallel": 1, "panel_size": 2, "preference": 1}
+    parallel = next(v for v in report["violations"] if v["code"] == "parallel")
+    assert (parallel["slot"], parallel["lecturer"], parallel["rooms"]) == (0, 1, 2)
+    preference = next(v for v in report["violations"] if v["code"] == "preference")
+    assert (preference["index"], preference["lecturer"]) == (2, 2)
@@ -0,0 +1,327 @@
+"""
+Validasi jadwal hasil engine mana pun, independen dari engine yang membuatnya.
+
+Masukan bisa output greedy (`raw_schedule` atau `table`), hasil Gurobi
+(`schedule`), tabel yang diedit manual, atau Schedule di memori. Semua
+dinormalisasi menjadi array (timeslot, mahasiswa) dan (timeslot, dosen), lalu
+semua constraint dicek dengan numpy:
+
+- tiap mahasiswa paling banyak satu kali dan dikenal
+- kapasitas C per sesi
+- dosen hadir hanya di slot yang tersedia, pembimbing hadir di sesi mahasiswanya
+- dosen tidak di dua ruangan pada slot global yang sama
+- panel D: per sesi (aturan greedy) atau per hari (aturan guroby.py)
+
+`valid` hanya mencakup pelanggaran di atas. Mahasiswa yang tidak terjadwal
+bukan pelanggaran constraint; jumlahnya dilaporkan di `unassigned` dan
+`warnings`.
+
+Objective dihitung ulang: obj2 (pasangan Type sama per sesi), obj3 versi
+greedy (timeslot - slot global terpakai) dan versi Gurobi (timeslot - sesi
+terpakai).
+
+    python validate.py hasil.json [--source table] [--d-mode day]
+"""
+import argparse
+import json
+import re
+import time
+
+import numpy as np
+
+SOURCES = ("raw_schedule", "table", "schedule")
+D_MODES = ("session", "day")
+
+
+def _label(i, M, R):
+    slot, room = divmod(int(i), R)
+    return f"Hari ke-{slot // M + 1}, Slot {slot % M + 1}, Room {room + 1}"
+
+
+def _label_index(label, M, R):
+    match = re.search(r'Hari ke-(\d+), Slot (\d+), Room (\d+)', str(label))
+    if not match:
+        return -1
+    day, slot, room = (int(g) - 1 for g in match.groups())
+    if not (0 <= slot < M and 0 <= room < R):
+        return -1
+    return (day * M + slot) * R + room
+
+
+def _split(value, sep=","):
+    if value is None or value == "-" or value == "":
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    return [v.strip() for v in str(value).split(sep) if v.strip()]
+
+
+def _entries(kind):
+    # kind: key mahasiswa berupa "id" (stuID) atau "nim"
+    return {"kind": kind, "timeslot": [], "student": []}
+
+
+def normalize(result, M=7, R=3, H=9, source=None):
+    """
+    Return (source, entries, panels): entries = {kind, timeslot[], student[]},
+    panels = {timeslot[], lecturer[]}. Dosen: PB (int) atau nama (str) bila dari tabel.
+    """
+    if isinstance(result, list):
+        result = {"table": result} if result and "NIM" in result[0] else {"schedule": result}
+    if source is None:
+        source = next((s for s in SOURCES if result.get(s)), "table")
+
+    panels = {"timeslot": [], "lecturer": []}
+
+    def add(i, studs, lecturers):
+        entries["timeslot"] += [i] * len(studs)
+        entries["student"] += studs
+        panels["timeslot"] += [i] * len(lecturers)
+        panels["lecturer"] += lecturers
+
+    if source == "raw_schedule":
+        entries = _entries("id")
+        for row in result.get("raw_schedule", []):
+            studs = [int(s) for s in _split(row.get("students"))]
+            lecturers = [int(a) for a in _split(row.get("supervisors"))]
+            if studs or lecturers:
+                add(_label_index(row.get("timeslot"), M, R), studs, lecturers)
+    elif source == "schedule":
+        entries = _entries("nim")
+        for row in result.get("schedule", []):
+            i = row.get("index")
+            i = _label_index(row.get("timeslot"), M, R) if i is None else int(i)
+            add(i, [str(s) for s in row.get("students", [])], [int(a) for a in row.get("supervisors", [])])
+    elif source == "table":
+        from repair import parse_table_position
+
+        entries = _entries("nim")
+        positions = {}
+        seen_panel = set()
+        for row in result.get("table", []):
+            nim = str(row.get("NIM", "-"))
+            if nim == "-":
+                continue
+            key = (row.get("Hari"), row.get("Slot"), row.get("Ruangan"))
+            if key not in positions:
+                i = parse_table_position(row, M, R, H)
+                positions[key] = -1 if i is None else i
+            i = positions[key]
+            # panel biasanya sama untuk semua baris satu sesi; hasil edit manual
+            # yang berbeda antar baris digabung
+            hadir = row.get("Dosen yang Hadir")
+            lecturers = []
+            if (i, hadir) not in seen_panel:
+                seen_panel.add((i, hadir))
+                lecturers = _split(hadir, ";")
+            add(i, [nim], lecturers)
+    else:
+        raise ValueError(f"source tidak dikenal: {source}")
+    return source, entries, panels
+
+
+def from_schedule(Schedule):
+    """Schedule di memori (greedy / session / colgen) -> entries, panels."""
+    entries = _entries("id")
+    panels = {"timeslot": [], "lecturer": []}
+    for i, info in Schedule.items():
+        if info['students'] or info['supervisors']:
+            entries["timeslot"] += [i] * len(info['students'])
+            entries["student"] += [s["stuID"] for s in info['students']]
+            panels["timeslot"] += [i] * len(info['supervisors'])
+            panels["lecturer"] += list(info['supervisors'])
+    return entries, panels
+
+
+def check(entries, panels, students, pref, C=5, D=3, H=9, M=7, R=3, d_mode="session"):
+    """Cek semua constraint. Return dict: valid, violations, counts, unassigned, warnings, objectives, time."""
+    start = time.time()
+    m = H * M * R
+    n = len(students)
+    stu_pb = np.fromiter((s["PB"] for s in students), dtype=np.int64, count=n)
+    stu_type = np.fromiter((s["Type"] for s in students), dtype=np.int64, count=n)
+
+    def nim(j):
+        return str(students[j].get("NIM"))
+
+    from precheck import availability
+    avail = availability(pref, H, M)
+
+    violations = []
+    warnings = []
+
+    def add(code, message, **detail):
+        violations.append(dict(code=code, message=message, **detail))
+
+    # ---- normalisasi ke array
+    e_ts = np.asarray(entries["timeslot"], dtype=np.int64)
+    if entries["kind"] == "id":
+        keys = np.asarray(entries["student"], dtype=np.int64)
+        ids = np.fromiter((s["stuID"] for s in students), dtype=np.int64, count=n)
+        size_ids = max(int(ids.max()) + 1 if n else 0, int(keys.max()) + 1 if len(keys) else 0)
+        lookup = np.full(size_ids + 1, -1, dtype=np.int64)
+        lookup[ids] = np.arange(n)
+        e_stu = lookup[np.where((keys >= 0) & (keys < size_ids), keys, size_ids)]
+    else:
+        by_nim = {nim(j): j for j in range(n)}
+        e_stu = np.fromiter((by_nim.get(key, -1) for key in entries["student"]),
+                            dtype=np.int64, count=len(entries["student"]))
+    for k in np.flatnonzero(e_stu < 0):
+        key = entries["student"][k]
+        add("unknown_student", f"Mahasiswa {key} tidak ada di data", student=str(key))
+
+    p_ts = np.asarray(panels["timeslot"], dtype=np.int64)
+    lecturers = panels["lecturer"]
+    if any(isinstance(a, str) for a in lecturers):
+        names = {}
+        for s in students:
+            names.setdefault(str(s.get("PEMBIMBING")).strip(), s["PB"])
+        for a in set(a for a in lecturers if isinstance(a, str) and a.strip() not in names):
+            add("unknown_lecturer", f"Dosen {a} tidak dikenal", lecturer=a)
+        lecturers = [names.get(a.strip(), -1) if isinstance(a, str) else a for a in lecturers]
+    p_lect = np.asarray(lecturers, dtype=np.int64)
+
+    bad_ts = np.unique(np.concatenate([e_ts[(e_ts < 0) | (e_ts >= m)], p_ts[(p_ts < 0) | (p_ts >= m)]]))
+    if len(bad_ts):
+        add("invalid_timeslot", f"{len(bad_ts)} posisi di luar H={H}, M={M}, R={R}", count=int(len(bad_ts)))
+    ok = (e_ts >= 0) & (e_ts < m) & (e_stu >= 0)
+    e_ts, e_stu = e_ts[ok], e_stu[ok]
+    ok = (p_ts >= 0) & (p_ts < m) & (p_lect >= 0)
+    # pasangan (sesi, dosen) unik
+    n_lect = max(len(avail), int(stu_pb.max()) + 1 if n else 0, int(p_lect.max()) + 1 if len(p_lect) else 0)
+    pair = np.unique(p_ts[ok] * n_lect + p_lect[ok])
+    p_ts, p_lect = pair // n_lect, pair % n_lect
+
+    # ---- tiap mahasiswa paling banyak satu kali (yang tidak terjadwal hanya peringatan)
+    times = np.bincount(e_stu, minlength=n)
+    for j in np.flatnonzero(times > 1):
+        add("duplicate_student", f"Mahasiswa {nim(j)} dijadwalkan {times[j]} kali",
+            student=nim(j), count=int(times[j]))
+    missing = np.flatnonzero(times == 0)
+    if len(missing):
+        warnings.append(dict(code="unassigned", message=f"{len(missing)} mahasiswa tidak terjadwal",
+                             students=[nim(j) for j in missing], count=int(len(missing))))
+
+    # ---- kapasitas C
+    size = np.bincount(e_ts, minlength=m)
+    for i in np.flatnonzero(size > C):
+        add("capacity", f"{_label(i, M, R)}: {size[i]} mahasiswa > C={C}",
+            timeslot=_label(i, M, R), index=int(i), students=int(size[i]))
+
+    # ---- ketersediaan dosen
+    p_slot = p_ts // R
+    known = p_lect < len(avail)
+    available = np.zeros(len(p_lect), dtype=bool)
+    available[known] = avail[p_lect[known], p_slot[known]]
+    for k in np.flatnonzero(~available):
+        add("preference", f"{_label(p_ts[k], M, R)}: dosen {p_lect[k]} tidak tersedia",
+            timeslot=_label(p_ts[k], M, R), index=int(p_ts[k]), lecturer=int(p_lect[k]))
+
+    # ---- pembimbing hadir di sesi mahasiswanya
+    need = np.unique(e_ts * n_lect + stu_pb[e_stu])
+    for key in need[~np.isin(need, pair)]:
+        i, a = divmod(int(key), n_lect)
+        add("supervisor_absent", f"{_label(i, M, R)}: pembimbing {a} tidak hadir",
+            timeslot=_label(i, M, R), index=i, lecturer=a)
+
+    # ---- dosen di dua ruangan pada slot global yang sama
+    slot_keys, slot_count = np.unique(p_slot * n_lect + p_lect, return_counts=True)
+    for key, cnt in zip(slot_keys[slot_count > 1], slot_count[slot_count > 1]):
+        t, a = divmod(int(key), n_lect)
+        add("parallel", f"Hari ke-{t // M + 1}, Slot {t % M + 1}: dosen {a} di {cnt} ruangan",
+            slot=t, lecturer=a, rooms=int(cnt))
+
+    # ---- panel D
+    used = size > 0
+    panel = np.bincount(p_ts, minlength=m)
+    if d_mode == "day":
+        day_of = np.arange(m) // (M * R)
+        day_used = np.bincount(day_of, weights=used, minlength=H) > 0
+        day_panel = np.bincount(day_of, weights=panel * used, minlength=H)
+        for l in np.flatnonzero(day_used & (day_panel < D)):
+            add("day_panel", f"Hari ke-{l + 1}: {int(day_panel[l])} kehadiran dosen < D={D}",
+                day=int(l) + 1, lecturers=int(day_panel[l]))
+    else:
+        for i in np.flatnonzero(used & (panel < D)):
+            add("panel_size", f"{_label(i, M, R)}: {panel[i]} dosen < D={D}",
+                timeslot=_label(i, M, R), index=int(i), lecturers=int(panel[i]))
+
+    # ---- objective dihitung ulang
+    same = np.unique(e_ts * (int(stu_type.max()) + 2 if n else 1) + stu_type[e_stu] + 1, return_counts=True)[1]
+    obj2 = int((same * (same - 1) // 2).sum())
+    used_slots = int(len(np.unique(e_ts // R)))
+    used_sessions = int(used.sum())
+
+    counts = {}
+    for v in violations:
+        counts[v["code"]] = counts.get(v["code"], 0) + 1
+    return {
+        "valid": not violations,
+        "d_mode": d_mode,
+        "violations": violations,
+        "counts": counts,
+        "unassigned": int(len(missing)),
+        "warnings": warnings,
+        "objectives": {
+            "obj2": obj2,
+            "obj3": m - used_slots,
+            "objective": obj2 + m - used_slots,
+            "obj3_gurobi": m - used_sessions,
+            "objective_gurobi": obj2 + m - used_sessions,
+            "used_slots": used_slots,
+            "used_sessions": used_sessions,
+            "assigned": int((times > 0).sum()),
+        },
+        "time": time.time() - start,
+    }
+
+
+def validate(result, students, pref, C=5, D=3, H=9, M=7, R=3, source=None, d_mode=None):
+    """
+    Validasi output JSON engine (dict) atau list baris tabel / sesi.
+    d_mode default: "day" untuk solusi Gurobi, "session" untuk yang lain.
+    """
+    source, entries, panels = normalize(result, M, R, H, source)
+    if d_mode is None:
+        d_mode = "day" if source == "schedule" else "session"
+    report = check(entries, panels, students, pref, C, D, H, M, R, d_mode)
+    report["source"] = source
+    return report
+
+
+def validate_state(state, students, pref, C=5, D=3, H=9, M=7, R=3, d_mode="session"):
+    """Validasi state run_greedy / run_lns / run_colgen / ScheduleSession.state()."""
+    entries, panels = from_schedule(state["Schedule"])
+    report = check(entries, panels, students, pref, C, D, H, M, R, d_mode)
+    report["source"] = "state"
+    return report
+
+
+def main():
+    from core import encode_students, read_pref, read_students
+    from greedy import load_config
+    from jobs import add_job_arguments, resolve_job
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument('result', help='JSON hasil (greedy.py / guroby.py / tabel yang diedit)')
+    parser.add_argument('limit', nargs='?', type=int, default=None, help='Limit number of students to process')
+    parser.add_argument('--source', choices=SOURCES, default=None,
+                        help='Bagian yang divalidasi (default: raw_schedule, lalu table, lalu schedule)')
+    parser.add_argument('--d-mode', choices=D_MODES, default=None,
+                        help='Panel D per sesi (greedy) atau per hari (Gurobi)')
+    add_job_arguments(parser)
+    args = parser.parse_args()
+    job = resolve_job(args)
+
+    config = load_config(job["config_path"], job["config"])
+    students = encode_students(read_students(job["students"]), args.limit)
+    pref = read_pref(job["pref"], students)
+    with open(args.result, 'r') as f:
+        result = json.load(f)
+    report = validate(result, students, pref, config["C"], config["D"], config["H"],
+                      config["M"], config["R"], args.source, args.d_mode)
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()